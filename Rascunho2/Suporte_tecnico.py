@@ -3,6 +3,10 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 import threading
 import time
+import atexit
+import json
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from flask import Flask, request, jsonify, render_template
 from flask_socketio import SocketIO
 from plyer import notification
@@ -11,16 +15,62 @@ from enum import Enum
 from typing import Dict, List, Optional
 
 # --- Configuração de Log ---
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler(), logging.FileHandler('suporte.log')]
-)
+# As chamadas de log só colocam o registro numa fila; uma thread separada
+# formata e grava (JSON por linha, UTF-8, com rotação por tamanho).
+LOG_ARQUIVO = 'suporte.log'
+LOG_TAMANHO_MAXIMO = 10 * 1024 * 1024  # bytes
+LOG_BACKUPS = 5
+
+_ATRIBUTOS_LOG = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+class FormatadorJson(logging.Formatter):
+    """Uma linha JSON por registro, com os campos passados em `extra`."""
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'nivel': record.levelname,
+            'mensagem': record.getMessage()
+        }
+        for chave, valor in record.__dict__.items():
+            if chave not in _ATRIBUTOS_LOG:
+                dados[chave] = valor
+        if record.exc_info:
+            dados['excecao'] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+class HandlerFilaLog(QueueHandler):
+    """Enfileira o registro sem formatar; a formatação fica com a thread de escrita."""
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+def configurar_log() -> QueueListener:
+    arquivo_handler = RotatingFileHandler(
+        LOG_ARQUIVO, maxBytes=LOG_TAMANHO_MAXIMO, backupCount=LOG_BACKUPS, encoding='utf-8'
+    )
+    arquivo_handler.setFormatter(FormatadorJson())
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+    fila_log = queue.SimpleQueue()
+    listener = QueueListener(fila_log, arquivo_handler, console_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    # Dados que não usamos e que custam caro em cada LogRecord
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    raiz = logging.getLogger()
+    raiz.setLevel(logging.INFO)
+    raiz.addHandler(HandlerFilaLog(fila_log))
+    return listener
+
+log_listener = configurar_log()
 logger = logging.getLogger(__name__)
 
 # --- CONSTANTES ---
 NOTIFICAR_CHAMADOS_CRITICOS = True
-TEMPO_VERIFICACAO_ATENDIMENTO = 10  # segundos
 LIMITE_DESCRICAO_NOTIFICACAO = 50  # caracteres
 
 # --- PRIORIDADES ---
@@ -87,10 +137,10 @@ def enviar_notificacao_desktop(titulo: str, mensagem: str) -> bool:
             app_name='Sistema de Suporte',
             timeout=10
         )
-        logger.info(f"Notificação enviada: {titulo}")
+        logger.info("Notificação enviada: %s", titulo, extra={'evento': 'notificacao_enviada'})
         return True
     except Exception as e:
-        logger.error(f"Falha ao enviar notificação: {e}")
+        logger.error("Falha ao enviar notificação: %s", e, extra={'evento': 'notificacao_falhou'})
         return False
 
 # --- SISTEMA DE FILA DE PRIORIDADES ---
@@ -98,12 +148,16 @@ class SistemaChamados:
     def __init__(self):
         self._fila = []
         self._lock = threading.Lock()
+        # Acorda o despachante quando chega chamado ou um agente fica livre
+        self._condicao = threading.Condition(self._lock)
         self._contador = 0
         self._id_map: Dict[str, ChamadoSuporte] = {}
         self._chamados_em_atendimento: Dict[str, ChamadoSuporte] = {}
+        self._agentes_livres: List[str] = list(AGENTES)
 
     def adicionar_chamado(self, dados_chamado: dict) -> ChamadoSuporte:
         """Adiciona um chamado à fila de prioridades (O(log n))."""
+        inicio = time.perf_counter()
         try:
             id_chamado = f"CHAM-{int(datetime.now().timestamp())}-{self._contador}"
             chamado = ChamadoSuporte(
@@ -122,8 +176,13 @@ class SistemaChamados:
                 self._contador += 1
                 self._id_map[chamado.id_chamado] = chamado
                 self._notificar_mudanca_fila()
-                logger.info(f"Chamado {chamado.id_chamado} adicionado à fila")
-            
+                self._condicao.notify()
+
+            logger.info("Chamado %s adicionado à fila", chamado.id_chamado, extra={
+                'evento': 'chamado_adicionado',
+                'id_chamado': chamado.id_chamado,
+                'duracao_ms': round((time.perf_counter() - inicio) * 1000, 3)
+            })
             return chamado
         except KeyError as e:
             raise ValueError(f"Campo faltando: {str(e)}")
@@ -134,6 +193,7 @@ class SistemaChamados:
 
     def escalonar_chamado(self, id_chamado: str, nova_prioridade: int) -> bool:
         """Aumenta manualmente a prioridade de um chamado (O(n))."""
+        inicio = time.perf_counter()
         with self._lock:
             if id_chamado not in self._id_map:
                 return False
@@ -152,49 +212,130 @@ class SistemaChamados:
             
             self._fila = nova_fila
             self._notificar_mudanca_fila()
-            logger.info(f"Chamado {id_chamado} escalonado para prioridade {nova_prioridade}")
-            return True
+
+        logger.info("Chamado %s escalonado para prioridade %s", id_chamado, nova_prioridade, extra={
+            'evento': 'chamado_escalonado',
+            'id_chamado': id_chamado,
+            'duracao_ms': round((time.perf_counter() - inicio) * 1000, 3)
+        })
+        return True
 
     def atribuir_agente(self, id_chamado: str, agente_id: str) -> bool:
         """Atribui um agente a um chamado."""
+        inicio = time.perf_counter()
         with self._lock:
             if id_chamado not in self._id_map or agente_id not in AGENTES:
                 return False
             
             chamado = self._id_map[id_chamado]
+            if chamado.agente == agente_id:
+                return True
+            # Agente ocupado: ao terminar o atendimento atual ele voltaria aos livres ainda com este chamado
+            if agente_id not in self._agentes_livres:
+                return False
+            self._liberar_agente(chamado)
             chamado.agente = agente_id
             chamado.status = StatusChamado.EM_ATENDIMENTO
+            self._agentes_livres.remove(agente_id)
             
             # Mover o chamado para atendimentos em andamento
+            # (a entrada antiga na fila é descartada quando chegar ao topo)
             self._chamados_em_atendimento[id_chamado] = chamado
             
             self._notificar_mudanca_fila()
-            logger.info(f"Chamado {id_chamado} atribuído a {AGENTES[agente_id]}")
-            return True
+
+        logger.info("Chamado %s atribuído a %s", id_chamado, AGENTES[agente_id], extra={
+            'evento': 'chamado_atribuido',
+            'id_chamado': id_chamado,
+            'agente': agente_id,
+            'duracao_ms': round((time.perf_counter() - inicio) * 1000, 3)
+        })
+        return True
 
     def processar_proximo_chamado(self) -> Optional[ChamadoSuporte]:
         """Processa o próximo chamado (O(log n))."""
         with self._lock:
-            if not self._fila:
+            proximo = self._retirar_proximo()
+            if proximo is None:
                 return None
+            self._notificar_mudanca_fila()
+
+        self._registrar_processamento(*proximo)
+        return proximo[1]
+
+    def despachar(self) -> List[ChamadoSuporte]:
+        """
+        Aguarda até existir chamado na fila e agente livre, e então atribui
+        todos os pares possíveis de uma vez (uma única notificação via WebSocket).
+        """
+        with self._condicao:
+            self._condicao.wait_for(self._pode_despachar)
+            despachados = []
+            while self._pode_despachar():
+                proximo = self._retirar_proximo()
+                if proximo is None:
+                    break
+                despachados.append(proximo)
+            if despachados:
+                self._notificar_mudanca_fila()
+
+        for prioridade, chamado in despachados:
+            self._registrar_processamento(prioridade, chamado)
+        return [chamado for _, chamado in despachados]
 
+    def finalizar_chamado(self, id_chamado: str) -> bool:
+        """Finaliza um chamado em atendimento e libera o agente (O(1))."""
+        with self._condicao:
+            chamado = self._chamados_em_atendimento.pop(id_chamado, None)
+            if chamado is None:
+                return False
+            chamado.status = StatusChamado.RESOLVIDO
+            self._id_map.pop(id_chamado, None)
+            self._liberar_agente(chamado)
+            self._notificar_mudanca_fila()
+        logger.info("Chamado %s finalizado", id_chamado, extra={
+            'evento': 'chamado_finalizado', 'id_chamado': id_chamado
+        })
+        return True
+
+    def _pode_despachar(self) -> bool:
+        return bool(self._fila) and bool(self._agentes_livres)
+
+    def _retirar_proximo(self) -> Optional[tuple]:
+        """Retira o próximo chamado pendente da fila; exige o lock adquirido."""
+        while self._fila:
             prioridade, timestamp, chamado = heapq.heappop(self._fila)
+            if chamado.status != StatusChamado.PENDENTE:
+                continue  # Já atribuído manualmente
             chamado.status = StatusChamado.EM_ATENDIMENTO
+            if self._agentes_livres:
+                chamado.agente = self._agentes_livres.pop(0)
             
             # Armazena o chamado em atendimento
             self._chamados_em_atendimento[chamado.id_chamado] = chamado
             
             # Remove do índice principal
             self._id_map.pop(chamado.id_chamado, None)
-            self._notificar_mudanca_fila()
-
-        logger.info(f"Processando chamado {chamado.id_chamado}")
+            return prioridade, chamado
+        return None
+
+    def _liberar_agente(self, chamado: ChamadoSuporte):
+        """Devolve o agente do chamado à lista de livres e acorda o despachante."""
+        if chamado.agente and chamado.agente not in self._agentes_livres:
+            self._agentes_livres.append(chamado.agente)
+            self._condicao.notify()
+
+    def _registrar_processamento(self, prioridade: tuple, chamado: ChamadoSuporte):
+        logger.info("Processando chamado %s", chamado.id_chamado, extra={
+            'evento': 'chamado_processado',
+            'id_chamado': chamado.id_chamado,
+            'agente': chamado.agente,
+            'espera_s': round((datetime.now() - chamado.timestamp).total_seconds(), 3)
+        })
 
         if NOTIFICAR_CHAMADOS_CRITICOS and prioridade[0] <= 2:
             self._notificar_chamado_critico(chamado)
 
-        return chamado
-
     def _notificar_chamado_critico(self, chamado: ChamadoSuporte):
         """Envia notificação para chamados críticos."""
         titulo = "Chamado Urgente na Fila!"
@@ -220,7 +361,7 @@ class SistemaChamados:
             'tipo': chamado.tipo_chamado,
             'prioridade': self._calcular_prioridade_combinada(chamado)[0],
             'tempo_estimado': str(chamado.tempo_estimado)
-        } for _, _, chamado in self._fila]
+        } for _, _, chamado in self._fila if chamado.status == StatusChamado.PENDENTE]
 
     def _serializar_em_atendimento(self) -> List[dict]:
         """Serializa chamados em atendimento."""
@@ -289,6 +430,13 @@ def api_processar_chamado():
         "tempo_estimado": str(chamado.tempo_estimado)
     }), 200
 
+@app.route('/chamado/<id_chamado>/finalizar', methods=['POST'])
+def api_finalizar_chamado(id_chamado):
+    """Finaliza um chamado e libera o agente para o próximo."""
+    if sistema.finalizar_chamado(id_chamado):
+        return jsonify({"status": "success"}), 200
+    return jsonify({"status": "error", "message": "Chamado não está em atendimento"}), 404
+
 # --- WEBSOCKETS ---
 @socketio.on('connect')
 def handle_connect():
@@ -300,10 +448,9 @@ def handle_connect():
 
 # --- PROCESSAMENTO AUTOMÁTICO ---
 def processar_chamados_continuamente():
-    """Processa chamados a cada 5 segundos, se houver chamados na fila."""
+    """Despacha chamados assim que houver chamado na fila e agente livre (sem polling)."""
     while True:
-        time.sleep(TEMPO_VERIFICACAO_ATENDIMENTO)
-        sistema.processar_proximo_chamado()  # Processa o próximo chamado na fila
+        sistema.despachar()
 
 # --- INICIALIZAÇÃO ---
 def iniciar_sistema():
@@ -320,7 +467,7 @@ def iniciar_sistema():
         "descricao": "Servidor fora do ar"
     })
     
-    logger.info("Sistema iniciado")
+    logger.info("Sistema iniciado", extra={'evento': 'sistema_iniciado'})
     socketio.run(app, host='0.0.0.0', port=5000, debug=True)
 
 if __name__ == '__main__':
@@ -0,0 +1,404 @@
+"""
+Análise do suporte.log em fluxo, com memória constante.
+
+Lê os dois formatos que o Suporte_tecnico.py já gravou: o texto antigo
+("2025-05-07 19:50:20,196 - INFO - Chamado X adicionado à fila", em cp1252)
+e o JSON por linha atual. Relaciona "adicionado" e "Processando" pelo id do
+chamado e informa taxa de chegada, distribuição da espera na fila, taxa de
+notificações e reinícios do sistema.
+
+    python analisar_log.py suporte.log
+    python analisar_log.py suporte.log --seguir --intervalo 10
+    python analisar_log.py suporte.log --json
+"""
+import argparse
+import json
+import math
+import mmap
+import os
+import re
+import stat
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Chamados adicionados aguardando o "Processando" (limita a memória com logs sem processamento)
+MAX_PENDENTES = 1_000_000
+# O arquivo é processado em janelas; as páginas de cada janela são devolvidas ao sistema depois
+TAMANHO_JANELA = 64 * 1024 * 1024
+
+# Um único padrão com um grupo por tipo de evento: uma passada pelo trecho, na ordem do
+# arquivo, e `lastindex` diz qual evento casou. As mesmas frases estão na mensagem dos
+# dois formatos (texto e JSON). Tudo em bytes: o texto antigo está em cp1252 e o atual em UTF-8.
+_EVENTO = re.compile(
+    rb"Chamado (\S+) adicionado"
+    rb'|Processando chamado ([^\s"]+)'
+    rb"|(Notifica\S{1,4}o enviada)"
+    rb"|(Falha ao enviar notifica)"
+    rb"|(Sistema iniciado)"
+    rb"|( \* Restarting with)"
+)
+_ADICIONADO, _PROCESSADO, _NOTIFICACAO, _FALHA_NOTIFICACAO, _INICIADO, _REINICIO = range(1, 7)
+
+
+class _Instantes:
+    """Converte "AAAA-MM-DD HH:MM:SS,mmm" (ou ISO com T e ponto) em epoch, com cache por minuto"""
+
+    def __init__(self):
+        self._minutos: Dict[bytes, float] = {}
+
+    def segundos(self, ts: bytes) -> float:
+        minuto = ts[:16]
+        base = self._minutos.get(minuto)
+        if base is None:
+            if len(self._minutos) > 4096:
+                self._minutos.clear()
+            texto = minuto.decode("ascii").replace("T", " ")
+            base = self._minutos[minuto] = datetime.strptime(texto, "%Y-%m-%d %H:%M").timestamp()
+        return base + int(ts[17:19]) + int(ts[20:23]) / 1000
+
+
+class HistogramaLog:
+    """
+    Histograma de compartimentos geométricos: memória constante e quantis com
+    erro relativo de no máximo (base - 1) / 2.
+    """
+
+    def __init__(self, minimo: float = 0.001, base: float = 1.05):
+        self.minimo = minimo
+        self.base = base
+        self._log_base = math.log(base)
+        self._contagens: Dict[int, int] = {}
+        self.total = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+    def adicionar(self, valor: float):
+        i = 0 if valor <= self.minimo else 1 + int(math.log(valor / self.minimo) / self._log_base)
+        self._contagens[i] = self._contagens.get(i, 0) + 1
+        self.total += 1
+        self.soma += valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def quantil(self, p: float) -> Optional[float]:
+        if not self.total:
+            return None
+        alvo = p * self.total
+        acumulado = 0
+        for i in sorted(self._contagens):
+            acumulado += self._contagens[i]
+            if acumulado >= alvo:
+                if i == 0:
+                    return self.minimo
+                # Centro geométrico do compartimento, limitado ao máximo observado
+                return min(self.maximo, self.minimo * self.base ** (i - 0.5))
+        return self.maximo
+
+
+class _Taxa:
+    """Total, primeiro e último instante e pico por minuto de um tipo de evento"""
+
+    def __init__(self):
+        self.total = 0
+        self.pico = 0
+        self._minuto = None
+        self._no_minuto = 0
+
+    def registrar(self, instante: float):
+        self.total += 1
+        minuto = int(instante // 60)
+        if minuto != self._minuto:
+            self._minuto = minuto
+            self._no_minuto = 0
+        self._no_minuto += 1
+        if self._no_minuto > self.pico:
+            self.pico = self._no_minuto
+
+    def resumo(self, minutos: float) -> dict:
+        return {
+            "total": self.total,
+            "por_minuto": round(self.total / minutos, 3) if minutos else None,
+            "pico_por_minuto": self.pico
+        }
+
+
+class AnalisadorLog:
+    """Acumula os eventos de um ou mais trechos do log; `relatorio` pode ser chamado a qualquer momento"""
+
+    def __init__(self, max_pendentes: int = MAX_PENDENTES):
+        self.max_pendentes = max_pendentes
+        self._instantes = _Instantes()
+        # Id -> instante da chegada, ou lista das chegadas, da mais antiga, se o id se repetiu
+        self._pendentes: Dict[bytes, object] = {}
+        self._aguardando = 0
+        self.chegadas = _Taxa()
+        self.processados = 0
+        self.sem_chegada = 0  # "Processando" de chamado cuja chegada não está no trecho lido
+        self.descartados = 0  # pendentes esquecidos por MAX_PENDENTES
+        self.espera = HistogramaLog()
+        self.notificacoes = _Taxa()
+        self.falhas_notificacao = 0
+        self.processos_iniciados = 0
+        self.reinicios = 0
+        self.ultimos_reinicios: deque = deque(maxlen=20)
+        self.primeiro: Optional[float] = None
+        self.ultimo: Optional[float] = None
+        self.bytes_lidos = 0
+
+    def _eventos(self, dados, inicio: int, fim: int) -> Iterator[tuple]:
+        """(casamento, instante) de cada evento, na ordem do arquivo; o instante vem do início da linha"""
+        segundos = self._instantes.segundos
+        primeiro = ultimo = None
+        for m in _EVENTO.finditer(dados, inicio, fim):
+            linha = dados.rfind(b"\n", inicio, m.start()) + 1 or inicio
+            # Texto: "2025-05-07 19:50:20,196 - ..."; JSON: {"ts": "2025-05-07T19:50:20.196", ...
+            ts = dados[linha + 8:linha + 31] if dados[linha] == 0x7B else dados[linha:linha + 23]
+            try:
+                instante = segundos(ts)
+            except ValueError:
+                continue  # Frase no meio de outra coisa (ex.: traceback), sem instante
+            if primeiro is None:
+                primeiro = ultimo = instante
+            elif instante > ultimo:
+                ultimo = instante
+            yield m, instante
+        if primeiro is not None:
+            # O log é quase ordenado: o primeiro e o último de cada passada bastam
+            if self.primeiro is None or primeiro < self.primeiro:
+                self.primeiro = primeiro
+            if self.ultimo is None or ultimo > self.ultimo:
+                self.ultimo = ultimo
+
+    def processar(self, dados, inicio: int = 0, fim: Optional[int] = None):
+        """Processa as linhas completas de `dados` (bytes ou mmap) entre `inicio` e `fim`"""
+        if fim is None:
+            fim = len(dados)
+        for m, instante in self._eventos(dados, inicio, fim):
+            evento = m.lastindex
+            if evento == _ADICIONADO:
+                self.chegadas.registrar(instante)
+                self._chegou(m.group(_ADICIONADO), instante)
+            elif evento == _PROCESSADO:
+                self.processados += 1
+                chegada = self._sair(m.group(_PROCESSADO))
+                if chegada is None:
+                    self.sem_chegada += 1
+                else:
+                    self.espera.adicionar(max(0.0, instante - chegada))
+            elif evento == _NOTIFICACAO:
+                self.notificacoes.registrar(instante)
+            elif evento == _FALHA_NOTIFICACAO:
+                self.falhas_notificacao += 1
+            elif evento == _INICIADO:
+                self.processos_iniciados += 1
+            else:
+                self.reinicios += 1
+                self.ultimos_reinicios.append(instante)
+        self.bytes_lidos += fim - inicio
+
+    def _chegou(self, id_chamado: bytes, instante: float):
+        # Com o reloader do Flask há dois processos por reinício, e o pai também registra
+        # e despacha chamados, às vezes com o mesmo id do filho: cada "Processando" fica
+        # com a chegada mais antiga ainda pendente daquele id
+        pendentes = self._pendentes
+        anterior = pendentes.get(id_chamado)
+        if anterior is None:
+            if len(pendentes) >= self.max_pendentes:
+                esquecido = pendentes.pop(next(iter(pendentes)))
+                quantos = len(esquecido) if isinstance(esquecido, list) else 1
+                self.descartados += quantos
+                self._aguardando -= quantos
+            pendentes[id_chamado] = instante
+        elif isinstance(anterior, list):
+            anterior.append(instante)
+        else:
+            pendentes[id_chamado] = [anterior, instante]
+        self._aguardando += 1
+
+    def _sair(self, id_chamado: bytes) -> Optional[float]:
+        """Chegada mais antiga pendente do id (None se não houver)"""
+        pendentes = self._pendentes
+        chegada = pendentes.get(id_chamado)
+        if chegada is None:
+            return None
+        self._aguardando -= 1
+        if not isinstance(chegada, list):
+            del pendentes[id_chamado]
+            return chegada
+        primeira = chegada.pop(0)
+        if len(chegada) == 1:
+            pendentes[id_chamado] = chegada[0]
+        return primeira
+
+    def relatorio(self) -> dict:
+        minutos = (self.ultimo - self.primeiro) / 60 if self.primeiro is not None else 0
+        quantis = {f"p{int(p * 100)}": self.espera.quantil(p) for p in (0.5, 0.9, 0.99)}
+        return {
+            "inicio": _formatar_instante(self.primeiro),
+            "fim": _formatar_instante(self.ultimo),
+            "minutos": round(minutos, 1),
+            "chegadas": self.chegadas.resumo(minutos),
+            "processados": self.processados,
+            "aguardando": self._aguardando,
+            "processados_sem_chegada": self.sem_chegada,
+            "pendentes_descartados": self.descartados,
+            "espera_s": {
+                "n": self.espera.total,
+                "media": round(self.espera.soma / self.espera.total, 3) if self.espera.total else None,
+                **{k: round(v, 3) if v is not None else None for k, v in quantis.items()},
+                "max": round(self.espera.maximo, 3) if self.espera.total else None
+            },
+            "notificacoes": {**self.notificacoes.resumo(minutos), "falhas": self.falhas_notificacao},
+            "reinicios": self.reinicios,
+            "processos_iniciados": self.processos_iniciados,
+            "ultimos_reinicios": [_formatar_instante(i) for i in self.ultimos_reinicios],
+            "bytes_lidos": self.bytes_lidos
+        }
+
+
+def _formatar_instante(instante: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(instante).strftime("%Y-%m-%d %H:%M:%S") if instante is not None else None
+
+
+def _processar_arquivo(arquivo, analisador: AnalisadorLog, inicio: int) -> int:
+    """
+    Processa as linhas completas de `inicio` até o fim atual do arquivo, em
+    janelas de TAMANHO_JANELA, mapeado em memória quando possível; retorna o
+    deslocamento da primeira linha ainda incompleta.
+    """
+    estado = os.fstat(arquivo.fileno())
+    dados = None
+    # Pipes e afins têm st_size 0 e não são mapeáveis: vão direto para a leitura em blocos
+    if stat.S_ISREG(estado.st_mode):
+        if estado.st_size <= inicio:
+            return inicio
+        try:
+            dados = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            pass
+    if dados is not None:
+        with dados:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                dados.madvise(mmap.MADV_SEQUENTIAL)
+            fim = dados.rfind(b"\n", inicio) + 1
+            while inicio < fim:
+                limite = min(inicio + TAMANHO_JANELA, fim)
+                if limite < fim:
+                    # Corta na última quebra de linha da janela (ou na próxima, se a linha for enorme)
+                    limite = dados.rfind(b"\n", inicio, limite) + 1 or dados.find(b"\n", limite) + 1
+                analisador.processar(dados, inicio, limite)
+                if hasattr(mmap, "MADV_DONTNEED"):
+                    # Páginas já lidas não contam mais na memória do processo
+                    alinhado = inicio - inicio % mmap.PAGESIZE
+                    dados.madvise(mmap.MADV_DONTNEED, alinhado, limite - alinhado)
+                inicio = limite
+            return inicio
+
+    # Sem mmap (pipe, sistema de arquivos sem suporte): blocos terminados em quebra de linha.
+    # Um pipe não volta atrás: segue de onde a última leitura parou
+    if arquivo.seekable():
+        arquivo.seek(inicio)
+    resto = b""
+    while True:
+        bloco = arquivo.read(TAMANHO_JANELA)
+        if not bloco:
+            return inicio
+        dados = resto + bloco
+        fim = dados.rfind(b"\n") + 1
+        analisador.processar(dados, 0, fim)
+        inicio += fim
+        resto = dados[fim:]
+
+
+def analisar(caminho: str, analisador: Optional[AnalisadorLog] = None) -> AnalisadorLog:
+    analisador = analisador or AnalisadorLog()
+    with open(caminho, "rb") as arquivo:
+        _processar_arquivo(arquivo, analisador, 0)
+    return analisador
+
+
+def seguir(caminho: str, analisador: AnalisadorLog, intervalo: float,
+           ao_atualizar: Callable[[AnalisadorLog], None], espera: float = 0.5):
+    """
+    Como `tail -F`: processa o arquivo e continua acompanhando o que é
+    acrescentado, inclusive após a rotação (o arquivo antigo é lido até o fim
+    antes de passar ao novo).
+    """
+    arquivo = open(caminho, "rb")
+    posicao = _processar_arquivo(arquivo, analisador, 0)
+    ao_atualizar(analisador)
+    proximo_relatorio = time.monotonic() + intervalo
+    try:
+        while True:
+            time.sleep(espera)
+            posicao = _processar_arquivo(arquivo, analisador, posicao)
+            try:
+                atual = os.stat(caminho)
+            except FileNotFoundError:
+                atual = None
+            aberto = os.fstat(arquivo.fileno())
+            if atual is not None and (atual.st_ino != aberto.st_ino or atual.st_size < posicao):
+                # Rotacionado ou truncado: recomeça no arquivo novo
+                arquivo.close()
+                arquivo = open(caminho, "rb")
+                posicao = _processar_arquivo(arquivo, analisador, 0)
+            if time.monotonic() >= proximo_relatorio:
+                ao_atualizar(analisador)
+                proximo_relatorio = time.monotonic() + intervalo
+    finally:
+        arquivo.close()
+
+
+def formatar(relatorio: dict) -> str:
+    espera = relatorio["espera_s"]
+    chegadas = relatorio["chegadas"]
+    notificacoes = relatorio["notificacoes"]
+    linhas = [
+        f"Período: {relatorio['inicio']} a {relatorio['fim']} ({relatorio['minutos']} min)",
+        f"Chegadas: {chegadas['total']} ({chegadas['por_minuto']}/min em média, pico de "
+        f"{chegadas['pico_por_minuto']}/min)",
+        f"Processados: {relatorio['processados']} ({relatorio['processados_sem_chegada']} sem a chegada no log); "
+        f"nunca processados: {relatorio['aguardando']}",
+        f"Espera na fila (s): n={espera['n']} média={espera['media']} p50={espera['p50']} "
+        f"p90={espera['p90']} p99={espera['p99']} máx={espera['max']}",
+        f"Notificações: {notificacoes['total']} ({notificacoes['por_minuto']}/min em média, pico de "
+        f"{notificacoes['pico_por_minuto']}/min), {notificacoes['falhas']} falhas",
+        f"Reinícios: {relatorio['reinicios']} ({relatorio['processos_iniciados']} processos iniciados)",
+    ]
+    if relatorio["ultimos_reinicios"]:
+        linhas.append("Últimos reinícios: " + ", ".join(relatorio["ultimos_reinicios"][-5:]))
+    return "\n".join(linhas)
+
+
+def main(argumentos: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Análise do suporte.log")
+    parser.add_argument("arquivo", nargs="?", default="suporte.log")
+    parser.add_argument("--seguir", action="store_true", help="continua acompanhando o arquivo")
+    parser.add_argument("--intervalo", type=float, default=10, help="segundos entre relatórios (--seguir)")
+    parser.add_argument("--json", action="store_true", help="relatório em JSON")
+    args = parser.parse_args(argumentos)
+
+    def imprimir(analisador: AnalisadorLog):
+        relatorio = analisador.relatorio()
+        print(json.dumps(relatorio, ensure_ascii=False) if args.json else formatar(relatorio) + "\n",
+              flush=True)
+
+    if args.seguir:
+        try:
+            seguir(args.arquivo, AnalisadorLog(), args.intervalo, imprimir)
+        except KeyboardInterrupt:
+            pass
+        return
+    inicio = time.perf_counter()
+    analisador = analisar(args.arquivo)
+    duracao = time.perf_counter() - inicio
+    imprimir(analisador)
+    if not args.json:
+        print(f"{analisador.bytes_lidos / 1e6:.1f} MB em {duracao:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
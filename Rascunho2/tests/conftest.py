@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Suporte_tecnico.py é importado pelo nome, como ao executar em Rascunho2
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
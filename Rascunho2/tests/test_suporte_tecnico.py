@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pytest
+
+import Suporte_tecnico as st
+
+
+def duvida(cliente="acme"):
+    return {"cliente_nome": cliente, "tipo_cliente": "Sem prioridade",
+            "tipo_chamado": "Dúvida", "descricao": "x"}
+
+
+def despachar_em_segundo_plano(sistema):
+    resultado = []
+    despachante = threading.Thread(target=lambda: resultado.extend(sistema.despachar()), daemon=True)
+    despachante.start()
+    return despachante, resultado
+
+
+def bloqueado(despachante):
+    despachante.join(0.1)
+    return despachante.is_alive()
+
+
+@pytest.fixture
+def sistema(monkeypatch):
+    sistema = st.SistemaChamados()
+    monkeypatch.setattr(st, "sistema", sistema)
+    return sistema
+
+
+def test_despachante_acorda_com_novo_chamado(sistema):
+    despachante, despachados = despachar_em_segundo_plano(sistema)
+    assert bloqueado(despachante)
+    chamado = sistema.adicionar_chamado(duvida())
+    despachante.join(2)
+    assert not despachante.is_alive()
+    assert despachados == [chamado]
+    assert chamado.status == st.StatusChamado.EM_ATENDIMENTO and chamado.agente in st.AGENTES
+
+
+def test_despacha_todos_os_pares_de_uma_vez(sistema):
+    chamados = [sistema.adicionar_chamado(duvida(f"cliente {i}")) for i in range(len(st.AGENTES) + 1)]
+    despachados = sistema.despachar()
+    assert despachados == chamados[:len(st.AGENTES)]
+    assert sorted(c.agente for c in despachados) == sorted(st.AGENTES)
+    assert sistema.tamanho == 1
+
+
+def test_finalizar_pela_rota_libera_o_agente_e_acorda_o_despachante(sistema):
+    ocupados = [sistema.adicionar_chamado(duvida(f"cliente {i}")) for i in range(len(st.AGENTES))]
+    sistema.despachar()
+    espera = sistema.adicionar_chamado(duvida("na fila"))
+    despachante, despachados = despachar_em_segundo_plano(sistema)
+    assert bloqueado(despachante)
+
+    cliente = st.app.test_client()
+    assert cliente.post(f"/chamado/{ocupados[0].id_chamado}/finalizar").status_code == 200
+    despachante.join(2)
+    assert not despachante.is_alive()
+    assert despachados == [espera]
+    assert espera.agente == ocupados[0].agente
+    assert ocupados[0].status == st.StatusChamado.RESOLVIDO
+    # Já finalizado, ou inexistente
+    assert cliente.post(f"/chamado/{ocupados[0].id_chamado}/finalizar").status_code == 404
+    assert cliente.post("/chamado/CHAM-0-0/finalizar").status_code == 404
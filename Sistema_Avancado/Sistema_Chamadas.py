@@ -1,19 +1,63 @@
+import atexit
+import gc
 import heapq
+import hmac
+import itertools
+import math
+import os
+import threading
 import time
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict, Iterable, Iterator
 from enum import Enum
-from flask import Flask, request, jsonify, render_template
+from functools import wraps
+from flask import Flask, Response, g, request, jsonify, render_template
 from flask_sse import sse
 from flask_socketio import SocketIO, emit
 from plyer import notification
+from admissao import LimitadorPorCliente
+from notificacoes import AgregadorNotificacoes
+from log_estruturado import LogEstruturado
+from metricas import RegistroMetricas
+from modelo_resolucao import ModeloResolucao
+from perfilamento import MonitorMemoria, PerfisRequisicao, amostrar_cpu, pilhas_colapsadas
+from previsao import TrabalhoAFrente, Vagas
+from busca import IndiceInvertido
+from heap_indexado import HeapIndexado
+from fila_justa import FilaJusta
+from estatisticas import EstatisticasChamados
+from exportacao import blocos_csv, blocos_gzip
+from journal import Journal
+from repositorio import RepositorioSQLite
+from roda_temporizacao import RodaTemporizacao
+from snapshot import (caminho_segmento, caminho_snapshot, compactar, gravar_snapshot,
+                      ler_snapshot_mais_recente, listar)
 
 app = Flask(__name__)
 app.config["SECRET_KEY"] = "secret!"
 app.config["REDIS_URL"] = "redis://localhost"
 app.register_blueprint(sse, url_prefix='/stream')
 socketio = SocketIO(app)
+log = LogEstruturado("sistema_chamados.log")
+
+# Métricas expostas em /metrics (formato texto do Prometheus)
+metricas = RegistroMetricas()
+latencia_rotas = metricas.histograma(
+    "http_requisicao_segundos", "Latência das rotas HTTP", ("rota", "metodo", "status"))
+latencia_socket = metricas.histograma(
+    "socketio_evento_segundos", "Duração dos handlers Socket.IO", ("evento",))
+latencia_operacoes = metricas.histograma(
+    "sistema_operacao_segundos",
+    "Duração das operações do SistemaChamados, sem a serialização e o envio do estado", ("operacao",))
+latencia_serializacao = metricas.histograma(
+    "sistema_serializacao_segundos", "Serialização do estado enviado aos clientes", ("evento",))
+latencia_envio = metricas.histograma(
+    "sistema_envio_segundos", "Envio (broadcast) do estado aos clientes Socket.IO", ("evento",))
+clientes_conectados = metricas.medidor(
+    "socketio_clientes_conectados", "Clientes Socket.IO conectados")
+chamados_recusados = metricas.contador(
+    "chamados_recusados_total", "Chamados recusados pelo controle de admissão", ("motivo", "tipo_cliente"))
 
 # Enums para tipos estruturados
 class TipoChamado(Enum):
@@ -32,6 +76,11 @@ class StatusChamado(Enum):
     EM_ATENDIMENTO = "Em atendimento"
     RESOLVIDO = "Resolvido"
 
+class StatusAgente(Enum):
+    DISPONIVEL = "Disponível"  # recebe chamados
+    PAUSADO = "Pausado"  # mantém os chamados em atendimento, não recebe novos
+    DESCONECTADO = "Desconectado"  # fora do turno: os chamados dele voltaram para a fila
+
 # Prioridades e tempos de resolução
 PRIORIDADE_CHAMADO = {
     TipoChamado.SERVER_DOWN: 1,
@@ -45,6 +94,16 @@ PRIORIDADE_CLIENTE = {
     TipoCliente.SEM_PRIORIDADE: 2,
     TipoCliente.DEMONSTRACAO: 3
 }
+# Fila justa: dentro de cada prioridade de chamado, a ordem é o término virtual de cada cliente (fila_justa.py)
+# em vez de (prioridade do cliente, chegada): um cliente que inunda a fila só atrasa os próprios chamados.
+# PESO_CLIENTE é a fração de um agente que um cliente do tipo ocupa antes de ficar atrás dos demais; um chamado
+# isolado vale como um prazo de chegada + tempo estimado / peso
+FILA_JUSTA = False
+PESO_CLIENTE = {
+    TipoCliente.PRIORITARIO: 1.0,
+    TipoCliente.SEM_PRIORIDADE: 0.5,
+    TipoCliente.DEMONSTRACAO: 0.25
+}
 
 TEMPO_RESOLUCAO = {
     TipoChamado.SERVER_DOWN: 120,
@@ -52,13 +111,117 @@ TEMPO_RESOLUCAO = {
     TipoChamado.SEM_IMPACTO: 30,
     TipoChamado.DUVIDA: 15
 }
+# O prazo de SLA é sempre o da tabela; o tempo_estimado de cada chamado vem do modelo aprendido
+PRAZO_SLA = {tipo: timedelta(minutes=minutos) for tipo, minutos in TEMPO_RESOLUCAO.items()}
+
+# Modelo de tempo de resolução aprendido com os atendimentos finalizados
+MODELO_ALFA = 0.1  # peso de cada nova duração na média móvel exponencial
+MODELO_QUANTIL = 0.9
+MODELO_MIN_AMOSTRAS = 5  # abaixo disso a chave usa a estimativa mais geral (ou a tabela)
+
+# Roteamento: proficiência (0 a 1) de um agente num tipo de especialidade sem nota própria
+PROFICIENCIA_PADRAO = 1.0
+# Preempção: um chamado de prioridade <= PREEMPCAO_PRIORIDADE começa na chegada, com um agente livre ou
+# interrompendo, num agente compatível, o atendimento menos prioritário (de prioridade >= PREEMPCAO_MINIMA),
+# que volta para a fila na posição original. None desativa.
+PREEMPCAO_PRIORIDADE = 1
+PREEMPCAO_MINIMA = 3
+# Agentes cadastrados ao iniciar sem nenhum agente recuperado do journal/snapshot (mesmo formato de POST /api/agentes)
+AGENTES_INICIAIS = [
+    {"id": "ag1", "nome": "Ana Silva", "especialidades": ["Server down", "Impacta produção"]},
+    {"id": "ag2", "nome": "Carlos Souza", "especialidades": ["Sem impacto", "Dúvida"]},
+]
+
+# Chamado novo do mesmo cliente e tipo de um já aberto é agrupado nele (ocorrencias += 1),
+# sem nova entrada na fila, notificação ou broadcast
+DUPLICADOS_AGRUPAR = True
+DUPLICADOS_TIPOS = (TipoChamado.SERVER_DOWN, TipoChamado.IMPACTA_PRODUCAO)
+DUPLICADOS_STATUS = (StatusChamado.PENDENTE, StatusChamado.EM_ATENDIMENTO)  # do chamado que absorve
+
+# Persistência: journal de eventos em DIRETORIO_DADOS, gravado em lotes (group commit)
+DIRETORIO_DADOS = "dados"
+JOURNAL_LOTE = 512  # eventos por fsync
+JOURNAL_LATENCIA = 0.005  # segundos de espera máxima antes do fsync
+JOURNAL_SINCRONO = False  # True: cada operação só retorna após o fsync do seu lote
+SNAPSHOT_INTERVALO = 300  # segundos entre snapshots do estado completo
+SNAPSHOT_MIN_EVENTOS = 1000  # só grava snapshot se houver ao menos isso de eventos novos
+# Histórico consultável de todos os chamados (None desativa)
+REPOSITORIO_SQLITE = os.path.join(DIRETORIO_DADOS, "chamados.db")
+
+DEBUG = True
+
+# Rotas /admin (perfis de CPU e memória) exigem o cabeçalho X-Token-Admin com este valor;
+# sem a variável de ambiente definida elas ficam desativadas
+TOKEN_ADMIN = os.environ.get("SISTEMA_CHAMADOS_TOKEN_ADMIN")
+MAX_SEGUNDOS_PERFIL_CPU = 60
+
+# SLA: o prazo de cada chamado é o TEMPO_RESOLUCAO do tipo, contado na espera
+# (desde a abertura) e de novo no atendimento (desde o início do atendimento)
+SLA_INTERVALO_VERIFICACAO = 1  # segundos entre avanços da roda de temporização
+SLA_ESCALONAR_AUTOMATICAMENTE = True  # pendente que estoura o SLA passa à prioridade 1
+
+# Agregação de notificações (evita uma notificação por chamado em tempestades)
+JANELA_NOTIFICACOES = 60  # segundos
+MAX_NOTIFICACOES_INDIVIDUAIS = 3  # por tipo, dentro da janela
+MAX_NOTIFICACOES_POR_MINUTO = 10
+
+# Controle de admissão na entrada (POST /api/chamados e novo_chamado): chamados de prioridade até
+# ADMISSAO_PRIORIDADE_GARANTIDA, de clientes de prioridade até ADMISSAO_PRIORIDADE_CLIENTE_GARANTIDA, sempre
+# entram; os demais são recusados (429 com Retry-After) se a fila já tem ADMISSAO_FILA_MAXIMA pendentes ou se o
+# cliente passou da sua taxa (token bucket). None desativa cada limite
+ADMISSAO_PRIORIDADE_GARANTIDA = 2
+ADMISSAO_PRIORIDADE_CLIENTE_GARANTIDA = 2  # o Server down de um cliente de demonstração passa pelos limites
+ADMISSAO_FILA_MAXIMA = 10_000
+ADMISSAO_ESPERA_FILA_CHEIA = 30  # Retry-After (s) com a fila cheia
+ADMISSAO_TAXA_POR_CLIENTE = 1 / 60  # chamados por segundo de cada cliente, em regime
+ADMISSAO_RAJADA_POR_CLIENTE = 10  # chamados seguidos de um cliente que estava ocioso
+ADMISSAO_MAX_CLIENTES = 100_000  # baldes guardados; além disso sai o cliente ocioso há mais tempo
 
 @dataclass
 class AgenteSuporte:
     id: str
     nome: str
     especialidades: List[TipoChamado]
-    chamado_atual: Optional[str] = None
+    capacidade: int = 1  # chamados atendidos ao mesmo tempo
+    chamados: List[str] = field(default_factory=list)
+    # Nota de 0 a 1 por tipo de chamado; as especialidades sem nota valem PROFICIENCIA_PADRAO
+    proficiencias: Dict[TipoChamado, float] = field(default_factory=dict)
+    status: StatusAgente = StatusAgente.DISPONIVEL
+
+    @property
+    def vagas(self) -> int:
+        return self.capacidade - len(self.chamados)
+
+    def proficiencia(self, tipo: TipoChamado) -> float:
+        return self.proficiencias.get(tipo, PROFICIENCIA_PADRAO)
+
+def campos_agente(dados: dict) -> dict:
+    """
+    Campos de AgenteSuporte presentes no JSON da API. `especialidades` é uma
+    lista de tipos de chamado ou um objeto {tipo: proficiência de 0 a 1}.
+    ValueError/TypeError se algum valor for inválido.
+    """
+    campos = {}
+    if "nome" in dados:
+        if not isinstance(dados["nome"], str) or not dados["nome"]:
+            raise ValueError("nome inválido")
+        campos["nome"] = dados["nome"]
+    if "especialidades" in dados:
+        especialidades = dados["especialidades"]
+        if isinstance(especialidades, dict):
+            proficiencias = {TipoChamado(t): float(nota) for t, nota in especialidades.items()}
+            if not all(0 <= nota <= 1 for nota in proficiencias.values()):
+                raise ValueError("proficiência fora de 0 a 1")
+        else:
+            proficiencias = {TipoChamado(t): PROFICIENCIA_PADRAO for t in especialidades}
+        campos["especialidades"] = list(proficiencias)
+        campos["proficiencias"] = proficiencias
+    if "capacidade" in dados:
+        capacidade = dados["capacidade"]
+        if not isinstance(capacidade, int) or capacidade < 1:
+            raise ValueError("capacidade inválida")
+        campos["capacidade"] = capacidade
+    return campos
 
 @dataclass(order=True)
 class ChamadoSuporte:
@@ -71,7 +234,13 @@ class ChamadoSuporte:
     timestamp: datetime = field(default_factory=datetime.now)
     prioridade_manual: Optional[int] = None
     agente_atribuido: Optional[str] = None
+    inicio_atendimento: Optional[datetime] = None
+    resolvido_em: Optional[datetime] = None
+    ocorrencias: int = 1
     tempo_estimado: timedelta = field(init=False)
+    ordem: int = field(default=0, compare=False)  # desempate na fila, mantido ao voltar para ela
+    termino_virtual: float = field(default=0.0, compare=False)  # posição na fila justa, mantida ao voltar para ela
+    atendido: bool = field(default=False, compare=False)  # já começou um atendimento: a espera conta uma vez só
 
     def __post_init__(self):
         self.tempo_estimado = timedelta(minutes=TEMPO_RESOLUCAO[self.tipo_chamado])
@@ -82,258 +251,1231 @@ class ChamadoSuporte:
         prioridade_cliente = PRIORIDADE_CLIENTE[self.tipo_cliente]
         return (prioridade_chamado, prioridade_cliente)
 
+def _mutacao(metodo):
+    """
+    Executa o método sob o lock do sistema. Ao sair da chamada mais externa,
+    registra a duração da operação e, se o journal for síncrono, espera o
+    group commit dos eventos registrados. Com o journal parado por erro de
+    escrita, nenhuma alteração é aceita (OSError).
+    """
+    nome = metodo.__name__
+
+    @wraps(metodo)
+    def envolvido(self, *args, **kwargs):
+        with self._lock:
+            if self._profundidade == 0 and not self._reproduzindo:
+                if self.journal:
+                    self.journal.verificar()
+                self._instante = datetime.fromtimestamp(self.relogio())
+                self._tempo_notificacao = 0.0
+                inicio = time.perf_counter()
+            self._profundidade += 1
+            try:
+                resultado = metodo(self, *args, **kwargs)
+            finally:
+                self._profundidade -= 1
+            externa = self._profundidade == 0
+            if externa and self._alterados:
+                if self.repositorio:
+                    for chamado in self._alterados.values():
+                        self.repositorio.salvar(self._tupla_chamado(chamado))
+                self._alterados.clear()
+            if externa and not self._reproduzindo and not self.silencioso:
+                latencia_operacoes.observar(
+                    time.perf_counter() - inicio - self._tempo_notificacao, nome)
+        if externa and self.journal and self.journal.sincrono:
+            self.journal.aguardar()
+        return resultado
+    return envolvido
+
 class SistemaChamados:
-    def __init__(self):
-        self.fila = []
+    def __init__(self, relogio: Callable[[], float] = time.time, silencioso: bool = False):
+        """
+        `relogio` dá o instante (epoch) de cada operação; `silencioso` desliga log,
+        notificações, envio Socket.IO e métricas (simulação, benchmark)
+        """
+        self.relogio = relogio
+        self.silencioso = silencioso
+        # Um heap por tipo de chamado, com remoção preguiçosa: uma entrada (chave..., sequência, chamado) só vale
+        # enquanto for a de `_na_fila` para o chamado; as outras são obsoletas e descartadas no topo ou na compactação
+        self.filas: Dict[TipoChamado, list] = {t: [] for t in TipoChamado}
+        self._na_fila: Dict[str, tuple] = {}
+        self._sequencia_fila = itertools.count()
         self.contador = 0
         self.agentes: Dict[str, AgenteSuporte] = {}
+        # Por especialidade, os agentes com vaga: maior proficiência primeiro, depois o que deve terminar antes
+        # (tempo aprendido do agente no tipo, escalado pela ocupação)
+        self.agentes_livres: Dict[TipoChamado, HeapIndexado] = {t: HeapIndexado() for t in TipoChamado}
+        # Por especialidade, os atendimentos dos agentes disponíveis que a têm, do menos prioritário ao mais:
+        # quem a preempção interrompe
+        self.interrompiveis: Dict[TipoChamado, HeapIndexado] = {t: HeapIndexado() for t in TipoChamado}
+        # Com FILA_JUSTA, o último término virtual de cada cliente com chamado na fila, por prioridade
+        self.fila_justa = FilaJusta()
         self.chamados_ativos: Dict[str, ChamadoSuporte] = {}
         self.ultimo_id = 0
         self.chamados_em_atendimento: Dict[str, ChamadoSuporte] = {}
+        self.notificacoes = AgregadorNotificacoes(
+            self._enviar_notificacao,
+            janela=JANELA_NOTIFICACOES,
+            max_individuais=MAX_NOTIFICACOES_INDIVIDUAIS,
+            max_por_minuto=MAX_NOTIFICACOES_POR_MINUTO
+        )
+        self.estatisticas = EstatisticasChamados(
+            [t.value for t in TipoChamado], [t.value for t in TipoCliente]
+        )
+        # Um temporizador de SLA por chamado ativo, com a fase ("espera" ou "atendimento")
+        self.sla = RodaTemporizacao(relogio())
+        self.modelo = ModeloResolucao(
+            {t.value: minutos * 60 for t, minutos in TEMPO_RESOLUCAO.items()},
+            alfa=MODELO_ALFA, quantil=MODELO_QUANTIL, min_amostras=MODELO_MIN_AMOSTRAS
+        )
+        # Chamados abertos de cada cliente (id -> chamado), para agrupar duplicados
+        self.abertos_por_cliente: Dict[str, Dict[str, ChamadoSuporte]] = {}
+        # Busca textual na descrição e no nome do cliente dos chamados ativos
+        self.indice_busca = IndiceInvertido()
+        # Trabalho estimado à frente de cada pendente, entre os do mesmo tipo (previsão de espera)
+        self.a_frente = TrabalhoAFrente()
+        self.journal: Optional[Journal] = None
+        self.repositorio: Optional[RepositorioSQLite] = None
+        # Chamados alterados na operação em curso, enviados ao repositório ao final dela
+        self._alterados: Dict[str, ChamadoSuporte] = {}
+        self._lock = threading.RLock()
+        self._profundidade = 0
+        self._reproduzindo = False
+        self._instante = datetime.fromtimestamp(relogio())
+        # Tempo gasto em _notificar_mudanca na operação em curso (medido à parte)
+        self._tempo_notificacao = 0.0
+        self._diretorio_dados: Optional[str] = None
+        self._segmento = 0
+        self._lock_snapshot = threading.Lock()
+        # Durante um snapshot: estado de cada chamado antes da primeira alteração pós-corte
+        self._preimagens: Optional[Dict[str, tuple]] = None
+
+    def _agora(self) -> datetime:
+        """Instante da operação em curso (o do evento, durante a reprodução do journal)"""
+        return self._instante
 
     def _gerar_id(self) -> str:
         self.ultimo_id += 1
         return f"INC-{self.ultimo_id}"
 
+    def _registrar_evento(self, tipo: str, *dados):
+        """Grava a operação mais externa no journal (as aninhadas são refeitas por ela)"""
+        if self.journal and self._profundidade == 1 and not self._reproduzindo:
+            self.journal.registrar((tipo, self._instante.timestamp(), dados))
+
+    def _log(self, evento: str, /, **campos):
+        if not self._reproduzindo and not self.silencioso:
+            log.info(evento, **campos)
+
+    def _avisar(self, **kwargs):
+        if not self._reproduzindo and not self.silencioso:
+            self.notificacoes.registrar(**kwargs)
+
+    def _preservar(self, chamado: ChamadoSuporte):
+        """
+        Chamar antes de alterar um chamado: guarda a imagem dele para o snapshot
+        em curso e o marca para ser gravado no repositório ao fim da operação
+        """
+        if self._preimagens is not None and chamado.id_chamado not in self._preimagens:
+            self._preimagens[chamado.id_chamado] = self._imagem_chamado(chamado)
+        if self.repositorio:
+            self._alterados[chamado.id_chamado] = chamado
+
+    def _mudar_status(self, chamado: ChamadoSuporte, status: StatusChamado):
+        """Muda o status mantendo os instantes do ciclo de vida e as estatísticas (após _preservar)"""
+        if chamado.status == status:
+            return
+        chamado.status = status
+        agora = self._agora()
+        if status == StatusChamado.EM_ATENDIMENTO:
+            chamado.inicio_atendimento = agora
+            self._armar_sla(chamado)
+            self.a_frente.retirar(chamado.id_chamado)
+            if FILA_JUSTA:
+                self.fila_justa.retirar(chamado.prioridade_combinada()[0], chamado.cliente_nome,
+                                        chamado.termino_virtual)
+            # Interrompido ou devolvido à fila, o chamado não soma de novo a espera (que incluiria o atendimento)
+            espera = None if chamado.atendido else (agora - chamado.timestamp).total_seconds()
+            chamado.atendido = True
+            self.estatisticas.inicio_atendimento(chamado.tipo_chamado.value, chamado.tipo_cliente.value, espera)
+        elif status == StatusChamado.PENDENTE:
+            chamado.inicio_atendimento = None
+            self._estimar_tempo(chamado)
+            self._armar_sla(chamado)
+            self._enfileirar_previsao(chamado)
+            self.estatisticas.retorno_fila(chamado.tipo_chamado.value, chamado.tipo_cliente.value)
+        else:
+            chamado.resolvido_em = agora
+            self.sla.cancelar(chamado.id_chamado)
+            self.a_frente.retirar(chamado.id_chamado)
+            self.indice_busca.remover(chamado.id_chamado, chamado.descricao, chamado.cliente_nome)
+            self._fechar_do_cliente(chamado)
+            atendimento = None
+            if chamado.inicio_atendimento:
+                atendimento = (agora - chamado.inicio_atendimento).total_seconds()
+                self.modelo.registrar(chamado.tipo_chamado.value, chamado.tipo_cliente.value,
+                                      chamado.agente_atribuido, atendimento)
+            self.estatisticas.resolucao(agora.timestamp(), atendimento)
+
+    def _abrir_do_cliente(self, chamado: ChamadoSuporte):
+        self.abertos_por_cliente.setdefault(chamado.cliente_nome, {})[chamado.id_chamado] = chamado
+
+    def _fechar_do_cliente(self, chamado: ChamadoSuporte):
+        abertos = self.abertos_por_cliente.get(chamado.cliente_nome)
+        if abertos is not None:
+            abertos.pop(chamado.id_chamado, None)
+            if not abertos:
+                del self.abertos_por_cliente[chamado.cliente_nome]
+
+    def _duplicado(self, cliente_nome: str, tipo_chamado: TipoChamado) -> Optional[ChamadoSuporte]:
+        """Chamado aberto do cliente que absorve um novo do mesmo tipo, pela política DUPLICADOS_*"""
+        if not DUPLICADOS_AGRUPAR or tipo_chamado not in DUPLICADOS_TIPOS:
+            return None
+        for chamado in self.abertos_por_cliente.get(cliente_nome, {}).values():
+            if chamado.tipo_chamado == tipo_chamado and chamado.status in DUPLICADOS_STATUS:
+                return chamado
+        return None
+
+    def _estimar_tempo(self, chamado: ChamadoSuporte):
+        """tempo_estimado pelo modelo aprendido, para o agente atribuído se houver"""
+        chamado.tempo_estimado = timedelta(seconds=round(self.modelo.estimar(
+            chamado.tipo_chamado.value, chamado.tipo_cliente.value, chamado.agente_atribuido)))
+
+    @staticmethod
+    def _prazo_sla(chamado: ChamadoSuporte) -> tuple:
+        """(instante, fase) do prazo da fase atual do chamado: espera ou atendimento"""
+        if chamado.status == StatusChamado.EM_ATENDIMENTO and chamado.inicio_atendimento:
+            fase, inicio = "atendimento", chamado.inicio_atendimento
+        else:
+            fase, inicio = "espera", chamado.timestamp
+        return (inicio + PRAZO_SLA[chamado.tipo_chamado]).timestamp(), fase
+
+    def _armar_sla(self, chamado: ChamadoSuporte):
+        """(Re)arma o prazo da fase atual do chamado"""
+        self.sla.agendar(chamado.id_chamado, *self._prazo_sla(chamado))
+
+    def _rearmar_sla(self, ate: float):
+        """
+        Recria os prazos dos chamados ativos depois de recuperar o estado. Os que
+        venceram até `ate` (o último evento) já dispararam antes da parada, e o
+        escalonamento que causaram está no journal: não são armados de novo
+        """
+        self.sla = RodaTemporizacao(ate)
+        for chamado in self.chamados_ativos.values():
+            prazo, fase = self._prazo_sla(chamado)
+            if not self.sla.vencido(prazo):
+                self.sla.agendar(chamado.id_chamado, prazo, fase)
+
+    def _enfileirar_previsao(self, chamado: ChamadoSuporte):
+        """(Re)posiciona o pendente na previsão de espera, na mesma ordem da fila"""
+        prioridade, instante, ordem = self._chave_fila(chamado)
+        self.a_frente.enfileirar(
+            chamado.id_chamado, chamado.tipo_chamado,
+            (prioridade, instante if FILA_JUSTA else instante.timestamp(), ordem, chamado.id_chamado),
+            chamado.tempo_estimado.total_seconds()
+        )
+
+    def _vagas_agentes(self, agora: float) -> Dict[TipoChamado, Vagas]:
+        """
+        Por tipo de chamado, as vagas dos agentes disponíveis compatíveis: livres já, ou
+        quando acabar, pela estimativa, o atendimento em curso que as ocupa
+        """
+        liberacoes: Dict[TipoChamado, List[float]] = {}
+        competidores: Dict[TipoChamado, set] = {}
+        for agente in self.agentes.values():
+            if agente.status != StatusAgente.DISPONIVEL:
+                continue
+            tempos = [0.0] * max(0, agente.vagas)
+            for id_chamado in agente.chamados:
+                atual = self.chamados_ativos.get(id_chamado)
+                if atual is not None and atual.inicio_atendimento:
+                    tempos.append(max(0.0, (atual.inicio_atendimento + atual.tempo_estimado).timestamp() - agora))
+                else:
+                    tempos.append(0.0)
+            for tipo in agente.especialidades:
+                liberacoes.setdefault(tipo, []).extend(tempos)
+                competidores.setdefault(tipo, set()).update(agente.especialidades)
+        return {tipo: Vagas(liberacoes[tipo], competidores[tipo]) for tipo in liberacoes}
+
+    def _espera_prevista(self, chamado: ChamadoSuporte, vagas: Dict[TipoChamado, Vagas]) -> tuple:
+        """
+        (segundos até o início, trabalho à frente, vagas compatíveis) do pendente: o trabalho
+        dos chamados à frente que disputam os mesmos agentes, consumido pelas vagas deles
+        """
+        compativeis = vagas.get(chamado.tipo_chamado)
+        if compativeis is None:
+            return None, self.a_frente.trabalho(chamado.id_chamado), 0
+        trabalho = self.a_frente.trabalho(chamado.id_chamado, compativeis.competidores)
+        return compativeis.espera(trabalho), trabalho, len(compativeis)
+
+    def previsoes_espera(self, ids: Optional[List[str]] = None) -> Dict[str, Optional[float]]:
+        """Espera prevista (segundos) dos pendentes em `ids`, ou de todos em O(n · tipos + agentes)"""
+        with self._lock:
+            vagas = self._vagas_agentes(self.relogio())
+            if ids is not None:
+                return {
+                    id_chamado: self._espera_prevista(self.chamados_ativos[id_chamado], vagas)[0]
+                    for id_chamado in ids if id_chamado in self.a_frente
+                }
+            trabalhos = self.a_frente.trabalhos({tipo: v.competidores for tipo, v in vagas.items()})
+            return {
+                id_chamado: vagas[tipo].espera(trabalho) if tipo in vagas else None
+                for id_chamado, (tipo, trabalho) in trabalhos.items()
+            }
+
+    def buscar_chamados(self, consulta: str, limite: int = 50) -> tuple:
+        """(total, chamados ativos que casam com a consulta, na ordem da fila, até `limite`)"""
+        with self._lock:
+            ids = self.indice_busca.buscar(consulta)
+            chamados = heapq.nsmallest(
+                limite, (self.chamados_ativos[i] for i in ids),
+                key=lambda c: (c.prioridade_combinada(), c.timestamp)
+            )
+            return len(ids), chamados
+
+    def previsao_chamado(self, id_chamado: str) -> Optional[dict]:
+        """Detalhe da previsão de início de um chamado ativo (None se não estiver ativo)"""
+        with self._lock:
+            chamado = self.chamados_ativos.get(id_chamado)
+            if chamado is None:
+                return None
+            agora = self.relogio()
+            previsao = {
+                "id": id_chamado,
+                "status": chamado.status.value,
+                "trabalho_a_frente_min": None,
+                "vagas_compativeis": None,
+                "espera_prevista_min": None,
+                "inicio_previsto": None
+            }
+            if id_chamado not in self.a_frente:
+                return previsao
+            espera, trabalho, vagas = self._espera_prevista(chamado, self._vagas_agentes(agora))
+            previsao["trabalho_a_frente_min"] = round(trabalho / 60, 1)
+            previsao["vagas_compativeis"] = vagas
+            previsao.update(self._campos_previsao(espera, agora))
+            return previsao
+
+    @staticmethod
+    def _campos_previsao(espera: Optional[float], agora: float) -> dict:
+        if espera is None:
+            return {"espera_prevista_min": None, "inicio_previsto": None}
+        return {
+            "espera_prevista_min": round(espera / 60, 1),
+            "inicio_previsto": datetime.fromtimestamp(agora + espera).strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    def verificar_sla(self, agora: Optional[float] = None) -> int:
+        """Dispara as violações de SLA vencidas até `agora`; retorna quantas foram"""
+        if agora is None:
+            agora = self.relogio()
+        with self._lock:
+            violacoes = [
+                (self.chamados_ativos[id_chamado], fase)
+                for id_chamado, fase in self.sla.avancar(agora)
+                if id_chamado in self.chamados_ativos
+            ]
+            for _ in violacoes:
+                self.estatisticas.violacao_sla()
+        if not violacoes:
+            return 0
+
+        escalar = []
+        for chamado, fase in violacoes:
+            if (SLA_ESCALONAR_AUTOMATICAMENTE and fase == "espera"
+                    and chamado.prioridade_combinada()[0] > 1):
+                escalar.append(chamado.id_chamado)
+            if self.silencioso:
+                continue
+            prazo = chamado.inicio_atendimento if fase == "atendimento" else chamado.timestamp
+            atraso = agora - (prazo + PRAZO_SLA[chamado.tipo_chamado]).timestamp()
+            log.aviso("sla_violado", "SLA do chamado %s estourado (%s)", chamado.id_chamado, fase,
+                      id_chamado=chamado.id_chamado, fase=fase, atraso_s=atraso)
+            socketio.emit('sla_violado', {
+                "id": chamado.id_chamado,
+                "fase": fase,
+                "tipo_chamado": chamado.tipo_chamado.value,
+                "atraso_s": round(atraso, 1)
+            })
+            self._avisar(
+                categoria="sla",
+                assunto=chamado.tipo_chamado.value,
+                cliente=chamado.cliente_nome,
+                titulo="SLA Estourado!",
+                mensagem=f"Chamado {chamado.id_chamado} passou do prazo de {fase}",
+                resumo="{total} chamados {assunto} com SLA estourado ({clientes} clientes)"
+            )
+        if escalar:
+            self.escalar_por_sla(escalar)
+        return len(violacoes)
+
+    @_mutacao
+    def escalar_por_sla(self, ids_chamados: List[str]):
+        """Passa os chamados pendentes à prioridade 1: O(log n) cada"""
+        escalados = []
+        for id_chamado in ids_chamados:
+            chamado = self.chamados_ativos.get(id_chamado)
+            if chamado is None or chamado.status != StatusChamado.PENDENTE:
+                continue
+            self._preservar(chamado)
+            self._mudar_prioridade(chamado, 1)
+            self._enfileirar_previsao(chamado)
+            self._reposicionar_na_fila(chamado)
+            escalados.append(id_chamado)
+        if not escalados:
+            return
+        self._registrar_evento("escalar_sla", escalados)
+        self._notificar_mudanca()
+        self._log("chamados_escalados_sla", quantidade=len(escalados))
+
+    @_mutacao
     def adicionar_agente(self, agente: AgenteSuporte):
+        """Cadastra o agente (o recadastro mantém os chamados em atendimento) e já lhe entrega chamados"""
+        anterior = self.agentes.get(agente.id)
+        if anterior is not None:
+            self._retirar_dos_livres(anterior)
+            agente.chamados = anterior.chamados
         self.agentes[agente.id] = agente
+        self._atualizar_carga(agente)
+        self._registrar_evento("agente", agente.id, agente.nome,
+                               [e.value for e in agente.especialidades], agente.capacidade,
+                               {t.value: nota for t, nota in agente.proficiencias.items()})
+        self._despachar()
+        self._notificar_mudanca()
+        self._log("agente_cadastrado", agente=agente.id, capacidade=agente.capacidade,
+                  especialidades=[e.value for e in agente.especialidades])
 
+    @_mutacao
+    def atualizar_agente(self, id_agente: str, dados: dict) -> bool:
+        """Altera nome, especialidades/proficiências e capacidade (ValueError se `dados` for inválido)"""
+        agente = self.agentes.get(id_agente)
+        if agente is None:
+            return False
+        campos = campos_agente(dados)
+        self._retirar_dos_livres(agente)
+        for nome, valor in campos.items():
+            setattr(agente, nome, valor)
+        self._atualizar_carga(agente)
+        self._registrar_evento("agente_atualizar", id_agente, dict(dados))
+        self._despachar()
+        self._notificar_mudanca()
+        self._log("agente_atualizado", agente=id_agente, campos=sorted(campos))
+        return True
+
+    @_mutacao
+    def pausar_agente(self, id_agente: str) -> bool:
+        """O agente termina o que tem, mas deixa de receber chamados"""
+        agente = self.agentes.get(id_agente)
+        if agente is None or agente.status == StatusAgente.DESCONECTADO:
+            return False
+        agente.status = StatusAgente.PAUSADO
+        self._retirar_dos_livres(agente)
+        self._registrar_evento("agente_pausar", id_agente)
+        self._notificar_mudanca()
+        self._log("agente_pausado", agente=id_agente)
+        return True
+
+    @_mutacao
+    def entrar_agente(self, id_agente: str) -> bool:
+        """Login ou fim da pausa: o agente volta a receber chamados e já puxa os da fila"""
+        agente = self.agentes.get(id_agente)
+        if agente is None:
+            return False
+        agente.status = StatusAgente.DISPONIVEL
+        self._atualizar_carga(agente)
+        self._registrar_evento("agente_entrar", id_agente)
+        atribuidos = self._despachar()
+        self._notificar_mudanca()
+        self._log("agente_entrou", agente=id_agente, atribuidos=atribuidos)
+        return True
+
+    @_mutacao
+    def sair_agente(self, id_agente: str) -> bool:
+        """
+        Logout: os chamados em atendimento do agente voltam para a fila na posição
+        original (O(log n) cada) e são redistribuídos entre os agentes livres.
+        False, sem nada no journal, se o agente não existe ou já saiu
+        """
+        agente = self.agentes.get(id_agente)
+        if agente is None or agente.status == StatusAgente.DESCONECTADO:
+            return False
+        agente.status = StatusAgente.DESCONECTADO
+        self._retirar_dos_livres(agente)
+        devolvidos = [self.chamados_ativos[i] for i in agente.chamados]
+        for chamado in devolvidos:
+            self._devolver_a_fila(chamado)
+        self._registrar_evento("agente_sair", id_agente)
+        self._despachar()
+        self._notificar_mudanca()
+        self._log("agente_saiu", agente=id_agente, devolvidos=len(devolvidos))
+        return True
+
+    def _atualizar_carga(self, agente: AgenteSuporte):
+        """
+        Reposiciona o agente entre os livres das suas especialidades, e os
+        atendimentos dele entre os interrompíveis, em O(log) cada. A chave de
+        um livre é a nota e, entre notas iguais, o tempo que o modelo aprendeu
+        para o agente no tipo vezes (1 + ocupação): o mais rápido e menos carregado
+        """
+        carga = 1 + len(agente.chamados) / agente.capacidade
+        disponivel = agente.status == StatusAgente.DISPONIVEL
+        for tipo in agente.especialidades:
+            if agente.vagas > 0 and disponivel:
+                tempo = self.modelo.estimar_agente(tipo.value, agente.id)
+                self.agentes_livres[tipo].definir(agente.id, (-agente.proficiencia(tipo), tempo * carga, agente.id))
+            else:
+                self.agentes_livres[tipo].remover(agente.id)
+            for id_chamado in agente.chamados:
+                if disponivel:
+                    self.interrompiveis[tipo].definir(
+                        id_chamado, self._chave_interrupcao(self.chamados_ativos[id_chamado], agente, tipo))
+                else:
+                    self.interrompiveis[tipo].remover(id_chamado)
+
+    @staticmethod
+    def _chave_interrupcao(chamado: ChamadoSuporte, agente: AgenteSuporte, tipo: TipoChamado) -> tuple:
+        """Menor chave = primeiro a ser interrompido: menor prioridade, agente mais proficiente, mais recente"""
+        prioridade_chamado, prioridade_cliente = chamado.prioridade_combinada()
+        return (-prioridade_chamado, -prioridade_cliente, -agente.proficiencia(tipo),
+                -chamado.inicio_atendimento.timestamp(), chamado.id_chamado)
+
+    def _retirar_dos_livres(self, agente: AgenteSuporte):
+        """Tira o agente e os atendimentos dele dos índices das suas especialidades"""
+        for tipo in agente.especialidades:
+            self.agentes_livres[tipo].remover(agente.id)
+            for id_chamado in agente.chamados:
+                self.interrompiveis[tipo].remover(id_chamado)
+
+    def _interromper_para(self, chamado: ChamadoSuporte) -> Optional[AgenteSuporte]:
+        """
+        Política de preempção: devolve à fila o atendimento menos prioritário de um
+        agente compatível com o chamado e retorna esse agente, agora com uma vaga
+        """
+        if PREEMPCAO_PRIORIDADE is None or chamado.prioridade_combinada()[0] > PREEMPCAO_PRIORIDADE:
+            return None
+        topo = self.interrompiveis[chamado.tipo_chamado].topo()
+        if topo is None or -topo[0][0] < PREEMPCAO_MINIMA:
+            return None
+        interrompido = self.chamados_ativos[topo[1]]
+        agente = self.agentes[interrompido.agente_atribuido]
+        self._devolver_a_fila(interrompido)
+        self.estatisticas.interrupcao()
+        self._log("chamado_interrompido", id_chamado=interrompido.id_chamado, agente=agente.id,
+                  por=chamado.id_chamado)
+        return agente
+
+    def _agente_livre(self, tipo: TipoChamado) -> Optional[AgenteSuporte]:
+        """Agente com vaga mais proficiente no tipo (entre iguais, o mais rápido e menos carregado)"""
+        topo = self.agentes_livres[tipo].topo()
+        return self.agentes[topo[1]] if topo else None
+
+    def _atribuir(self, chamado: ChamadoSuporte, agente: AgenteSuporte):
+        """Põe o chamado em atendimento com o agente, que precisa ter vaga"""
+        self._preservar(chamado)
+        chamado.agente_atribuido = agente.id
+        self._estimar_tempo(chamado)
+        self._mudar_status(chamado, StatusChamado.EM_ATENDIMENTO)
+        agente.chamados.append(chamado.id_chamado)
+        self._atualizar_carga(agente)
+        self.chamados_em_atendimento[chamado.id_chamado] = chamado
+
+    def _liberar(self, chamado: ChamadoSuporte):
+        """Tira o chamado da carga do agente atribuído (o chamado continua com `agente_atribuido`)"""
+        agente = self.agentes.get(chamado.agente_atribuido)
+        if agente is not None and chamado.id_chamado in agente.chamados:
+            agente.chamados.remove(chamado.id_chamado)
+            for tipo in agente.especialidades:
+                self.interrompiveis[tipo].remover(chamado.id_chamado)
+            self._atualizar_carga(agente)
+
+    @staticmethod
+    def _chave_fila(chamado: ChamadoSuporte) -> tuple:
+        """Posição do pendente na fila: prioridade, depois chegada (ou término virtual, com FILA_JUSTA) e ordem"""
+        if FILA_JUSTA:
+            return ((chamado.prioridade_combinada()[0],), chamado.termino_virtual, chamado.ordem)
+        return (chamado.prioridade_combinada(), chamado.timestamp, chamado.ordem)
+
+    def _enfileirar(self, chamado: ChamadoSuporte):
+        """Põe o pendente na fila: O(log n)"""
+        entrada = (*self._chave_fila(chamado), next(self._sequencia_fila), chamado)
+        self._na_fila[chamado.id_chamado] = entrada
+        heapq.heappush(self.filas[chamado.tipo_chamado], entrada)
+
+    def _reposicionar_na_fila(self, chamado: ChamadoSuporte):
+        """Depois de mudar a chave de um pendente: entra de novo com a chave nova e a entrada antiga fica obsoleta"""
+        entrada = self._na_fila.get(chamado.id_chamado)
+        if entrada is not None and entrada[:3] != self._chave_fila(chamado):
+            self._enfileirar(chamado)
+            self._compactar_fila()
+
+    def _marcar_termino_virtual(self, chamado: ChamadoSuporte):
+        """Com FILA_JUSTA, o término virtual do pendente entre os da sua prioridade, pelo peso do cliente"""
+        if FILA_JUSTA:
+            chamado.termino_virtual = self.fila_justa.marcar(
+                chamado.prioridade_combinada()[0], chamado.cliente_nome, chamado.timestamp.timestamp(),
+                chamado.tempo_estimado.total_seconds(), PESO_CLIENTE[chamado.tipo_cliente])
+
+    def _mudar_prioridade(self, chamado: ChamadoSuporte, prioridade: int):
+        """Muda a prioridade manual (após _preservar); na fila justa, o pendente ganha término na nova classe"""
+        anterior = chamado.prioridade_combinada()[0]
+        chamado.prioridade_manual = prioridade
+        if (FILA_JUSTA and chamado.status == StatusChamado.PENDENTE
+                and chamado.prioridade_combinada()[0] != anterior):
+            self.fila_justa.retirar(anterior, chamado.cliente_nome, chamado.termino_virtual)
+            self._marcar_termino_virtual(chamado)
+
+    def _retirar_da_fila(self, chamado: ChamadoSuporte):
+        """Remove um pendente de qualquer posição da fila: O(1), a entrada no heap fica obsoleta"""
+        if self._na_fila.pop(chamado.id_chamado, None) is not None:
+            self._compactar_fila()
+
+    def _compactar_fila(self):
+        """Refaz os heaps só com as entradas válidas quando as obsoletas passam da metade: O(1) amortizado"""
+        if sum(map(len, self.filas.values())) > 2 * len(self._na_fila) + 64:
+            self._refazer_filas()
+
+    def _refazer_filas(self):
+        # Listas novas: quem estiver percorrendo a fila (_fila_em_ordem) continua nas antigas
+        filas = {t: [] for t in TipoChamado}
+        for entrada in self._na_fila.values():
+            filas[entrada[-1].tipo_chamado].append(entrada)
+        for fila in filas.values():
+            heapq.heapify(fila)
+        self.filas = filas
+
+    def _topo_da_fila(self, fila: list) -> Optional[tuple]:
+        """Entrada válida mais prioritária do heap, descartando as obsoletas que estiverem no topo"""
+        while fila:
+            entrada = fila[0]
+            if self._na_fila.get(entrada[-1].id_chamado) is entrada:
+                return entrada
+            heapq.heappop(fila)
+        return None
+
+    @property
+    def tamanho_fila(self) -> int:
+        """Chamados pendentes na fila (sem as entradas obsoletas do heap)"""
+        return len(self._na_fila)
+
+    def chamados_na_fila(self) -> List[ChamadoSuporte]:
+        """Pendentes na fila, na ordem em que entraram nela: O(n)"""
+        return [entrada[-1] for entrada in self._na_fila.values()]
+
+    def _devolver_a_fila(self, chamado: ChamadoSuporte):
+        """Volta um chamado em atendimento para a fila, na posição original: O(log n)"""
+        self._preservar(chamado)
+        self._liberar(chamado)
+        chamado.agente_atribuido = None
+        self.chamados_em_atendimento.pop(chamado.id_chamado, None)
+        self._mudar_status(chamado, StatusChamado.PENDENTE)
+        self._enfileirar(chamado)
+
+    @_mutacao
     def adicionar_chamado(self, dados_chamado: dict) -> Optional[ChamadoSuporte]:
+        inicio = time.perf_counter()
         try:
-            if 'id_chamado' not in dados_chamado or not dados_chamado['id_chamado']:
-                dados_chamado['id_chamado'] = self._gerar_id()
-
-            chamado = ChamadoSuporte(
-                id_chamado=dados_chamado['id_chamado'],
-                cliente_nome=dados_chamado['cliente_nome'],
-                tipo_cliente=TipoCliente(dados_chamado['tipo_cliente']),
-                tipo_chamado=TipoChamado(dados_chamado['tipo_chamado']),
-                descricao=dados_chamado['descricao'],
-                prioridade_manual=dados_chamado.get('prioridade_manual')
-            )
-            
-            heapq.heappush(
-                self.fila,
-                (chamado.prioridade_combinada(), chamado.timestamp, self.contador, chamado)
-            )
-            self.contador += 1
-            self.chamados_ativos[chamado.id_chamado] = chamado
-            
-            # Notificação automática para alta prioridade
-            if chamado.prioridade_combinada()[0] <= 2:
-                self._enviar_notificacao(
-                    titulo="Novo Chamado Urgente!",
-                    mensagem=f"Cliente: {chamado.cliente_nome}\nTipo: {chamado.tipo_chamado.value}"
-                )
-            
-            self._notificar_mudanca()
-            return chamado
-        except (KeyError, ValueError) as e:
-            print(f"Erro ao adicionar chamado: {e}")
+            tipo_cliente = TipoCliente(dados_chamado['tipo_cliente'])
+            tipo_chamado = TipoChamado(dados_chamado['tipo_chamado'])
+            cliente_nome = dados_chamado['cliente_nome']
+            descricao = dados_chamado['descricao']
+            if not isinstance(cliente_nome, str) or not isinstance(descricao, str):
+                raise ValueError("cliente_nome e descricao precisam ser texto")
+        except (KeyError, ValueError, TypeError) as e:
+            log.erro("erro_adicionar_chamado", "Erro ao adicionar chamado: %s", e)
             return None
 
+        # O ID só é gerado depois da validação, para a reprodução do journal gerar os mesmos IDs
+        dados_originais = dict(dados_chamado)
+        existente = self._duplicado(cliente_nome, tipo_chamado)
+        if existente is not None:
+            self._preservar(existente)
+            existente.ocorrencias += 1
+            self.estatisticas.duplicado()
+            self._registrar_evento("chamado", dados_originais)
+            self._log("chamado_agrupado", id_chamado=existente.id_chamado, cliente=cliente_nome,
+                      ocorrencias=existente.ocorrencias,
+                      duracao_ms=(time.perf_counter() - inicio) * 1000)
+            return existente
+        if 'id_chamado' not in dados_chamado or not dados_chamado['id_chamado']:
+            dados_chamado['id_chamado'] = self._gerar_id()
+
+        chamado = ChamadoSuporte(
+            id_chamado=dados_chamado['id_chamado'],
+            cliente_nome=cliente_nome,
+            tipo_cliente=tipo_cliente,
+            tipo_chamado=tipo_chamado,
+            descricao=descricao,
+            timestamp=self._agora(),
+            prioridade_manual=dados_chamado.get('prioridade_manual'),
+            ordem=self.contador
+        )
+        
+        self.contador += 1
+        self.chamados_ativos[chamado.id_chamado] = chamado
+        if self.repositorio:
+            self._alterados[chamado.id_chamado] = chamado
+        self.estatisticas.chegada(
+            tipo_chamado.value, tipo_cliente.value, chamado.timestamp.timestamp()
+        )
+        self._estimar_tempo(chamado)
+        self._armar_sla(chamado)
+        self._marcar_termino_virtual(chamado)
+        self._enfileirar_previsao(chamado)
+        self.indice_busca.adicionar(chamado.id_chamado, chamado.descricao, chamado.cliente_nome)
+        self._abrir_do_cliente(chamado)
+        self._registrar_evento("chamado", dados_originais)
+
+        # Chamado crítico começa na chegada: com um agente livre ou interrompendo um atendimento menos prioritário
+        agente = None
+        if PREEMPCAO_PRIORIDADE is not None and chamado.prioridade_combinada()[0] <= PREEMPCAO_PRIORIDADE:
+            agente = self._agente_livre(tipo_chamado) or self._interromper_para(chamado)
+        if agente is not None:
+            self._atribuir(chamado, agente)
+            self._avisar_atribuicao(chamado, agente)
+        else:
+            self._enfileirar(chamado)
+        
+        # Notificação automática para alta prioridade
+        if chamado.prioridade_combinada()[0] <= 2:
+            self._avisar(
+                categoria="novo",
+                assunto=chamado.tipo_chamado.value,
+                cliente=chamado.cliente_nome,
+                titulo="Novo Chamado Urgente!",
+                mensagem=f"Cliente: {chamado.cliente_nome}\nTipo: {chamado.tipo_chamado.value}",
+                resumo="{total} novos chamados {assunto} de {clientes} clientes"
+            )
+        
+        self._notificar_mudanca()
+        self._log("chamado_adicionado", id_chamado=chamado.id_chamado,
+                  tipo_chamado=chamado.tipo_chamado.value, cliente=chamado.cliente_nome,
+                  duracao_ms=(time.perf_counter() - inicio) * 1000)
+        return chamado
+
+    @_mutacao
     def escalar_chamado(self, id_chamado: str, nova_prioridade: int) -> bool:
+        inicio = time.perf_counter()
         if id_chamado not in self.chamados_ativos:
             return False
         
         chamado = self.chamados_ativos[id_chamado]
-        chamado.prioridade_manual = nova_prioridade
-        
-        # Reconstruir a fila com a nova prioridade
-        self.fila = [
-            (c.prioridade_combinada(), c.timestamp, i, c) 
-            for i, (_, _, _, c) in enumerate(self.fila)
-        ]
-        heapq.heapify(self.fila)
+        self._preservar(chamado)
+        self._mudar_prioridade(chamado, nova_prioridade)
+        if id_chamado in self.a_frente:
+            self._enfileirar_previsao(chamado)
+        if chamado.agente_atribuido in self.agentes and chamado.status == StatusChamado.EM_ATENDIMENTO:
+            self._atualizar_carga(self.agentes[chamado.agente_atribuido])  # chave entre os interrompíveis
+        self._reposicionar_na_fila(chamado)
+        self._registrar_evento("escalar", id_chamado, nova_prioridade)
         
         # Notificar sobre a mudança de prioridade
-        self._enviar_notificacao(
+        self._avisar(
+            categoria="escalado",
+            assunto=chamado.tipo_chamado.value,
+            cliente=chamado.cliente_nome,
             titulo="Chamado Escalado!",
-            mensagem=f"Chamado {id_chamado} agora tem prioridade {nova_prioridade}"
+            mensagem=f"Chamado {id_chamado} agora tem prioridade {nova_prioridade}",
+            resumo="{total} chamados {assunto} escalados ({clientes} clientes)"
         )
         
         self._notificar_mudanca()
+        self._log("chamado_escalado", id_chamado=id_chamado, prioridade=nova_prioridade,
+                  duracao_ms=(time.perf_counter() - inicio) * 1000)
         return True
 
+    @_mutacao
     def atribuir_agente(self, id_chamado: str, id_agente: str) -> bool:
+        inicio = time.perf_counter()
         if id_chamado not in self.chamados_ativos or id_agente not in self.agentes:
             return False
         
         chamado = self.chamados_ativos[id_chamado]
         agente = self.agentes[id_agente]
+        if agente.status == StatusAgente.DESCONECTADO:
+            return False
+        if chamado.agente_atribuido == id_agente:
+            return True
         
-        # Liberar agente atual se estiver ocupado
-        if agente.chamado_atual:
-            self.chamados_ativos[agente.chamado_atual].agente_atribuido = None
-            self.chamados_ativos[agente.chamado_atual].status = StatusChamado.PENDENTE
-        
-        chamado.agente_atribuido = id_agente
-        chamado.status = StatusChamado.EM_ATENDIMENTO
-        agente.chamado_atual = id_chamado
+        # Agente sem vaga: o chamado menos prioritário dele volta para a fila
+        if agente.vagas <= 0:
+            anterior = max(
+                (self.chamados_ativos[i] for i in agente.chamados),
+                key=lambda c: (c.prioridade_combinada(), c.timestamp, c.ordem)
+            )
+            self._devolver_a_fila(anterior)
         
-        # Mover para a lista de em atendimento
-        self.chamados_em_atendimento[id_chamado] = chamado
+        if chamado.status == StatusChamado.PENDENTE:
+            self._retirar_da_fila(chamado)
+        else:
+            self._liberar(chamado)  # Transferência de outro agente
+        self._atribuir(chamado, agente)
+        self._registrar_evento("atribuir", id_chamado, id_agente)
         
         self._notificar_mudanca()
+        self._log("chamado_atribuido", id_chamado=id_chamado, agente=id_agente,
+                  duracao_ms=(time.perf_counter() - inicio) * 1000)
         return True
 
+    @_mutacao
     def processar_proximo_chamado(self) -> Optional[ChamadoSuporte]:
-        if not self.fila:
+        inicio = time.perf_counter()
+        topos = [entrada for entrada in map(self._topo_da_fila, self.filas.values()) if entrada is not None]
+        if not topos:
             return None
 
-        _, _, _, chamado = heapq.heappop(self.fila)
-        chamado.status = StatusChamado.EM_ATENDIMENTO
+        chamado = heapq.heappop(self.filas[min(topos)[-1].tipo_chamado])[-1]
+        del self._na_fila[chamado.id_chamado]
+        self._preservar(chamado)
+        self._mudar_status(chamado, StatusChamado.EM_ATENDIMENTO)
+        self._registrar_evento("processar")
         
-        # Atribuir automaticamente a um agente disponível
-        agente_disponivel = next(
-            (a for a in self.agentes.values() 
-             if not a.chamado_atual and chamado.tipo_chamado in a.especialidades),
-            None
-        )
+        # Atribuir automaticamente ao agente com vaga mais proficiente no tipo (ou, se crítico, por preempção)
+        agente_disponivel = self._agente_livre(chamado.tipo_chamado) or self._interromper_para(chamado)
         
         if agente_disponivel:
-            self.atribuir_agente(chamado.id_chamado, agente_disponivel.id)
+            self._atribuir(chamado, agente_disponivel)
         else:
             self.chamados_em_atendimento[chamado.id_chamado] = chamado
         
         # Notificação para chamados urgentes
         if chamado.prioridade_combinada()[0] <= 2:
-            self._enviar_notificacao(
+            self._avisar(
+                categoria="atendimento",
+                assunto=chamado.tipo_chamado.value,
+                cliente=chamado.cliente_nome,
                 titulo="Chamado Urgente em Atendimento!",
-                mensagem=f"Cliente: {chamado.cliente_nome}\nTipo: {chamado.tipo_chamado.value}"
+                mensagem=f"Cliente: {chamado.cliente_nome}\nTipo: {chamado.tipo_chamado.value}",
+                resumo="{total} chamados {assunto} entraram em atendimento ({clientes} clientes)"
             )
         
         self._notificar_mudanca()
+        self._log("chamado_processado", id_chamado=chamado.id_chamado,
+                  agente=chamado.agente_atribuido,
+                  espera_s=(self._agora() - chamado.timestamp).total_seconds(),
+                  duracao_ms=(time.perf_counter() - inicio) * 1000)
         return chamado
 
+    @_mutacao
     def finalizar_chamado(self, id_chamado: str) -> bool:
         """Finaliza um chamado e atribui automaticamente o próximo ao agente"""
+        inicio = time.perf_counter()
         if id_chamado not in self.chamados_em_atendimento:
             return False
 
         chamado = self.chamados_em_atendimento.pop(id_chamado)
         agente_id = chamado.agente_atribuido
-        chamado.status = StatusChamado.RESOLVIDO
+        self._preservar(chamado)
+        self._mudar_status(chamado, StatusChamado.RESOLVIDO)
+        self._registrar_evento("finalizar", id_chamado)
         
         # Remover dos ativos
         if id_chamado in self.chamados_ativos:
             del self.chamados_ativos[id_chamado]
         
-        # Se houver agente vinculado
+        # Se houver agente vinculado, a vaga liberada recebe o próximo chamado da fila
         if agente_id and agente_id in self.agentes:
-            agente = self.agentes[agente_id]
-            agente.chamado_atual = None
-            
-            # Tentar atribuir o próximo chamado da fila ao agente
+            self._liberar(chamado)
             self._atribuir_proximo_chamado(agente_id)
         
         self._notificar_mudanca()
+        self._log("chamado_finalizado", id_chamado=id_chamado, agente=agente_id,
+                  duracao_ms=(time.perf_counter() - inicio) * 1000)
         return True
 
+    @_mutacao
+    def despachar(self) -> int:
+        """Entrega chamados da fila aos agentes livres; retorna quantos foram atribuídos"""
+        atribuidos = self._despachar()
+        if atribuidos:
+            self._registrar_evento("despachar")
+            self._notificar_mudanca()
+            self._log("chamados_despachados", quantidade=atribuidos)
+        return atribuidos
+
+    def _despachar(self) -> int:
+        """
+        Percorre a fila em ordem de prioridade e entrega cada chamado ao agente
+        livre mais proficiente no tipo, até acabarem as vagas
+        """
+        atribuidos = 0
+        pendentes = self.estatisticas.fila_por_tipo_chamado
+        for chamado in self._fila_em_ordem():
+            # Para quando nenhum tipo tem, ao mesmo tempo, agente livre e chamado pendente
+            if not any(heap and pendentes[tipo.value] for tipo, heap in self.agentes_livres.items()):
+                break
+            agente = self._agente_livre(chamado.tipo_chamado)
+            if agente is not None:
+                self._retirar_da_fila(chamado)
+                self._atribuir(chamado, agente)
+                self._avisar_atribuicao(chamado, agente)
+                atribuidos += 1
+        return atribuidos
+
     def _atribuir_proximo_chamado(self, id_agente: str) -> bool:
-        """Atribui o próximo chamado compatível ao agente"""
+        """Tenta atribuir automaticamente um novo chamado ao agente"""
         agente = self.agentes[id_agente]
-        
-        # Verificar se há chamados na fila
-        if not self.fila:
+        if agente.vagas <= 0 or agente.status != StatusAgente.DISPONIVEL:
             return False
-            
-        # Pegar o próximo chamado (já está ordenado por prioridade)
-        _, _, _, proximo_chamado = heapq.heappop(self.fila)
-        
-        # Verificar compatibilidade
-        if proximo_chamado.tipo_chamado in agente.especialidades:
-            # Atribuir ao agente
-            proximo_chamado.agente_atribuido = id_agente
-            proximo_chamado.status = StatusChamado.EM_ATENDIMENTO
-            agente.chamado_atual = proximo_chamado.id_chamado
-            self.chamados_em_atendimento[proximo_chamado.id_chamado] = proximo_chamado
-            
-            # Atualizar na lista de ativos
-            self.chamados_ativos[proximo_chamado.id_chamado] = proximo_chamado
-            
-            # Notificação
-            if proximo_chamado.prioridade_combinada()[0] <= 2:
-                self._enviar_notificacao(
-                    titulo="Atribuição Automática",
-                    mensagem=f"{agente.nome} assumiu {proximo_chamado.id_chamado}"
-                )
-            return True
-        else:
-            # Se não for compatível, recolocar na fila
-            heapq.heappush(self.fila, (
-                proximo_chamado.prioridade_combinada(),
-                proximo_chamado.timestamp,
-                self.contador,
-                proximo_chamado
-            ))
-            self.contador += 1
+        pendentes = self.estatisticas.fila_por_tipo_chamado
+        if not any(pendentes[tipo.value] for tipo in agente.especialidades):
             return False
-        
-        # Remover dos ativos
-        if id_chamado in self.chamados_ativos:
-            del self.chamados_ativos[id_chamado]
-        
-        # Liberar o agente
-        if agente_id and agente_id in self.agentes:
-            self.agentes[agente_id].chamado_atual = None
-            
-            # Atribuir automaticamente o próximo chamado compatível ao agente liberado
-            self._atribuir_proximo_chamado(agente_id)
-        
-        self._notificar_mudanca()
+
+        # O primeiro da fila entre os tipos das especialidades do agente
+        chamado = next(self._fila_em_ordem(agente.especialidades), None)
+        if chamado is None:
+            return False
+        self._retirar_da_fila(chamado)
+        self._atribuir(chamado, agente)
+        self._avisar_atribuicao(chamado, agente)
         return True
 
-    def _atribuir_proximo_chamado(self, id_agente: str) -> bool:
-        """Tenta atribuir automaticamente um novo chamado ao agente"""
-        agente = self.agentes[id_agente]
-        
-        # Encontrar o próximo chamado compatível com as especialidades do agente
-        for i, (_, _, _, chamado) in enumerate(self.fila):
-            if (chamado.status == StatusChamado.PENDENTE and 
-                chamado.tipo_chamado in agente.especialidades):
-                
-                # Remove da fila
-                heapq.heappop(self.fila)
-                
-                # Atribui ao agente
-                chamado.agente_atribuido = id_agente
-                chamado.status = StatusChamado.EM_ATENDIMENTO
-                agente.chamado_atual = chamado.id_chamado
-                self.chamados_em_atendimento[chamado.id_chamado] = chamado
-                
-                # Notificação para chamados urgentes
-                if chamado.prioridade_combinada()[0] <= 2:
-                    self._enviar_notificacao(
-                        titulo="Novo Chamado Atribuído!",
-                        mensagem=f"Agente {agente.nome} assumiu chamado urgente"
-                    )
-                
-                return True
-        return False
-        
-        # Liberar o agente
-        if chamado.agente_atribuido and chamado.agente_atribuido in self.agentes:
-            self.agentes[chamado.agente_atribuido].chamado_atual = None
-        
-        # Remover dos ativos
-        if id_chamado in self.chamados_ativos:
-            del self.chamados_ativos[id_chamado]
-        
+    def _fila_em_ordem(self, tipos: Iterable[TipoChamado] = TipoChamado) -> Iterator[ChamadoSuporte]:
+        """
+        Pendentes dos `tipos` em ordem de prioridade, sem retirá-los: O(log k)
+        por entrada lida. Retirar da fila durante a leitura é permitido (a
+        entrada só fica obsoleta); enfileirar não.
+        """
+        ordenadas = heapq.merge(*(self._heap_em_ordem(self.filas[tipo]) for tipo in tipos))
+        return (entrada[-1] for entrada in ordenadas)
+
+    def _heap_em_ordem(self, fila: list) -> Iterator[tuple]:
+        """Entradas válidas de um heap em ordem, pela fronteira dos já lidos"""
+        na_fila = self._na_fila
+        fronteira = [(fila[0], 0)] if fila else []
+        while fronteira:
+            entrada, i = heapq.heappop(fronteira)
+            if na_fila.get(entrada[-1].id_chamado) is entrada:
+                yield entrada
+            for filho in (2 * i + 1, 2 * i + 2):
+                if filho < len(fila):
+                    heapq.heappush(fronteira, (fila[filho], filho))
+
+    def _avisar_atribuicao(self, chamado: ChamadoSuporte, agente: AgenteSuporte):
+        """Notificação para chamados urgentes atribuídos automaticamente"""
+        if chamado.prioridade_combinada()[0] <= 2:
+            self._avisar(
+                categoria="atribuicao",
+                assunto=chamado.tipo_chamado.value,
+                cliente=chamado.cliente_nome,
+                titulo="Novo Chamado Atribuído!",
+                mensagem=f"Agente {agente.nome} assumiu chamado {chamado.id_chamado}",
+                resumo="{total} chamados {assunto} atribuídos automaticamente ({clientes} clientes)"
+            )
+
+    def ativar_persistencia(self, diretorio: str, **opcoes_journal) -> int:
+        """
+        Recupera o estado salvo em `diretorio` (snapshot mais recente + segmentos
+        do journal posteriores a ele) e passa a registrar os eventos num novo
+        segmento. Retorna quantos eventos do journal foram reaplicados.
+        """
+        os.makedirs(diretorio, exist_ok=True)
+        self._diretorio_dados = diretorio
+        # A carga cria centenas de milhares de objetos que nunca formam ciclos;
+        # o coletor de ciclos só atrasaria a inicialização
+        gc_ativo = gc.isenabled()
+        gc.disable()
+        try:
+            with self._lock:
+                numero, estado = ler_snapshot_mais_recente(diretorio)
+                if estado is not None:
+                    self._restaurar_estado(estado)
+                    del estado
+                aplicados = 0
+                self._segmento = numero or 0
+                for n, caminho in listar(diretorio, "journal"):
+                    if numero is None or n >= numero:
+                        aplicados += self.recuperar(caminho)
+                    self._segmento = max(self._segmento, n)
+                self._segmento += 1
+                self._rearmar_sla(self._instante.timestamp())
+                self.journal = Journal(caminho_segmento(diretorio, self._segmento),
+                                       log=None if self.silencioso else log, **opcoes_journal)
+        finally:
+            # Os objetos carregados vão para a geração permanente e deixam de ser varridos
+            gc.freeze()
+            if gc_ativo:
+                gc.enable()
         self._notificar_mudanca()
-        return True
+        return aplicados
+
+    def recuperar(self, caminho_journal: str) -> int:
+        """
+        Reaplica os eventos de um segmento do journal sobre o estado atual.
+        Retorna quantos eventos foram aplicados.
+        """
+        aplicados = 0
+        with self._lock:
+            self._reproduzindo = True
+            try:
+                for tipo, instante, dados in Journal.ler(caminho_journal):
+                    self._instante = datetime.fromtimestamp(instante)
+                    self._aplicar_evento(tipo, dados)
+                    aplicados += 1
+            finally:
+                self._reproduzindo = False
+        return aplicados
+
+    def salvar_snapshot(self) -> Optional[int]:
+        """
+        Grava o estado completo e descarta o histórico anterior a ele.
+
+        Sob o lock só acontece o corte: o journal passa para um novo segmento e
+        as estruturas são copiadas superficialmente. A serialização e a escrita
+        correm sem o lock; chamados alterados depois do corte são gravados com a
+        imagem guardada por `_preservar`. Retorna o número do snapshot.
+        """
+        if self.journal is None or self._diretorio_dados is None:
+            return None
+        if not self._lock_snapshot.acquire(blocking=False):
+            return None  # Já existe um snapshot em andamento
+        try:
+            with self._lock:
+                numero = self._segmento + 1
+                self.journal.rotacionar(caminho_segmento(self._diretorio_dados, numero))
+                self._segmento = numero
+                self._preimagens = {}
+                corte = {
+                    "instante": self._instante.timestamp(),
+                    "ultimo_id": self.ultimo_id,
+                    "contador": self.contador,
+                    "fila": list(self._na_fila.values()),
+                    "ativos": list(self.chamados_ativos.values()),
+                    "em_atendimento": [(c, c.ordem, c.termino_virtual)
+                                       for c in self.chamados_em_atendimento.values()],
+                    "agentes": [
+                        (a.id, a.nome, [e.value for e in a.especialidades], list(a.chamados), a.capacidade,
+                         {t.value: nota for t, nota in a.proficiencias.items()}, a.status.value)
+                        for a in self.agentes.values()
+                    ],
+                    "modelo": self.modelo.estado(),
+                    "fila_justa": self.fila_justa.estado()
+                }
+
+            gravar_snapshot(
+                caminho_snapshot(self._diretorio_dados, numero),
+                self._montar_estado(corte)
+            )
+            compactar(self._diretorio_dados, numero)
+            self._log("snapshot_gravado", numero=numero, fila=len(corte["fila"]))
+            return numero
+        finally:
+            with self._lock:
+                self._preimagens = None
+            self._lock_snapshot.release()
+
+    def _montar_estado(self, corte: dict) -> dict:
+        preimagens = self._preimagens
+        chamados = {}
+
+        def congelar(chamado: ChamadoSuporte):
+            if chamado.id_chamado in chamados:
+                return
+            imagem = preimagens.get(chamado.id_chamado)
+            if imagem is None:
+                imagem = self._imagem_chamado(chamado)
+                # Se um escritor alterou o chamado durante a leitura, a pré-imagem já está lá
+                imagem = preimagens.get(chamado.id_chamado, imagem)
+            chamados[chamado.id_chamado] = imagem
+
+        for entrada in corte["fila"]:
+            congelar(entrada[-1])
+        for chamado in corte["ativos"]:
+            congelar(chamado)
+        for chamado, _, _ in corte["em_atendimento"]:
+            congelar(chamado)
+
+        return {
+            "instante": corte["instante"],
+            "ultimo_id": corte["ultimo_id"],
+            "contador": corte["contador"],
+            "chamados": list(chamados.values()),
+            "fila": [(prioridade, contador, c.id_chamado, instante if FILA_JUSTA else 0.0)
+                     for prioridade, instante, contador, _, c in corte["fila"]],
+            "ativos": [c.id_chamado for c in corte["ativos"]],
+            "em_atendimento": [(c.id_chamado, ordem, termino) for c, ordem, termino in corte["em_atendimento"]],
+            "agentes": corte["agentes"],
+            "modelo": corte["modelo"],
+            "fila_justa": corte["fila_justa"]
+        }
+
+    @staticmethod
+    def _tupla_chamado(chamado: ChamadoSuporte) -> tuple:
+        """Imagem do chamado em tipos primitivos (mesma ordem de repositorio.COLUNAS)"""
+        return (
+            chamado.id_chamado, chamado.cliente_nome, chamado.tipo_cliente.value,
+            chamado.tipo_chamado.value, chamado.descricao, chamado.status.value,
+            chamado.timestamp.timestamp(), chamado.prioridade_manual, chamado.agente_atribuido,
+            chamado.inicio_atendimento.timestamp() if chamado.inicio_atendimento else None,
+            chamado.resolvido_em.timestamp() if chamado.resolvido_em else None,
+            chamado.ocorrencias
+        )
+
+    @classmethod
+    def _imagem_chamado(cls, chamado: ChamadoSuporte) -> tuple:
+        """
+        Imagem do chamado no snapshot: a do repositório mais o tempo_estimado, que
+        entra no término virtual e na previsão e não pode ser recalculado com o
+        modelo de outro instante, e se já começou algum atendimento
+        """
+        return cls._tupla_chamado(chamado) + (chamado.tempo_estimado.total_seconds(), chamado.atendido)
+
+    def _restaurar_estado(self, estado: dict):
+        tipos_cliente = {t.value: t for t in TipoCliente}
+        tipos_chamado = {t.value: t for t in TipoChamado}
+        status = {s.value: s for s in StatusChamado}
+        fromtimestamp = datetime.fromtimestamp
+        novo = object.__new__
+
+        chamados = {}
+        # Sem passar pelo __init__ do dataclass: a carga de centenas de milhares
+        # de chamados precisa ser rápida
+        for (id_chamado, cliente, tipo_cliente, tipo_chamado, descricao, st, instante,
+             prioridade_manual, agente, inicio, resolvido, ocorrencias, estimado, atendido) in estado["chamados"]:
+            chamado = novo(ChamadoSuporte)
+            chamado.__dict__ = {
+                "id_chamado": id_chamado,
+                "cliente_nome": cliente,
+                "tipo_cliente": tipos_cliente[tipo_cliente],
+                "tipo_chamado": tipos_chamado[tipo_chamado],
+                "descricao": descricao,
+                "status": status[st],
+                "timestamp": fromtimestamp(instante),
+                "prioridade_manual": prioridade_manual,
+                "agente_atribuido": agente,
+                "inicio_atendimento": fromtimestamp(inicio) if inicio else None,
+                "resolvido_em": fromtimestamp(resolvido) if resolvido else None,
+                "ocorrencias": ocorrencias,
+                "tempo_estimado": timedelta(seconds=estimado),
+                "ordem": 0,
+                "termino_virtual": 0.0,
+                "atendido": atendido
+            }
+            chamados[id_chamado] = chamado
+
+        self.ultimo_id = estado["ultimo_id"]
+        self.contador = estado["contador"]
+        self._na_fila = {}
+        # A chave é recalculada, então FILA_JUSTA pode mudar entre execuções
+        for _, contador, id_chamado, termino in estado["fila"]:
+            chamado = chamados[id_chamado]
+            chamado.ordem = contador
+            chamado.termino_virtual = termino
+            self._na_fila[id_chamado] = (*self._chave_fila(chamado), next(self._sequencia_fila), chamado)
+        self._refazer_filas()
+        self.chamados_ativos = {id_chamado: chamados[id_chamado] for id_chamado in estado["ativos"]}
+        self.chamados_em_atendimento = {}
+        for id_chamado, ordem, termino in estado["em_atendimento"]:
+            chamado = chamados[id_chamado]
+            chamado.ordem = ordem
+            chamado.termino_virtual = termino
+            self.chamados_em_atendimento[id_chamado] = chamado
+
+        self.agentes = {}
+        for id_agente, nome, especialidades, em_atendimento, capacidade, proficiencias, st in estado["agentes"]:
+            self.agentes[id_agente] = AgenteSuporte(
+                id=id_agente,
+                nome=nome,
+                especialidades=[tipos_chamado[e] for e in especialidades],
+                capacidade=capacidade,
+                chamados=list(em_atendimento),
+                proficiencias={tipos_chamado[t]: nota for t, nota in proficiencias.items()},
+                status=StatusAgente(st)
+            )
+        # O modelo antes dos heaps: a chave dos agentes livres usa o tempo aprendido
+        self.modelo.carregar(estado["modelo"])
+        for heap in (*self.agentes_livres.values(), *self.interrompiveis.values()):
+            heap.limpar()
+        for agente in self.agentes.values():
+            self._atualizar_carga(agente)
+        # Os contadores saem do estado; as distribuições de tempo recomeçam vazias
+        self.estatisticas.reconstruir(
+            ((c.tipo_chamado.value, c.tipo_cliente.value)
+             for c in self.chamados_ativos.values() if c.status == StatusChamado.PENDENTE),
+            sum(1 for c in self.chamados_ativos.values() if c.status == StatusChamado.EM_ATENDIMENTO)
+        )
+        # Os prazos de SLA são armados ao final da recuperação (_rearmar_sla)
+        self.sla = RodaTemporizacao(self.relogio())
+        self._instante = fromtimestamp(estado["instante"])
+        self.fila_justa.carregar(estado["fila_justa"])
+        self.a_frente.limpar()
+        self.indice_busca.limpar()
+        self.abertos_por_cliente = {}
+        for chamado in self.chamados_ativos.values():
+            self.indice_busca.adicionar(chamado.id_chamado, chamado.descricao, chamado.cliente_nome)
+            self._abrir_do_cliente(chamado)
+            if chamado.status == StatusChamado.PENDENTE:
+                self._enfileirar_previsao(chamado)
+
+    def _aplicar_evento(self, tipo: str, dados: tuple):
+        if tipo == "chamado":
+            self.adicionar_chamado(dict(dados[0]))
+        elif tipo == "escalar":
+            self.escalar_chamado(*dados)
+        elif tipo == "escalar_sla":
+            self.escalar_por_sla(dados[0])
+        elif tipo == "atribuir":
+            self.atribuir_agente(*dados)
+        elif tipo == "processar":
+            self.processar_proximo_chamado()
+        elif tipo == "finalizar":
+            self.finalizar_chamado(*dados)
+        elif tipo == "despachar":
+            self.despachar()
+        elif tipo == "agente":
+            id_agente, nome, especialidades, capacidade, proficiencias = dados
+            self.adicionar_agente(AgenteSuporte(
+                id=id_agente,
+                nome=nome,
+                especialidades=[TipoChamado(e) for e in especialidades],
+                capacidade=capacidade,
+                proficiencias={TipoChamado(t): nota for t, nota in proficiencias.items()}
+            ))
+        elif tipo == "agente_atualizar":
+            self.atualizar_agente(*dados)
+        elif tipo == "agente_pausar":
+            self.pausar_agente(*dados)
+        elif tipo == "agente_entrar":
+            self.entrar_agente(*dados)
+        elif tipo == "agente_sair":
+            self.sair_agente(*dados)
 
     def _notificar_mudanca(self):
         """Notifica todas as interfaces conectadas sobre mudanças"""
-        socketio.emit('atualizar_fila', {
-            'fila': [self._serializar_chamado(c) for _, _, _, c in self.fila],
+        if self._reproduzindo or self.silencioso:
+            return
+        inicio = time.perf_counter()
+        previsoes = self.previsoes_espera()
+        estado = {
+            'fila': [self._serializar_chamado(c, previsoes) for c in self.chamados_na_fila()],
             'agentes': [self._serializar_agente(a) for a in self.agentes.values()],
-            'chamados_ativos': [self._serializar_chamado(c) for c in self.chamados_ativos.values()],
+            'chamados_ativos': [self._serializar_chamado(c, previsoes) for c in self.chamados_ativos.values()],
             'chamados_em_atendimento': [self._serializar_chamado(c) for c in self.chamados_em_atendimento.values()]
-        })
+        }
+        resumo = self.resumo_estatisticas()
+        serializado = time.perf_counter()
+        socketio.emit('atualizar_fila', estado)
+        socketio.emit('estatisticas', resumo)
+        fim = time.perf_counter()
+        latencia_serializacao.observar(serializado - inicio, 'atualizar_fila')
+        latencia_envio.observar(fim - serializado, 'atualizar_fila')
+        self._tempo_notificacao += fim - inicio
 
-    def _serializar_chamado(self, chamado: ChamadoSuporte) -> dict:
-        return {
+    def resumo_estatisticas(self) -> dict:
+        with self._lock:
+            return self.estatisticas.resumo(self.relogio())
+
+    def _serializar_chamado(self, chamado: ChamadoSuporte,
+                            previsoes: Optional[Dict[str, Optional[float]]] = None) -> dict:
+        """Ao serializar muitos chamados, passar `previsoes` (de previsoes_espera) calculadas uma só vez"""
+        agora = self.relogio()
+        espera = None
+        if chamado.status == StatusChamado.PENDENTE:
+            if previsoes is not None:
+                espera = previsoes.get(chamado.id_chamado)
+            elif chamado.id_chamado in self.a_frente:
+                espera = self._espera_prevista(chamado, self._vagas_agentes(agora))[0]
+        dados = {
             "id": chamado.id_chamado,
             "cliente": chamado.cliente_nome,
             "tipo_chamado": chamado.tipo_chamado.value,
@@ -343,15 +1485,21 @@ class SistemaChamados:
             "agente": chamado.agente_atribuido,
             "status": chamado.status.value,
             "descricao": chamado.descricao,
-            "timestamp": chamado.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+            "timestamp": chamado.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            "ocorrencias": chamado.ocorrencias
         }
+        dados.update(self._campos_previsao(espera, agora))
+        return dados
 
     def _serializar_agente(self, agente: AgenteSuporte) -> dict:
         return {
             "id": agente.id,
             "nome": agente.nome,
-            "chamado_atual": agente.chamado_atual,
-            "especialidades": [e.value for e in agente.especialidades]
+            "chamados": list(agente.chamados),
+            "capacidade": agente.capacidade,
+            "status": agente.status.value,
+            "especialidades": [e.value for e in agente.especialidades],
+            "proficiencias": {e.value: agente.proficiencia(e) for e in agente.especialidades}
         }
 
     @staticmethod
@@ -364,41 +1512,248 @@ class SistemaChamados:
                 timeout=10
             )
         except Exception as e:
-            print(f"Erro ao enviar notificação: {e}")
+            log.erro("erro_notificacao", "Erro ao enviar notificação: %s", e, titulo=titulo)
 
-# Configuração inicial do sistema
+# Configuração inicial do sistema (os agentes vêm do estado recuperado ou de AGENTES_INICIAIS, em iniciar_sistema)
 sistema = SistemaChamados()
-sistema.adicionar_agente(AgenteSuporte(
-    id="ag1",
-    nome="Ana Silva",
-    especialidades=[TipoChamado.SERVER_DOWN, TipoChamado.IMPACTA_PRODUCAO]
-))
-sistema.adicionar_agente(AgenteSuporte(
-    id="ag2",
-    nome="Carlos Souza",
-    especialidades=[TipoChamado.SEM_IMPACTO, TipoChamado.DUVIDA]
-))
+metricas.medidor("fila_chamados", "Chamados pendentes na fila",
+                 lambda: sum(sistema.estatisticas.fila_por_tipo_chamado.values()))
+metricas.medidor("chamados_em_atendimento", "Chamados em atendimento",
+                 lambda: sistema.estatisticas.em_atendimento)
+
+limitador_clientes = LimitadorPorCliente(
+    ADMISSAO_TAXA_POR_CLIENTE, ADMISSAO_RAJADA_POR_CLIENTE, ADMISSAO_MAX_CLIENTES)
+metricas.medidor("admissao_clientes_rastreados", "Clientes com balde no limitador de taxa",
+                 lambda: len(limitador_clientes))
+
+def _recusa_admissao(dados) -> Optional[tuple]:
+    """
+    Controle de admissão de um novo chamado: None se ele entra, senão (motivo,
+    segundos para tentar de novo). Conta a prioridade do tipo de chamado e a do
+    tipo de cliente, não uma prioridade_manual declarada pelo próprio cliente;
+    dados inválidos passam, para adicionar_chamado recusar com 400.
+    """
+    try:
+        tipo_chamado = TipoChamado(dados['tipo_chamado'])
+        tipo_cliente = TipoCliente(dados['tipo_cliente'])
+        cliente = dados['cliente_nome']
+    except (KeyError, ValueError, TypeError):
+        return None
+    if not isinstance(cliente, str):
+        return None
+    if (PRIORIDADE_CHAMADO[tipo_chamado] <= ADMISSAO_PRIORIDADE_GARANTIDA
+            and PRIORIDADE_CLIENTE[tipo_cliente] <= ADMISSAO_PRIORIDADE_CLIENTE_GARANTIDA):
+        return None
+    recusa = None
+    if ADMISSAO_FILA_MAXIMA is not None and sistema.tamanho_fila >= ADMISSAO_FILA_MAXIMA:
+        recusa = ("fila_cheia", ADMISSAO_ESPERA_FILA_CHEIA)
+    elif ADMISSAO_TAXA_POR_CLIENTE is not None:
+        espera = limitador_clientes.consumir(cliente, sistema.relogio())
+        if espera:
+            recusa = ("taxa_cliente", math.ceil(espera))
+    if recusa:
+        chamados_recusados.incrementar(recusa[0], tipo_cliente.value)
+    return recusa
+
+def _corpo_recusa(motivo: str, segundos: int) -> dict:
+    return {"erro": "Chamado recusado pelo controle de admissão", "motivo": motivo, "tentar_em_s": segundos}
+
+# Perfis sob demanda (rotas /admin)
+perfis_requisicao = PerfisRequisicao()
+monitor_memoria = MonitorMemoria()
+lock_perfil_cpu = threading.Lock()
+
+def _eh_admin() -> bool:
+    token = request.headers.get("X-Token-Admin", "")
+    return bool(TOKEN_ADMIN) and hmac.compare_digest(token, TOKEN_ADMIN)
+
+def somente_admin(funcao):
+    @wraps(funcao)
+    def envolvida(*args, **kwargs):
+        if not _eh_admin():
+            return jsonify({"erro": "Não autorizado"}), 403
+        return funcao(*args, **kwargs)
+    return envolvida
+
+@app.before_request
+def iniciar_medicao():
+    g.inicio_requisicao = time.perf_counter()
+    # Com "X-Perfilar: 1" (e token de admin) a requisição roda sob cProfile
+    if request.headers.get("X-Perfilar") and _eh_admin():
+        g.perfil = perfis_requisicao.iniciar()
+
+@app.after_request
+def registrar_medicao(resposta):
+    perfil = g.pop('perfil', None)
+    if perfil is not None:
+        resposta.headers["X-Perfil-Id"] = perfis_requisicao.concluir(
+            perfil, f"{request.method} {request.full_path}")
+    inicio = g.pop('inicio_requisicao', None)
+    if inicio is not None:
+        rota = request.url_rule.rule if request.url_rule else "desconhecida"
+        latencia_rotas.observar(time.perf_counter() - inicio, rota, request.method,
+                                str(resposta.status_code))
+    return resposta
 
 # Rotas da API
 @app.route('/')
 def dashboard():
     return render_template('dashboard.html')
 
+@app.route('/metrics')
+def exportar_metricas():
+    return Response(metricas.exposicao(), mimetype="text/plain; version=0.0.4")
+
+@app.route('/admin/perfil/cpu')
+@somente_admin
+def perfil_cpu():
+    """Perfil de CPU por amostragem durante ?segundos=N, em pilhas colapsadas"""
+    try:
+        segundos = min(float(request.args.get('segundos', 10)), MAX_SEGUNDOS_PERFIL_CPU)
+        intervalo = max(float(request.args.get('intervalo', 0.005)), 0.001)
+    except ValueError:
+        return jsonify({"erro": "Parâmetros inválidos"}), 400
+    if not lock_perfil_cpu.acquire(blocking=False):
+        return jsonify({"erro": "Já existe um perfil de CPU em andamento"}), 409
+    try:
+        contagens = amostrar_cpu(segundos, intervalo)
+    finally:
+        lock_perfil_cpu.release()
+    return Response(pilhas_colapsadas(contagens), mimetype="text/plain",
+                    headers={"Content-Disposition": "attachment; filename=cpu.collapsed"})
+
+@app.route('/admin/perfil/requisicoes')
+@somente_admin
+def listar_perfis_requisicao():
+    return jsonify(perfis_requisicao.listar())
+
+@app.route('/admin/perfil/requisicoes/<id_perfil>')
+@somente_admin
+def baixar_perfil_requisicao(id_perfil):
+    """?formato=pstats (padrão, binário) ou texto (resumo ordenado por tempo acumulado)"""
+    if request.args.get('formato') == 'texto':
+        conteudo = perfis_requisicao.texto(id_perfil)
+        if conteudo is None:
+            return jsonify({"erro": "Perfil não encontrado"}), 404
+        return Response(conteudo, mimetype="text/plain")
+    conteudo = perfis_requisicao.pstats(id_perfil)
+    if conteudo is None:
+        return jsonify({"erro": "Perfil não encontrado"}), 404
+    return Response(conteudo, mimetype="application/octet-stream",
+                    headers={"Content-Disposition": f"attachment; filename=requisicao-{id_perfil}.pstats"})
+
+@app.route('/admin/perfil/memoria/iniciar', methods=['POST'])
+@somente_admin
+def iniciar_perfil_memoria():
+    try:
+        monitor_memoria.iniciar(int(request.args.get('quadros', 10)))
+    except ValueError:
+        return jsonify({"erro": "Parâmetros inválidos"}), 400
+    return jsonify({"status": "sucesso"})
+
+@app.route('/admin/perfil/memoria/parar', methods=['POST'])
+@somente_admin
+def parar_perfil_memoria():
+    monitor_memoria.parar()
+    return jsonify({"status": "sucesso"})
+
+@app.route('/admin/perfil/memoria')
+@somente_admin
+def diferenca_perfil_memoria():
+    """Maiores variações de memória desde o snapshot anterior (tracemalloc)"""
+    if not monitor_memoria.ativo:
+        return jsonify({"erro": "Inicie com POST /admin/perfil/memoria/iniciar"}), 409
+    try:
+        relatorio = monitor_memoria.diferenca(int(request.args.get('limite', 30)),
+                                              request.args.get('agrupar', 'lineno'))
+    except ValueError:
+        return jsonify({"erro": "Parâmetros inválidos"}), 400
+    return Response(relatorio, mimetype="text/plain")
+
 @app.route('/api/chamados', methods=['GET', 'POST'])
 def api_chamados():
     if request.method == 'POST':
         dados = request.json
+        recusa = _recusa_admissao(dados)
+        if recusa:
+            resposta = jsonify(_corpo_recusa(*recusa))
+            resposta.headers["Retry-After"] = str(recusa[1])
+            return resposta, 429
         chamado = sistema.adicionar_chamado(dados)
         if chamado:
-            return jsonify(sistema._serializar_chamado(chamado)), 201
+            # Agrupado num chamado já aberto: nada foi criado
+            return jsonify(sistema._serializar_chamado(chamado)), 201 if chamado.ocorrencias == 1 else 200
         return jsonify({"erro": "Dados inválidos"}), 400
     else:
+        previsoes = sistema.previsoes_espera()
         return jsonify({
-            "fila": [sistema._serializar_chamado(c) for _, _, _, c in sistema.fila],
+            "fila": [sistema._serializar_chamado(c, previsoes) for c in sistema.chamados_na_fila()],
             "agentes": [sistema._serializar_agente(a) for a in sistema.agentes.values()],
             "chamados_em_atendimento": [sistema._serializar_chamado(c) for c in sistema.chamados_em_atendimento.values()]
         })
 
+def _filtros_historico() -> dict:
+    """Filtros do histórico a partir da query string (ValueError se inválidos)"""
+    filtros = {
+        nome: request.args.get(nome)
+        for nome in ("status", "tipo_chamado", "tipo_cliente", "cliente", "agente")
+    }
+    for nome in ("desde", "ate"):
+        if request.args.get(nome):
+            filtros[nome] = datetime.fromisoformat(request.args[nome])
+    return filtros
+
+@app.route('/api/stats', methods=['GET'])
+def api_estatisticas():
+    return jsonify(sistema.resumo_estatisticas())
+
+@app.route('/api/stats/resolucao', methods=['GET'])
+def api_modelo_resolucao():
+    with sistema._lock:
+        return jsonify(sistema.modelo.resumo())
+
+@app.route('/api/chamados/search', methods=['GET'])
+def api_buscar_chamados():
+    """Busca nos chamados ativos: ?q=vpn (sem acentos/maiúsculas; o último termo casa por prefixo)"""
+    try:
+        limite = int(request.args.get('limite', 50))
+    except ValueError:
+        return jsonify({"erro": "Parâmetros inválidos"}), 400
+    total, chamados = sistema.buscar_chamados(request.args.get('q', ''), limite)
+    previsoes = sistema.previsoes_espera([c.id_chamado for c in chamados])
+    return jsonify({
+        "total": total,
+        "chamados": [sistema._serializar_chamado(c, previsoes) for c in chamados]
+    })
+
+@app.route('/api/chamados/historico', methods=['GET'])
+def api_historico_chamados():
+    if not sistema.repositorio:
+        return jsonify({"erro": "Histórico desativado"}), 404
+    try:
+        filtros = _filtros_historico()
+        limite = max(1, min(int(request.args.get('limite', 100)), 10000))
+    except ValueError:
+        return jsonify({"erro": "Parâmetros inválidos"}), 400
+    return jsonify(sistema.repositorio.consultar(limite=limite, **filtros))
+
+@app.route('/api/chamados/exportar', methods=['GET'])
+def api_exportar_chamados():
+    """Histórico completo em CSV (ou CSV gzip com ?compressao=gzip), gerado em fluxo"""
+    if not sistema.repositorio:
+        return jsonify({"erro": "Histórico desativado"}), 404
+    try:
+        filtros = _filtros_historico()
+    except ValueError:
+        return jsonify({"erro": "Parâmetros inválidos"}), 400
+    blocos = blocos_csv(sistema.repositorio.iterar(**filtros))
+    nome, tipo = "chamados.csv", "text/csv"
+    if request.args.get('compressao') == 'gzip':
+        blocos = blocos_gzip(blocos)
+        nome, tipo = "chamados.csv.gz", "application/gzip"
+    return Response(blocos, mimetype=tipo,
+                    headers={"Content-Disposition": f"attachment; filename={nome}"})
+
 @app.route('/api/chamados/<id_chamado>/escalar', methods=['PUT'])
 def api_escalar_chamado(id_chamado):
     nova_prioridade = request.json.get('prioridade')
@@ -413,6 +1768,13 @@ def api_atribuir_chamado(id_chamado):
         return jsonify({"status": "sucesso"})
     return jsonify({"erro": "Chamado ou agente não encontrado"}), 404
 
+@app.route('/api/chamados/<id_chamado>/previsao')
+def api_previsao_chamado(id_chamado):
+    previsao = sistema.previsao_chamado(id_chamado)
+    if previsao is None:
+        return jsonify({"erro": "Chamado não encontrado"}), 404
+    return jsonify(previsao)
+
 @app.route('/api/chamados/proximo', methods=['POST'])
 def api_processar_chamado():
     chamado = sistema.processar_proximo_chamado()
@@ -426,26 +1788,160 @@ def api_finalizar_chamado(id_chamado):
         return jsonify({"status": "sucesso"})
     return jsonify({"erro": "Chamado não encontrado ou não está em atendimento"}), 404
 
+def _agente_novo(dados) -> AgenteSuporte:
+    """AgenteSuporte a partir do JSON de cadastro (KeyError/ValueError/TypeError se inválido)"""
+    campos = campos_agente(dados)
+    if not isinstance(dados["id"], str) or not dados["id"] or "nome" not in campos or "especialidades" not in campos:
+        raise ValueError("id, nome e especialidades são obrigatórios")
+    return AgenteSuporte(id=dados["id"], **campos)
+
+@app.route('/api/agentes', methods=['GET', 'POST'])
+def api_agentes():
+    if request.method == 'GET':
+        with sistema._lock:
+            return jsonify([sistema._serializar_agente(a) for a in sistema.agentes.values()])
+    try:
+        agente = _agente_novo(request.json)
+    except (KeyError, ValueError, TypeError, AttributeError):
+        return jsonify({"erro": "Dados inválidos"}), 400
+    if agente.id in sistema.agentes:
+        return jsonify({"erro": "Agente já cadastrado"}), 409
+    sistema.adicionar_agente(agente)
+    return jsonify(sistema._serializar_agente(agente)), 201
+
+@app.route('/api/agentes/<id_agente>', methods=['PUT'])
+def api_atualizar_agente(id_agente):
+    try:
+        atualizado = sistema.atualizar_agente(id_agente, request.json)
+    except (ValueError, TypeError, AttributeError):
+        return jsonify({"erro": "Dados inválidos"}), 400
+    if not atualizado:
+        return jsonify({"erro": "Agente não encontrado"}), 404
+    return jsonify(sistema._serializar_agente(sistema.agentes[id_agente]))
+
+@app.route('/api/agentes/<id_agente>/<acao>', methods=['POST'])
+def api_turno_agente(id_agente, acao):
+    """acao: entrar (login ou fim da pausa), pausar ou sair (logout)"""
+    operacoes = {"entrar": sistema.entrar_agente, "pausar": sistema.pausar_agente, "sair": sistema.sair_agente}
+    if acao not in operacoes:
+        return jsonify({"erro": "Ação inválida"}), 404
+    if operacoes[acao](id_agente):
+        return jsonify(sistema._serializar_agente(sistema.agentes[id_agente]))
+    return jsonify({"erro": "Agente não encontrado ou desconectado"}), 404
+
 # WebSocket events
 @socketio.on('connect')
-def handle_connect():
+@latencia_socket.medir_funcao('connect')
+def handle_connect(auth=None):
+    clientes_conectados.incrementar()
+    previsoes = sistema.previsoes_espera()
     emit('atualizar_fila', {
-        'fila': [sistema._serializar_chamado(c) for _, _, _, c in sistema.fila],
+        'fila': [sistema._serializar_chamado(c, previsoes) for c in sistema.chamados_na_fila()],
         'agentes': [sistema._serializar_agente(a) for a in sistema.agentes.values()],
         'chamados_em_atendimento': [sistema._serializar_chamado(c) for c in sistema.chamados_em_atendimento.values()]
     })
+    emit('estatisticas', sistema.resumo_estatisticas())
+
+@socketio.on('disconnect')
+def handle_disconnect():
+    clientes_conectados.decrementar()
 
 @socketio.on('novo_chamado')
+@latencia_socket.medir_funcao('novo_chamado')
 def handle_novo_chamado(data):
-    sistema.adicionar_chamado(data)
+    recusa = _recusa_admissao(data)
+    if recusa:
+        return _corpo_recusa(*recusa)  # vai no ack do cliente
+    if sistema.adicionar_chamado(data) is None:
+        return {"erro": "Dados inválidos"}
 
 @socketio.on('escalar_chamado')
+@latencia_socket.medir_funcao('escalar_chamado')
 def handle_escalar_chamado(data):
     sistema.escalar_chamado(data['id_chamado'], data['prioridade'])
 
 @socketio.on('finalizar_chamado')
+@latencia_socket.medir_funcao('finalizar_chamado')
 def handle_finalizar_chamado(data):
     sistema.finalizar_chamado(data['id_chamado'])
 
+# Escala de agentes: o retorno vai no ack do cliente Socket.IO
+@socketio.on('registrar_agente')
+@latencia_socket.medir_funcao('registrar_agente')
+def handle_registrar_agente(data):
+    try:
+        agente = _agente_novo(data)
+    except (KeyError, ValueError, TypeError, AttributeError):
+        return {"erro": "Dados inválidos"}
+    if agente.id in sistema.agentes:
+        return {"erro": "Agente já cadastrado"}
+    sistema.adicionar_agente(agente)
+    return sistema._serializar_agente(agente)
+
+@socketio.on('atualizar_agente')
+@latencia_socket.medir_funcao('atualizar_agente')
+def handle_atualizar_agente(data):
+    try:
+        atualizado = sistema.atualizar_agente(data['id'], data)
+    except (KeyError, ValueError, TypeError, AttributeError):
+        return {"erro": "Dados inválidos"}
+    return sistema._serializar_agente(sistema.agentes[data['id']]) if atualizado else {"erro": "Agente não encontrado"}
+
+@socketio.on('entrar_agente')
+@latencia_socket.medir_funcao('entrar_agente')
+def handle_entrar_agente(data):
+    return {"sucesso": sistema.entrar_agente(data['id'])}
+
+@socketio.on('pausar_agente')
+@latencia_socket.medir_funcao('pausar_agente')
+def handle_pausar_agente(data):
+    return {"sucesso": sistema.pausar_agente(data['id'])}
+
+@socketio.on('sair_agente')
+@latencia_socket.medir_funcao('sair_agente')
+def handle_sair_agente(data):
+    return {"sucesso": sistema.sair_agente(data['id'])}
+
+def gravar_snapshots_periodicamente():
+    ultimo = sistema.journal.registrados
+    while True:
+        time.sleep(SNAPSHOT_INTERVALO)
+        if sistema.journal.registrados - ultimo >= SNAPSHOT_MIN_EVENTOS:
+            ultimo = sistema.journal.registrados
+            sistema.salvar_snapshot()
+
+def verificar_sla_periodicamente():
+    while True:
+        time.sleep(SLA_INTERVALO_VERIFICACAO)
+        try:
+            sistema.verificar_sla()
+        except Exception:
+            log.erro("erro_verificar_sla", "Erro ao verificar SLA")
+
+def iniciar_sistema(host: str = '0.0.0.0', **opcoes_servidor):
+    """Inicia o servidor; `opcoes_servidor` vão para socketio.run (ex.: port, allow_unsafe_werkzeug)"""
+    # Com debug=True o reloader executa este arquivo em dois processos; só o filho atende requisições
+    if not DEBUG or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        if REPOSITORIO_SQLITE:
+            os.makedirs(os.path.dirname(REPOSITORIO_SQLITE) or ".", exist_ok=True)
+            sistema.repositorio = RepositorioSQLite(REPOSITORIO_SQLITE, log=log)
+            atexit.register(sistema.repositorio.fechar)
+        inicio = time.perf_counter()
+        eventos = sistema.ativar_persistencia(
+            DIRETORIO_DADOS,
+            lote=JOURNAL_LOTE,
+            latencia=JOURNAL_LATENCIA,
+            sincrono=JOURNAL_SINCRONO
+        )
+        log.info("estado_recuperado", eventos=eventos, fila=sistema.tamanho_fila,
+                 duracao_ms=(time.perf_counter() - inicio) * 1000)
+        if not sistema.agentes:
+            for dados in AGENTES_INICIAIS:
+                sistema.adicionar_agente(AgenteSuporte(id=dados["id"], **campos_agente(dados)))
+        atexit.register(sistema.journal.fechar)
+        threading.Thread(target=gravar_snapshots_periodicamente, daemon=True).start()
+        threading.Thread(target=verificar_sla_periodicamente, daemon=True).start()
+    socketio.run(app, debug=DEBUG, host=host, **opcoes_servidor)
+
 if __name__ == '__main__':
-    socketio.run(app, debug=True, host='0.0.0.0')
\ No newline at end of file
+    iniciar_sistema()
\ No newline at end of file
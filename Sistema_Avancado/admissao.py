@@ -0,0 +1,42 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable
+
+
+class LimitadorPorCliente:
+    """
+    Token bucket por cliente: cada um acumula `taxa` fichas por segundo, até
+    `rajada`, e cada chamado aceito gasta uma. Guarda no máximo `max_clientes`
+    baldes em ordem de uso (LRU): ao passar do limite sai o cliente ocioso há
+    mais tempo, que volta depois com o balde cheio. Se ele tinha ficado parado
+    menos que rajada / taxa segundos, ganha fichas que ainda não tinha; por
+    isso `max_clientes` deve passar dos clientes ativos nesse intervalo.
+    O(1) por chamado.
+    """
+
+    def __init__(self, taxa: float, rajada: float, max_clientes: int):
+        self.taxa = taxa
+        self.rajada = rajada
+        self.max_clientes = max_clientes
+        self._baldes: "OrderedDict[Hashable, list]" = OrderedDict()  # cliente -> [fichas, instante]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._baldes)
+
+    def consumir(self, cliente: Hashable, agora: float) -> float:
+        """Gasta uma ficha do cliente; retorna 0 se havia, senão os segundos até a próxima"""
+        with self._lock:
+            balde = self._baldes.get(cliente)
+            if balde is None:
+                balde = self._baldes[cliente] = [self.rajada, agora]
+                if len(self._baldes) > self.max_clientes:
+                    self._baldes.popitem(last=False)
+            else:
+                self._baldes.move_to_end(cliente)
+                balde[0] = min(self.rajada, balde[0] + (agora - balde[1]) * self.taxa)
+                balde[1] = agora
+            if balde[0] >= 1:
+                balde[0] -= 1
+                return 0.0
+            return (1 - balde[0]) / self.taxa
@@ -0,0 +1,363 @@
+"""
+Benchmark das operações do SistemaChamados por tamanho de fila e número de agentes.
+
+Mede adicionar, escalar, atribuir (automática, ao liberar um agente), processar
+e finalizar com filas de 1 mil a 1 milhão de chamados e de 2 a 1000 agentes,
+sem notificações, envio Socket.IO e log (só o custo do núcleo). Grava o
+resultado em JSON, ajusta a complexidade empírica de cada operação e compara
+com um resultado salvo, apontando regressões.
+
+    python benchmark.py --saida resultado.json
+    python benchmark.py --tamanhos 1000,10000 --agentes 2,10 --base resultado.json
+"""
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import Sistema_Chamadas as sc
+
+TAMANHOS = (1_000, 10_000, 100_000, 1_000_000)
+AGENTES = (2, 10, 100, 1000)
+OPERACOES = ("adicionar", "escalar", "processar", "atribuir", "finalizar")
+TEMPO_MINIMO = 0.2  # segundos medidos por operação, em cada combinação
+MIN_REPETICOES = 3
+FRACAO_MAXIMA = 0.05  # repetições de cada operação, no máximo, em fração da fila (o estado quase não muda)
+REPETICOES_MEMORIA = 3
+TOLERANCIA = 0.25  # regressão: mediana mais de 25% acima da base...
+PISO_US = 2.0  # ...e pelo menos 2 µs acima (abaixo disso é ruído)
+MELHORA_MINIMA = 0.2  # redução relativa do erro para preferir um modelo mais lento...
+PARCELA_MINIMA = 0.25  # ...cujo termo de crescimento seja ao menos 25% do tempo no maior n...
+CRESCIMENTO_MINIMO = 0.5  # ...e cuja alta prevista sobre o menor n passe de 50%...
+PONTOS_EM_ALTA = 2  # ...em ao menos 2 tamanhos (um ponto só fora da curva é ruído)
+
+# Modelos de complexidade ajustados, do mais rápido ao mais lento: t(n) = a + b * f(n)
+MODELOS: Dict[str, Callable[[float], float]] = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log2(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log2(n),
+    "O(n²)": lambda n: n * n,
+}
+
+_TIPOS = list(sc.TipoChamado)
+_CLIENTES = list(sc.TipoCliente)
+
+
+def _dados_chamado(i: int) -> dict:
+    # Um cliente por chamado (nenhum é agrupado como duplicado), com vocabulário limitado
+    # como o de nomes reais: ~2 mil termos distintos no índice de busca com 1 milhão de chamados
+    return {
+        "cliente_nome": f"Cliente {i % 1000} filial {i // 1000}",
+        "tipo_cliente": _CLIENTES[i % len(_CLIENTES)].value,
+        "tipo_chamado": _TIPOS[i % len(_TIPOS)].value,
+        "descricao": f"Falha no serviço {i % 97} do ambiente {i % 13}"
+    }
+
+
+def criar_sistema(tamanho: int) -> sc.SistemaChamados:
+    """Sistema com `tamanho` chamados pendentes, sem efeitos fora do núcleo"""
+    sistema = sc.SistemaChamados(silencioso=True)
+    for i in range(tamanho):
+        sistema.adicionar_chamado(_dados_chamado(i))
+    return sistema
+
+
+def completar_agentes(sistema: sc.SistemaChamados, total: int):
+    """Acrescenta agentes até `total`, alternando as duas especialidades do sistema"""
+    especialidades = (
+        [sc.TipoChamado.SERVER_DOWN, sc.TipoChamado.IMPACTA_PRODUCAO],
+        [sc.TipoChamado.SEM_IMPACTO, sc.TipoChamado.DUVIDA],
+    )
+    for i in range(len(sistema.agentes), total):
+        # Proficiências variadas, para o roteamento comparar notas além da carga
+        sistema.adicionar_agente(sc.AgenteSuporte(
+            id=f"bench{i}", nome=f"Agente {i}", especialidades=especialidades[i % 2],
+            proficiencias={tipo: 0.5 + (i // 2 % 6) / 10 for tipo in especialidades[i % 2]}))
+
+
+def _preparar(sistema: sc.SistemaChamados, operacao: str, sorteio: random.Random) -> Optional[Callable]:
+    """Deixa o estado pronto para uma execução da operação e devolve a chamada a medir"""
+    if operacao == "adicionar":
+        # Sem duplicados, cada chamado novo gera o próximo id: ultimo_id numera os dados também
+        dados = _dados_chamado(sistema.ultimo_id)
+        return lambda: sistema.adicionar_chamado(dados)
+    if operacao == "escalar":
+        if not sistema.chamados_ativos:
+            return None
+        # Sorteia ids (INC-1..INC-n) até achar um ativo, sem copiar os ativos numa lista
+        id_chamado = None
+        while id_chamado not in sistema.chamados_ativos:
+            id_chamado = f"INC-{sorteio.randint(1, sistema.ultimo_id)}"
+        return lambda: sistema.escalar_chamado(id_chamado, sorteio.choice((1, 2)))
+    if operacao == "processar":
+        return sistema.processar_proximo_chamado if sistema.tamanho_fila else None
+    agentes = list(sistema.agentes.values())
+    agente = agentes[sorteio.randrange(len(agentes))]
+    if operacao == "atribuir":
+        # Uma vaga do agente fica livre sem finalizar (fora da medição); mede só a escolha e a atribuição
+        if agente.chamados:
+            with sistema._lock:
+                sistema._liberar(sistema.chamados_ativos[agente.chamados[-1]])
+
+        def atribuir():
+            with sistema._lock:
+                return sistema._atribuir_proximo_chamado(agente.id)
+        return atribuir
+    # finalizar: o de um agente ocupado, que em seguida pega o próximo da fila
+    ocupados = [a for a in agentes if a.chamados]
+    if not ocupados:
+        return None
+    id_chamado = ocupados[sorteio.randrange(len(ocupados))].chamados[0]
+    return lambda: sistema.finalizar_chamado(id_chamado)
+
+
+def medir(sistema: sc.SistemaChamados, operacao: str, tamanho: int, sorteio: random.Random,
+          tempo_minimo: float = TEMPO_MINIMO) -> dict:
+    """Executa a operação até somar `tempo_minimo` (entre MIN_REPETICOES e a fração máxima da fila)"""
+    maximo = max(MIN_REPETICOES, int(tamanho * FRACAO_MAXIMA))
+    tempos: List[float] = []
+    total = 0.0
+    while len(tempos) < maximo and (total < tempo_minimo or len(tempos) < MIN_REPETICOES):
+        chamada = _preparar(sistema, operacao, sorteio)
+        if chamada is None:
+            break
+        # Como no timeit, sem coletas do gc no meio: com milhões de objetos vivos, uma coleta
+        # completa cai numa execução qualquer e vale por centenas delas
+        gc.disable()
+        try:
+            inicio = time.perf_counter()
+            chamada()
+            decorrido = time.perf_counter() - inicio
+        finally:
+            gc.enable()
+        tempos.append(decorrido)
+        total += decorrido
+    if not tempos:
+        return {"repeticoes": 0}
+    tempos.sort()
+    return {
+        "repeticoes": len(tempos),
+        "mediana_us": round(tempos[len(tempos) // 2] * 1e6, 3),
+        "p90_us": round(tempos[min(len(tempos) - 1, int(len(tempos) * 0.9))] * 1e6, 3),
+        "media_us": round(total / len(tempos) * 1e6, 3),
+    }
+
+
+def pico_memoria(sistema: sc.SistemaChamados, operacao: str, sorteio: random.Random) -> Optional[int]:
+    """Maior alocação temporária (bytes) de uma execução da operação, via tracemalloc"""
+    picos = []
+    for _ in range(REPETICOES_MEMORIA):
+        chamada = _preparar(sistema, operacao, sorteio)
+        if chamada is None:
+            break
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        chamada()
+        picos.append(tracemalloc.get_traced_memory()[1] - base)
+        tracemalloc.stop()
+    return max(picos) if picos else None
+
+
+def _minimos_quadrados(pontos: List[tuple], f: Callable[[float], float]) -> tuple:
+    """
+    (a, b, erro) de t = a + b*f(n) com a, b >= 0, minimizando o erro relativo
+    sum(((a + b*f(n) - t) / t)^2), para não deixar o maior n dominar
+    """
+    u = [1 / t for _, t in pontos]
+    v = [f(n) / t for n, t in pontos]
+    suu, svv, suv = sum(x * x for x in u), sum(x * x for x in v), sum(x * y for x, y in zip(u, v))
+    su, sv = sum(u), sum(v)
+    candidatos = [(su / suu, 0.0), (0.0, sv / svv)]
+    determinante = suu * svv - suv * suv
+    if determinante > 1e-12 * suu * svv:
+        a = (su * svv - sv * suv) / determinante
+        b = (sv * suu - su * suv) / determinante
+        if a >= 0 and b >= 0:
+            candidatos.append((a, b))
+
+    def erro(a, b):
+        return math.sqrt(sum((a * x + b * y - 1) ** 2 for x, y in zip(u, v)) / len(u))
+    return min(((a, b, erro(a, b)) for a, b in candidatos), key=lambda c: c[2])
+
+
+def ajustar(pontos: List[tuple]) -> Optional[dict]:
+    """
+    Modelo de MODELOS que melhor explica os pontos (n, segundos) como custo
+    fixo mais termo de crescimento. Um modelo mais lento só vence se reduzir
+    o erro em mais de MELHORA_MINIMA, se o seu crescimento pesar (ao menos
+    PARCELA_MINIMA do tempo no maior n) e se previr, sobre o tempo no menor
+    n, uma alta de ao menos CRESCIMENTO_MINIMO em PONTOS_EM_ALTA tamanhos;
+    senão é ruído e fica o modelo mais rápido. Assim uma operação plana com
+    um único ponto alto no maior n não vira O(n²). Precisa de ao menos três
+    valores de n.
+    """
+    pontos = [(n, t) for n, t in pontos if t > 0]
+    tamanhos = sorted({n for n, _ in pontos})
+    if len(tamanhos) < 3:
+        return None
+    menor, maior = tamanhos[0], tamanhos[-1]
+    melhor = None
+    for nome, f in MODELOS.items():
+        a, b, erro = _minimos_quadrados(pontos, f)
+        em_alta = sum(1 for n in tamanhos if b * (f(n) - f(menor)) >= CRESCIMENTO_MINIMO * (a + b * f(menor)))
+        if melhor is None or (erro < melhor["erro_relativo"] * (1 - MELHORA_MINIMA)
+                              and b * f(maior) >= PARCELA_MINIMA * (a + b * f(maior))
+                              and em_alta >= PONTOS_EM_ALTA):
+            melhor = {"modelo": nome, "fixo_us": a * 1e6, "coeficiente_us": b * 1e6, "erro_relativo": erro}
+    for chave in ("fixo_us", "coeficiente_us"):
+        melhor[chave] = float(f"{melhor[chave]:.4g}")
+    melhor["erro_relativo"] = round(melhor["erro_relativo"], 3)
+    return melhor
+
+
+def executar(tamanhos=TAMANHOS, agentes=AGENTES, operacoes=OPERACOES, semente: int = 42,
+             tempo_minimo: float = TEMPO_MINIMO, medir_memoria: bool = True,
+             ao_medir: Optional[Callable[[dict], None]] = None) -> dict:
+    sorteio = random.Random(semente)
+    medicoes = []
+    memoria = []
+    for tamanho in tamanhos:
+        if medir_memoria:
+            # Numa construção à parte: objetos alocados sob o tracemalloc ficam espalhados
+            # e deixam as operações seguintes várias vezes mais lentas
+            gc.collect()
+            tracemalloc.start()
+            sistema = criar_sistema(tamanho)
+            estado = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del sistema
+            memoria.append({"chamados": tamanho, "bytes": estado,
+                            "bytes_por_chamado": round(estado / tamanho, 1)})
+        gc.collect()
+        sistema = criar_sistema(tamanho)
+        for total_agentes in sorted(agentes):
+            completar_agentes(sistema, total_agentes)
+            for operacao in operacoes:
+                gc.collect()
+                resultado = medir(sistema, operacao, tamanho, sorteio, tempo_minimo)
+                resultado.update(operacao=operacao, chamados=tamanho, agentes=total_agentes,
+                                 pico_bytes=pico_memoria(sistema, operacao, sorteio) if medir_memoria else None)
+                medicoes.append(resultado)
+                if ao_medir:
+                    ao_medir(resultado)
+        del sistema
+
+    ajustes = []
+    for operacao in operacoes:
+        for total_agentes in sorted(agentes):
+            pontos = [(m["chamados"], m["mediana_us"] / 1e6) for m in medicoes
+                      if m["operacao"] == operacao and m["agentes"] == total_agentes and m["repeticoes"]]
+            ajuste = ajustar(pontos)
+            if ajuste:
+                ajustes.append(dict(ajuste, operacao=operacao, variavel="chamados", agentes=total_agentes))
+        maior = max(tamanhos)
+        pontos = [(m["agentes"], m["mediana_us"] / 1e6) for m in medicoes
+                  if m["operacao"] == operacao and m["chamados"] == maior and m["repeticoes"]]
+        ajuste = ajustar(pontos)
+        if ajuste:
+            ajustes.append(dict(ajuste, operacao=operacao, variavel="agentes", chamados=maior))
+    return {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semente": semente,
+        "medicoes": medicoes,
+        "memoria": memoria,
+        "ajustes": ajustes
+    }
+
+
+def regressoes(resultado: dict, base: dict, tolerancia: float = TOLERANCIA) -> List[dict]:
+    """Medições que ficaram mais lentas que na base além da tolerância (e do piso de ruído)"""
+    anteriores = {(m["operacao"], m["chamados"], m["agentes"]): m
+                  for m in base["medicoes"] if m.get("repeticoes")}
+    encontradas = []
+    for m in resultado["medicoes"]:
+        anterior = anteriores.get((m["operacao"], m["chamados"], m["agentes"]))
+        if not anterior or not m.get("repeticoes"):
+            continue
+        atual, antes = m["mediana_us"], anterior["mediana_us"]
+        if atual > antes * (1 + tolerancia) and atual - antes > PISO_US:
+            encontradas.append({"operacao": m["operacao"], "chamados": m["chamados"],
+                                "agentes": m["agentes"], "base_us": antes, "atual_us": atual,
+                                "razao": round(atual / antes, 2)})
+    return encontradas
+
+
+def formatar(resultado: dict) -> str:
+    linhas = []
+    for operacao in dict.fromkeys(m["operacao"] for m in resultado["medicoes"]):
+        linhas.append(f"\n{operacao} (mediana em µs; linhas: chamados, colunas: agentes)")
+        medicoes = [m for m in resultado["medicoes"] if m["operacao"] == operacao]
+        agentes = sorted({m["agentes"] for m in medicoes})
+        linhas.append(f"{'':>10}" + "".join(f"{a:>12}" for a in agentes))
+        for tamanho in sorted({m["chamados"] for m in medicoes}):
+            celulas = {m["agentes"]: m.get("mediana_us") for m in medicoes if m["chamados"] == tamanho}
+            linhas.append(f"{tamanho:>10}" + "".join(
+                f"{celulas[a]:>12.1f}" if celulas.get(a) is not None else f"{'-':>12}" for a in agentes))
+    if resultado["memoria"]:
+        linhas.append("\nMemória do estado:")
+    for m in resultado["memoria"]:
+        linhas.append(f"{m['chamados']:>10} chamados: {m['bytes'] / 2 ** 20:.1f} MiB "
+                      f"({m['bytes_por_chamado']:.0f} B/chamado)")
+    linhas.append("\nComplexidade ajustada:")
+    for a in resultado["ajustes"]:
+        fixo = f"{a['agentes']} agentes" if a["variavel"] == "chamados" else f"{a['chamados']} chamados"
+        linhas.append(f"  {a['operacao']:<10} por {a['variavel']:<8} ({fixo}): {a['modelo']:<10} "
+                      f"{a['fixo_us']} µs + {a['coeficiente_us']} µs·f, erro {a['erro_relativo']:.0%}")
+    return "\n".join(linhas)
+
+
+def _inteiros(texto: str) -> List[int]:
+    return [int(parte.replace("_", "")) for parte in texto.split(",") if parte]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das operações do SistemaChamados")
+    parser.add_argument("--tamanhos", type=_inteiros, default=list(TAMANHOS),
+                        help="chamados na fila, separados por vírgula")
+    parser.add_argument("--agentes", type=_inteiros, default=list(AGENTES))
+    parser.add_argument("--operacoes", type=lambda t: t.split(","), default=list(OPERACOES))
+    parser.add_argument("--tempo-minimo", type=float, default=TEMPO_MINIMO,
+                        help="segundos medidos por operação em cada combinação")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--sem-memoria", action="store_true",
+                        help="não mede memória (evita uma construção extra, lenta, de cada tamanho)")
+    parser.add_argument("--saida", help="grava o resultado em JSON")
+    parser.add_argument("--base", help="resultado salvo para comparar (sai com código 1 se houver regressão)")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+    args = parser.parse_args(argv)
+    desconhecidas = set(args.operacoes) - set(OPERACOES)
+    if desconhecidas:
+        parser.error(f"operações desconhecidas: {', '.join(sorted(desconhecidas))}")
+
+    def progresso(m: dict):
+        print(f"{m['operacao']:<10} {m['chamados']:>9} chamados {m['agentes']:>5} agentes: "
+              f"{m.get('mediana_us', float('nan')):>12.1f} µs ({m['repeticoes']} execuções)",
+              file=sys.stderr)
+
+    resultado = executar(args.tamanhos, args.agentes, args.operacoes, args.semente,
+                         args.tempo_minimo, not args.sem_memoria, progresso)
+    print(formatar(resultado))
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=1)
+    if args.base:
+        with open(args.base, encoding="utf-8") as arquivo:
+            encontradas = regressoes(resultado, json.load(arquivo), args.tolerancia)
+        for r in encontradas:
+            print(f"REGRESSÃO: {json.dumps(r, ensure_ascii=False)}")
+        if encontradas:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
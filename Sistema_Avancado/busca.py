@@ -0,0 +1,168 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterator, List, Set
+
+_PALAVRA = re.compile(r"\w+")
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas e sem acentos: "Produção" -> "producao" """
+    decomposto = unicodedata.normalize("NFKD", texto.casefold())
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+@lru_cache(maxsize=65536)
+def termos(texto: str) -> FrozenSet[str]:
+    # Descrições e nomes de cliente se repetem muito: o cache evita retokenizar
+    return frozenset(_PALAVRA.findall(normalizar(texto)))
+
+
+class _VocabularioOrdenado:
+    """
+    Conjunto ordenado de termos em blocos de até 2 * `tamanho_bloco`, como a
+    SomaOrdenada da previsão: incluir e retirar custam O(log V + tamanho_bloco)
+    em vez do O(V) de uma lista única.
+    """
+
+    def __init__(self, tamanho_bloco: int = 256):
+        self.tamanho_bloco = tamanho_bloco
+        self._blocos: List[List[str]] = []
+        self._maximos: List[str] = []
+        self._tamanho = 0
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def adicionar(self, termo: str):
+        if not self._blocos:
+            self._blocos.append([termo])
+            self._maximos.append(termo)
+            self._tamanho = 1
+            return
+        i = min(bisect_left(self._maximos, termo), len(self._blocos) - 1)
+        bloco = self._blocos[i]
+        j = bisect_left(bloco, termo)
+        if j < len(bloco) and bloco[j] == termo:
+            return
+        bloco.insert(j, termo)
+        self._maximos[i] = bloco[-1]
+        self._tamanho += 1
+        if len(bloco) > 2 * self.tamanho_bloco:
+            metade = len(bloco) // 2
+            self._blocos[i:i + 1] = [bloco[:metade], bloco[metade:]]
+            self._maximos[i:i + 1] = [bloco[metade - 1], bloco[-1]]
+
+    def remover(self, termo: str):
+        i = bisect_left(self._maximos, termo)
+        if i == len(self._blocos):
+            return
+        bloco = self._blocos[i]
+        j = bisect_left(bloco, termo)
+        if bloco[j] != termo:
+            return
+        del bloco[j]
+        self._tamanho -= 1
+        if bloco:
+            self._maximos[i] = bloco[-1]
+        else:
+            del self._blocos[i], self._maximos[i]
+
+    def a_partir(self, termo: str) -> Iterator[str]:
+        """Termos >= `termo`, em ordem"""
+        i = bisect_left(self._maximos, termo)
+        if i == len(self._blocos):
+            return
+        bloco = self._blocos[i]
+        yield from bloco[bisect_left(bloco, termo):]
+        for bloco in self._blocos[i + 1:]:
+            yield from bloco
+
+    def limpar(self):
+        self._blocos.clear()
+        self._maximos.clear()
+        self._tamanho = 0
+
+
+class IndiceInvertido:
+    """
+    Índice invertido (termo -> ids) mantido a cada inclusão e remoção. Uma
+    consulta intersecta os termos começando pelo mais raro; o último termo
+    também casa por prefixo ("vp" encontra "vpn"), pelo vocabulário ordenado.
+    """
+
+    def __init__(self):
+        self._postagens: Dict[str, Set[str]] = {}
+        # Vocabulário ordenado para a busca por prefixo: os mesmos termos de _postagens
+        self._vocabulario = _VocabularioOrdenado()
+
+    def __len__(self) -> int:
+        return len(self._postagens)
+
+    def adicionar(self, id_documento: str, *textos: str):
+        for texto in textos:
+            for termo in termos(texto):
+                postagens = self._postagens.get(termo)
+                if postagens is None:
+                    postagens = self._postagens[termo] = set()
+                    self._vocabulario.adicionar(termo)
+                postagens.add(id_documento)
+
+    def remover(self, id_documento: str, *textos: str):
+        """Remove o documento; `textos` devem ser os mesmos passados a adicionar"""
+        for texto in textos:
+            for termo in termos(texto):
+                postagens = self._postagens.get(termo)
+                if postagens is not None:
+                    postagens.discard(id_documento)
+                    if not postagens:
+                        del self._postagens[termo]
+                        self._vocabulario.remover(termo)
+
+    def limpar(self):
+        self._postagens.clear()
+        self._vocabulario.limpar()
+
+    def _com_prefixo(self, prefixo: str) -> List[Set[str]]:
+        conjuntos = []
+        for termo in self._vocabulario.a_partir(prefixo):
+            if not termo.startswith(prefixo):
+                break
+            conjuntos.append(self._postagens[termo])
+        return conjuntos
+
+    def buscar(self, consulta: str) -> Set[str]:
+        """Ids que contêm todos os termos da consulta (o último, como prefixo)"""
+        palavras = _PALAVRA.findall(normalizar(consulta))
+        if not palavras:
+            return set()
+        exatos = []
+        for palavra in set(palavras[:-1]):
+            postagens = self._postagens.get(palavra)
+            if not postagens:
+                return set()
+            exatos.append(postagens)
+        por_prefixo = self._com_prefixo(palavras[-1])
+        if not por_prefixo:
+            return set()
+
+        # Começa pelo conjunto menor: a união das postagens do prefixo ou o termo exato mais raro
+        exatos.sort(key=len)
+        tamanho_prefixo = sum(len(p) for p in por_prefixo)
+        if not exatos or tamanho_prefixo <= len(exatos[0]):
+            resultado = set(por_prefixo[0]) if len(por_prefixo) == 1 else set().union(*por_prefixo)
+            for postagens in exatos:
+                resultado &= postagens
+                if not resultado:
+                    break
+            return resultado
+        resultado = exatos[0] & exatos[1] if len(exatos) > 1 else set(exatos[0])
+        for postagens in exatos[2:]:
+            if not resultado:
+                return resultado
+            resultado &= postagens
+        # Filtra os candidatos pelo prefixo, ou une as postagens do prefixo, o que for menor
+        if len(resultado) * len(por_prefixo) <= tamanho_prefixo:
+            return {d for d in resultado if any(d in p for p in por_prefixo)}
+        return resultado & set().union(*por_prefixo)
@@ -0,0 +1,363 @@
+"""
+Gerador de carga de ponta a ponta contra o servidor real (HTTP e Socket.IO).
+
+Dispara, com chegadas de Poisson na taxa pedida e na proporção de `--mix`,
+POST /api/chamados, POST /api/chamados/proximo, POST /api/chamados/<id>/finalizar
+e os eventos Socket.IO novo_chamado e finalizar_chamado, enquanto N painéis
+simulados escutam atualizar_fila. Informa a vazão, a latência de cada mutação e,
+para cada painel, o tempo entre a mutação e a atualização que a mostra.
+
+    python carga.py --servidor --paineis 20 --taxa 50 --duracao 30
+    python carga.py --url http://localhost:5000 --mix novo_http=1,proximo=1,finalizar_http=1
+
+Requer: pip install "python-socketio[client]"
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+import socketio
+
+OPERACOES = ("novo_http", "novo_socket", "proximo", "finalizar_http", "finalizar_socket")
+MIX_PADRAO = "novo_http=0.25,novo_socket=0.1,proximo=0.35,finalizar_http=0.2,finalizar_socket=0.1"
+TIPOS_CHAMADO = ("Server down", "Impacta produção", "Sem impacto", "Dúvida")
+TIPOS_CLIENTE = ("Prioritário", "Sem prioridade", "Demonstração")
+TIMEOUT = 10  # segundos por requisição ou ack
+ESPERA_FINAL = 2.0  # segundos para as últimas atualizações chegarem aos painéis
+
+
+def _percentis(valores: List[float]) -> dict:
+    """n, p50, p90, p99 e máximo, em ms"""
+    if not valores:
+        return {"n": 0}
+    ordenados = sorted(valores)
+
+    def p(q):
+        return round(ordenados[min(len(ordenados) - 1, int(q * len(ordenados)))] * 1000, 3)
+    return {"n": len(ordenados), "p50_ms": p(0.5), "p90_ms": p(0.9), "p99_ms": p(0.99),
+            "max_ms": round(ordenados[-1] * 1000, 3)}
+
+
+class Painel:
+    """
+    Dashboard simulado: um cliente Socket.IO que escuta atualizar_fila e anota
+    quando viu cada chamado entrar nos ativos, entrar em atendimento e sair
+    dos ativos (diferença entre estados consecutivos).
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.cliente = socketio.Client(reconnection=False)
+        self.cliente.on("atualizar_fila", self._atualizar)
+        self.atualizacoes = 0
+        # (evento, id) -> instante em que o painel viu o efeito; evento: novo, proximo ou finalizar
+        self.vistos: Dict[Tuple[str, str], float] = {}
+        self._ativos: Optional[set] = None
+        self._atendimento: set = set()
+
+    def conectar(self):
+        self.cliente.connect(self.url, wait_timeout=TIMEOUT)
+
+    def _atualizar(self, estado: dict):
+        agora = time.perf_counter()
+        self.atualizacoes += 1
+        atendimento = {c["id"] for c in estado.get("chamados_em_atendimento", ())}
+        if "chamados_ativos" in estado:
+            ativos = {c["id"] for c in estado["chamados_ativos"]}
+        else:  # estado enviado na conexão
+            ativos = atendimento | {c["id"] for c in estado.get("fila", ())}
+        if self._ativos is not None:
+            for id_chamado in ativos - self._ativos:
+                self.vistos.setdefault(("novo", id_chamado), agora)
+            for id_chamado in self._ativos - ativos:
+                self.vistos.setdefault(("finalizar", id_chamado), agora)
+            for id_chamado in atendimento - self._atendimento:
+                self.vistos.setdefault(("proximo", id_chamado), agora)
+        self._ativos, self._atendimento = ativos, atendimento
+
+
+class GeradorCarga:
+    def __init__(self, url: str, mix: Dict[str, float], taxa: float, duracao: float,
+                 paineis: int, trabalhadores: int, semente: int = 42):
+        self.url = url.rstrip("/")
+        self.mix = mix
+        self.taxa = taxa
+        self.duracao = duracao
+        self.paineis = [Painel(self.url) for _ in range(paineis)]
+        self.trabalhadores = trabalhadores
+        self.sorteio = random.Random(semente)
+        self._local = threading.local()
+        self._produtores: List[socketio.Client] = []
+        self._lock = threading.Lock()
+        self._sequencia = 0
+        # Chamados que /proximo pôs em atendimento: alvos de finalizar
+        self._em_atendimento: deque = deque()
+        # (evento, id) -> instante de envio da mutação que deu certo
+        self.enviados: Dict[Tuple[str, str], float] = {}
+        self.latencias: Dict[str, List[float]] = {op: [] for op in OPERACOES}
+        self.contagens: Dict[str, Dict[str, int]] = {op: {"ok": 0, "erro": 0, "ignorada": 0, "recusada": 0}
+                                                     for op in OPERACOES}
+        # Erros de cada operação por causa: "HTTP <status>" ou o nome da exceção
+        self.erros: Dict[str, Counter] = {op: Counter() for op in OPERACOES}
+
+    def _sessao(self) -> requests.Session:
+        sessao = getattr(self._local, "sessao", None)
+        if sessao is None:
+            sessao = self._local.sessao = requests.Session()
+        return sessao
+
+    def _produtor(self) -> socketio.Client:
+        """Cliente Socket.IO da thread, para os eventos de mutação (com ack)"""
+        cliente = getattr(self._local, "produtor", None)
+        if cliente is None:
+            cliente = self._local.produtor = socketio.Client(reconnection=False)
+            cliente.connect(self.url, wait_timeout=TIMEOUT)
+            with self._lock:
+                self._produtores.append(cliente)
+        return cliente
+
+    def _novo_chamado(self) -> dict:
+        with self._lock:
+            self._sequencia += 1
+            n = self._sequencia
+        # Um cliente por chamado: nenhum é agrupado como duplicado e todos aparecem nos painéis
+        return {
+            "id_chamado": f"CARGA-{os.getpid()}-{n}",
+            "cliente_nome": f"Carga {n}",
+            "tipo_cliente": self.sorteio.choice(TIPOS_CLIENTE),
+            "tipo_chamado": self.sorteio.choice(TIPOS_CHAMADO),
+            "descricao": f"Chamado de carga {n}"
+        }
+
+    def _contar(self, operacao: str, resultado: str):
+        with self._lock:
+            self.contagens[operacao][resultado] += 1
+
+    def _contar_erro(self, operacao: str, erro: Exception):
+        resposta = getattr(erro, "response", None)
+        causa = f"HTTP {resposta.status_code}" if resposta is not None else type(erro).__name__
+        with self._lock:
+            self.contagens[operacao]["erro"] += 1
+            self.erros[operacao][causa] += 1
+
+    def _executar(self, operacao: str, previsto: float):
+        """Executa uma mutação; a latência conta desde o instante previsto (inclui a fila local)"""
+        try:
+            if operacao.startswith("novo"):
+                dados = self._novo_chamado()
+                evento, id_chamado = "novo", dados["id_chamado"]
+                enviado = time.perf_counter()
+                if operacao == "novo_http":
+                    resposta = self._sessao().post(f"{self.url}/api/chamados", json=dados, timeout=TIMEOUT)
+                    if resposta.status_code == 429:
+                        self._contar(operacao, "recusada")  # controle de admissão
+                        return
+                    resposta.raise_for_status()
+                elif self._produtor().call("novo_chamado", dados, timeout=TIMEOUT):
+                    self._contar(operacao, "recusada")  # o ack só vem com a recusa
+                    return
+            elif operacao == "proximo":
+                evento = "proximo"
+                enviado = time.perf_counter()
+                resposta = self._sessao().post(f"{self.url}/api/chamados/proximo", timeout=TIMEOUT)
+                if resposta.status_code == 404:
+                    self._contar(operacao, "ignorada")  # fila vazia
+                    return
+                resposta.raise_for_status()
+                id_chamado = resposta.json()["id"]
+                self._em_atendimento.append(id_chamado)
+            else:
+                evento = "finalizar"
+                try:
+                    id_chamado = self._em_atendimento.popleft()
+                except IndexError:
+                    self._contar(operacao, "ignorada")  # nada em atendimento
+                    return
+                enviado = time.perf_counter()
+                if operacao == "finalizar_http":
+                    resposta = self._sessao().post(
+                        f"{self.url}/api/chamados/{id_chamado}/finalizar", timeout=TIMEOUT)
+                    resposta.raise_for_status()
+                else:
+                    self._produtor().call("finalizar_chamado", {"id_chamado": id_chamado}, timeout=TIMEOUT)
+        except Exception as e:
+            self._contar_erro(operacao, e)
+            return
+        self.latencias[operacao].append(time.perf_counter() - previsto)
+        self._contar(operacao, "ok")
+        self.enviados[(evento, id_chamado)] = enviado
+
+    def executar(self) -> dict:
+        for painel in self.paineis:
+            painel.conectar()
+        operacoes = list(self.mix)
+        pesos = [self.mix[op] for op in operacoes]
+        # Chegadas em malha aberta: o ritmo não depende das respostas (sem omissão coordenada)
+        with ThreadPoolExecutor(self.trabalhadores) as executor:
+            inicio = previsto = time.perf_counter()
+            fim = inicio + self.duracao
+            while True:
+                previsto += self.sorteio.expovariate(self.taxa)
+                if previsto >= fim:
+                    break
+                espera = previsto - time.perf_counter()
+                if espera > 0:
+                    time.sleep(espera)
+                executor.submit(self._executar, self.sorteio.choices(operacoes, pesos)[0], previsto)
+        decorrido = time.perf_counter() - inicio
+        time.sleep(ESPERA_FINAL)
+        for cliente in [painel.cliente for painel in self.paineis] + self._produtores:
+            try:
+                cliente.disconnect()
+            except Exception:
+                pass
+        return self.relatorio(decorrido)
+
+    def relatorio(self, decorrido: float) -> dict:
+        atrasos: List[float] = []
+        por_painel = []
+        perdidas = 0
+        for painel in self.paineis:
+            proprios = []
+            for chave, enviado in self.enviados.items():
+                visto = painel.vistos.get(chave)
+                if visto is None:
+                    perdidas += 1
+                else:
+                    proprios.append(max(0.0, visto - enviado))
+            atrasos.extend(proprios)
+            por_painel.append(dict(_percentis(proprios), atualizacoes=painel.atualizacoes))
+        total_ok = sum(c["ok"] for c in self.contagens.values())
+        p99s = sorted(p["p99_ms"] for p in por_painel if p["n"])
+        return {
+            "duracao_s": round(decorrido, 3),
+            "taxa_pedida": self.taxa,
+            "vazao_por_s": round(total_ok / decorrido, 2),
+            "operacoes": {
+                op: dict(self.contagens[op], erros_por_causa=dict(self.erros[op].most_common()),
+                         **_percentis(self.latencias[op]))
+                for op in OPERACOES if op in self.mix
+            },
+            "atualizacao": dict(
+                _percentis(atrasos),
+                paineis=len(self.paineis),
+                nao_recebidas=perdidas,
+                p99_por_painel_ms={"min": p99s[0], "mediana": p99s[len(p99s) // 2], "max": p99s[-1]}
+                if p99s else None
+            ),
+            "paineis": por_painel
+        }
+
+
+def formatar(relatorio: dict) -> str:
+    linhas = [f"Duração: {relatorio['duracao_s']:.1f} s; vazão: {relatorio['vazao_por_s']} mutações/s "
+              f"(pedido: {relatorio['taxa_pedida']}/s)", "",
+              f"{'operação':<18}{'ok':>7}{'erro':>7}{'ignor.':>8}{'recus.':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'máx ms':>10}"]
+    for op, r in relatorio["operacoes"].items():
+        linhas.append(f"{op:<18}{r['ok']:>7}{r['erro']:>7}{r['ignorada']:>8}{r['recusada']:>8}" + "".join(
+            f"{r[c]:>10.1f}" if c in r else f"{'-':>10}" for c in ("p50_ms", "p90_ms", "p99_ms", "max_ms")))
+    for op, r in relatorio["operacoes"].items():
+        if r["erros_por_causa"]:
+            linhas.append(f"  erros em {op}: " + ", ".join(f"{causa} x{n}" for causa, n in r["erros_por_causa"].items()))
+    a = relatorio["atualizacao"]
+    linhas.append("")
+    if a["n"]:
+        linhas.append(f"Mutação -> atualizar_fila em {a['paineis']} painéis: p50 {a['p50_ms']:.1f} ms, "
+                      f"p90 {a['p90_ms']:.1f} ms, p99 {a['p99_ms']:.1f} ms, máx {a['max_ms']:.1f} ms "
+                      f"({a['nao_recebidas']} não recebidas)")
+        p = a["p99_por_painel_ms"]
+        linhas.append(f"p99 por painel: melhor {p['min']:.1f} ms, mediano {p['mediana']:.1f} ms, "
+                      f"pior {p['max']:.1f} ms")
+    else:
+        linhas.append("Nenhuma atualização medida nos painéis")
+    return "\n".join(linhas)
+
+
+def _porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def iniciar_servidor(porta: int) -> Tuple[subprocess.Popen, str]:
+    """
+    Sobe o servidor real (Sistema_Chamadas.iniciar_sistema) num processo à parte,
+    sem debug e num diretório temporário: journal, banco e log da carga não se
+    misturam aos de verdade.
+    """
+    diretorio = tempfile.mkdtemp(prefix="carga_")
+    codigo = ("import Sistema_Chamadas as s; s.DEBUG = False; "
+              f"s.iniciar_sistema(host='127.0.0.1', port={porta}, allow_unsafe_werkzeug=True)")
+    ambiente = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    saida = open(os.path.join(diretorio, "servidor.out"), "wb")
+    processo = subprocess.Popen([sys.executable, "-c", codigo], cwd=diretorio, env=ambiente,
+                                stdout=saida, stderr=subprocess.STDOUT)
+    url = f"http://127.0.0.1:{porta}"
+    limite = time.monotonic() + 30
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError(f"servidor terminou ao iniciar; veja {saida.name}")
+        try:
+            requests.get(f"{url}/api/stats", timeout=1)
+            return processo, diretorio
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    processo.terminate()
+    raise RuntimeError("servidor não respondeu em 30 s")
+
+
+def _mix(texto: str) -> Dict[str, float]:
+    mix = {}
+    for parte in texto.split(","):
+        nome, _, peso = parte.partition("=")
+        if nome not in OPERACOES:
+            raise argparse.ArgumentTypeError(f"operação desconhecida: {nome} (use {', '.join(OPERACOES)})")
+        mix[nome] = float(peso or 1)
+    return {nome: peso for nome, peso in mix.items() if peso > 0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carga de ponta a ponta (HTTP e Socket.IO)")
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--servidor", action="store_true",
+                        help="sobe o servidor real num processo à parte (ignora --url)")
+    parser.add_argument("--taxa", type=float, default=20, help="mutações por segundo (Poisson)")
+    parser.add_argument("--duracao", type=float, default=30, help="segundos")
+    parser.add_argument("--paineis", type=int, default=10, help="clientes escutando atualizar_fila")
+    parser.add_argument("--trabalhadores", type=int, default=16, help="threads que disparam as mutações")
+    parser.add_argument("--mix", type=_mix, default=_mix(MIX_PADRAO), help=f"padrão: {MIX_PADRAO}")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="relatório em JSON")
+    args = parser.parse_args(argv)
+
+    processo = None
+    url = args.url
+    if args.servidor:
+        porta = _porta_livre()
+        processo, diretorio = iniciar_servidor(porta)
+        url = f"http://127.0.0.1:{porta}"
+        print(f"Servidor em {url} (arquivos em {diretorio})", file=sys.stderr)
+    try:
+        gerador = GeradorCarga(url, args.mix, args.taxa, args.duracao, args.paineis,
+                               args.trabalhadores, args.semente)
+        relatorio = gerador.executar()
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait(timeout=10)
+    print(json.dumps(relatorio, ensure_ascii=False, indent=1) if args.json else formatar(relatorio))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+QUANTIS = (0.5, 0.9, 0.99)
+
+
+class QuantilP2:
+    """
+    Estimativa de um quantil em fluxo pelo algoritmo P² (Jain & Chlamtac, 1985):
+    guarda só cinco marcadores e atualiza em O(1), sem armazenar as amostras.
+    """
+
+    def __init__(self, p: float):
+        self.p = p
+        self._alturas: List[float] = []
+        self._posicoes = [1, 2, 3, 4, 5]
+        self._desejadas = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self._incrementos = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def adicionar(self, x: float):
+        q = self._alturas
+        if len(q) < 5:
+            q.append(x)
+            if len(q) == 5:
+                q.sort()
+            return
+
+        n = self._posicoes
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        desejadas = self._desejadas
+        for i in range(5):
+            desejadas[i] += self._incrementos[i]
+
+        # Ajusta os marcadores centrais que se afastaram da posição desejada
+        for i in (1, 2, 3):
+            d = desejadas[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                parabolica = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if q[i - 1] < parabolica < q[i + 1]:
+                    q[i] = parabolica
+                else:
+                    q[i] += s * (q[i + s] - q[i]) / (n[i + s] - n[i])
+                n[i] += s
+
+    def estado(self) -> tuple:
+        return (list(self._alturas), list(self._posicoes), list(self._desejadas))
+
+    @classmethod
+    def de_estado(cls, p: float, estado: tuple) -> "QuantilP2":
+        quantil = cls(p)
+        quantil._alturas, quantil._posicoes, quantil._desejadas = (list(v) for v in estado)
+        return quantil
+
+    def valor(self) -> Optional[float]:
+        q = self._alturas
+        if not q:
+            return None
+        if len(q) < 5:
+            amostras = sorted(q)
+            return amostras[min(len(amostras) - 1, math.ceil(self.p * len(amostras)) - 1)]
+        return q[2]
+
+
+class DistribuicaoTempo:
+    """Contagem, média, máximo e quantis (P²) de uma duração em segundos"""
+
+    def __init__(self, quantis: Iterable[float] = QUANTIS):
+        self.total = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+        self._quantis = [QuantilP2(p) for p in quantis]
+
+    def adicionar(self, segundos: float):
+        self.total += 1
+        self.soma += segundos
+        if segundos > self.maximo:
+            self.maximo = segundos
+        for quantil in self._quantis:
+            quantil.adicionar(segundos)
+
+    def resumo(self) -> dict:
+        dados = {
+            "n": self.total,
+            "media": round(self.soma / self.total, 3) if self.total else None,
+            "max": round(self.maximo, 3) if self.total else None
+        }
+        for quantil in self._quantis:
+            valor = quantil.valor()
+            dados[f"p{quantil.p * 100:g}"] = round(valor, 3) if valor is not None else None
+        return dados
+
+
+class TaxaPorMinuto:
+    """Eventos nos últimos 60 segundos, em 60 compartimentos de um segundo"""
+
+    def __init__(self):
+        self._contagens = [0] * 60
+        self._segundos = [-1] * 60
+
+    def registrar(self, instante: float):
+        segundo = int(instante)
+        i = segundo % 60
+        if self._segundos[i] != segundo:
+            self._segundos[i] = segundo
+            self._contagens[i] = 0
+        self._contagens[i] += 1
+
+    def valor(self, agora: float) -> int:
+        limite = int(agora) - 60
+        return sum(c for c, s in zip(self._contagens, self._segundos) if s > limite)
+
+
+class EstatisticasChamados:
+    """
+    Estatísticas do SistemaChamados mantidas a cada transição de status, em
+    O(1): profundidade da fila por tipo de chamado e de cliente, chamados em
+    atendimento, tempos de espera e de atendimento, chegadas e resoluções
+    por minuto.
+    """
+
+    def __init__(self, tipos_chamado: Iterable[str], tipos_cliente: Iterable[str]):
+        self._tipos_chamado = list(tipos_chamado)
+        self._tipos_cliente = list(tipos_cliente)
+        self.fila_por_tipo_chamado: Dict[str, int] = dict.fromkeys(self._tipos_chamado, 0)
+        self.fila_por_tipo_cliente: Dict[str, int] = dict.fromkeys(self._tipos_cliente, 0)
+        self.em_atendimento = 0
+        self.espera = DistribuicaoTempo()
+        self.atendimento = DistribuicaoTempo()
+        self.chegadas = TaxaPorMinuto()
+        self.resolucoes = TaxaPorMinuto()
+        self.total_chegadas = 0
+        self.total_resolvidos = 0
+        self.violacoes_sla = 0
+        self.duplicados_agrupados = 0
+        self.interrompidos = 0
+
+    def chegada(self, tipo_chamado: str, tipo_cliente: str, instante: float):
+        self.fila_por_tipo_chamado[tipo_chamado] += 1
+        self.fila_por_tipo_cliente[tipo_cliente] += 1
+        self.chegadas.registrar(instante)
+        self.total_chegadas += 1
+
+    def inicio_atendimento(self, tipo_chamado: str, tipo_cliente: str, espera: Optional[float]):
+        """`espera` só no primeiro início; None quando um chamado devolvido à fila volta a ser atendido"""
+        self.fila_por_tipo_chamado[tipo_chamado] -= 1
+        self.fila_por_tipo_cliente[tipo_cliente] -= 1
+        self.em_atendimento += 1
+        if espera is not None:
+            self.espera.adicionar(espera)
+
+    def retorno_fila(self, tipo_chamado: str, tipo_cliente: str):
+        self.fila_por_tipo_chamado[tipo_chamado] += 1
+        self.fila_por_tipo_cliente[tipo_cliente] += 1
+        self.em_atendimento -= 1
+
+    def resolucao(self, instante: float, atendimento: Optional[float]):
+        self.em_atendimento -= 1
+        self.resolucoes.registrar(instante)
+        self.total_resolvidos += 1
+        if atendimento is not None:
+            self.atendimento.adicionar(atendimento)
+
+    def violacao_sla(self):
+        self.violacoes_sla += 1
+
+    def duplicado(self):
+        self.duplicados_agrupados += 1
+
+    def interrupcao(self):
+        self.interrompidos += 1
+
+    def reconstruir(self, pendentes: Iterable[Tuple[str, str]], em_atendimento: int):
+        """Recalcula os contadores a partir do estado (após carregar um snapshot)"""
+        self.fila_por_tipo_chamado = dict.fromkeys(self._tipos_chamado, 0)
+        self.fila_por_tipo_cliente = dict.fromkeys(self._tipos_cliente, 0)
+        for tipo_chamado, tipo_cliente in pendentes:
+            self.fila_por_tipo_chamado[tipo_chamado] += 1
+            self.fila_por_tipo_cliente[tipo_cliente] += 1
+        self.em_atendimento = em_atendimento
+
+    def resumo(self, agora: float) -> dict:
+        return {
+            "fila": sum(self.fila_por_tipo_chamado.values()),
+            "fila_por_tipo_chamado": dict(self.fila_por_tipo_chamado),
+            "fila_por_tipo_cliente": dict(self.fila_por_tipo_cliente),
+            "em_atendimento": self.em_atendimento,
+            "espera_s": self.espera.resumo(),
+            "atendimento_s": self.atendimento.resumo(),
+            "chegadas_por_minuto": self.chegadas.valor(agora),
+            "resolucoes_por_minuto": self.resolucoes.valor(agora),
+            "total_chegadas": self.total_chegadas,
+            "total_resolvidos": self.total_resolvidos,
+            "violacoes_sla": self.violacoes_sla,
+            "duplicados_agrupados": self.duplicados_agrupados,
+            "chamados_interrompidos": self.interrompidos
+        }
@@ -0,0 +1,147 @@
+import argparse
+import csv
+import gzip
+import io
+import os
+import sys
+import time
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+from repositorio import COLUNAS, INSTANTES, FormatadorInstantes, RepositorioSQLite
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # formato colunar é opcional
+    pa = pc = pq = None
+
+# Colunas com instantes (epoch no repositório; na exportação, sempre em UTC: ISO 8601 com "Z"
+# no CSV e timestamp com fuso UTC no Parquet, para os dois formatos darem o mesmo instante)
+_INSTANTES = tuple(COLUNAS.index(c) for c in INSTANTES)
+TAMANHO_BLOCO = 1 << 16  # bytes de CSV por bloco entregue
+LINHAS_POR_GRUPO = 1 << 17  # linhas por row group no Parquet
+
+
+def blocos_csv(registros: Iterable[tuple], tamanho_bloco: int = TAMANHO_BLOCO) -> Iterator[str]:
+    """Gera o CSV (com cabeçalho) em blocos de ~tamanho_bloco caracteres"""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, lineterminator="\n")
+    escritor.writerow(COLUNAS)
+    iso = FormatadorInstantes()
+    criado, inicio, resolvido = _INSTANTES
+    for registro in registros:
+        linha = list(registro)
+        linha[criado] = iso(linha[criado])
+        linha[inicio] = iso(linha[inicio])
+        linha[resolvido] = iso(linha[resolvido])
+        escritor.writerow(linha)
+        if buffer.tell() >= tamanho_bloco:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def blocos_gzip(blocos: Iterable[str], nivel: int = 6) -> Iterator[bytes]:
+    """Comprime em gzip, bloco a bloco, sem montar o arquivo em memória"""
+    compressor = zlib.compressobj(nivel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for bloco in blocos:
+        comprimido = compressor.compress(bloco.encode("utf-8"))
+        if comprimido:
+            yield comprimido
+    yield compressor.flush()
+
+
+def exportar_csv(registros: Iterable[tuple], destino: str) -> int:
+    """Grava em CSV (gzip se `destino` terminar em .gz); retorna o número de chamados"""
+    total = 0
+
+    def contar():
+        nonlocal total
+        for registro in registros:
+            total += 1
+            yield registro
+
+    abrir = gzip.open if destino.endswith(".gz") else open
+    with abrir(destino, "wt", encoding="utf-8", newline="") as arquivo:
+        for bloco in blocos_csv(contar()):
+            arquivo.write(bloco)
+    return total
+
+
+def exportar_parquet(registros: Iterable[tuple], destino: str, compressao: str = "zstd",
+                     linhas_por_grupo: int = LINHAS_POR_GRUPO) -> int:
+    """Grava em Parquet, um row group a cada `linhas_por_grupo` chamados; requer pyarrow"""
+    if pa is None:
+        raise RuntimeError("Exportação em Parquet requer o pacote pyarrow (pip install pyarrow)")
+    tipos = {c: pa.string() for c in COLUNAS}
+    tipos["prioridade_manual"] = pa.int64()
+    tipos["ocorrencias"] = pa.int64()
+    for i in _INSTANTES:
+        tipos[COLUNAS[i]] = pa.timestamp("ms", tz="UTC")
+    esquema = pa.schema(list(tipos.items()))
+    colunas = [[] for _ in COLUNAS]
+    total = 0
+
+    def montar_grupo() -> "pa.Table":
+        arrays = []
+        for i, valores in enumerate(colunas):
+            if i in _INSTANTES:
+                milissegundos = pc.multiply(pa.array(valores, type=pa.float64()), 1000)
+                array = pc.cast(milissegundos, pa.int64(), safe=False).cast(esquema.field(i).type)
+            else:
+                array = pa.array(valores, type=esquema.field(i).type)
+            arrays.append(array)
+            valores.clear()
+        return pa.Table.from_arrays(arrays, schema=esquema)
+
+    with pq.ParquetWriter(destino, esquema, compression=compressao) as escritor:
+        for registro in registros:
+            for valores, valor in zip(colunas, registro):
+                valores.append(valor)
+            total += 1
+            if total % linhas_por_grupo == 0:
+                escritor.write_table(montar_grupo())
+        if colunas[0]:
+            escritor.write_table(montar_grupo())
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta o histórico de chamados")
+    parser.add_argument("destino", help="arquivo de saída (.csv, .csv.gz ou .parquet)")
+    parser.add_argument("--banco", default="dados/chamados.db")
+    parser.add_argument("--formato", choices=("csv", "parquet"),
+                        help="padrão: deduzido da extensão do destino")
+    parser.add_argument("--compressao", default="zstd", help="codec do Parquet")
+    for nome in ("status", "tipo_chamado", "tipo_cliente", "cliente", "agente"):
+        parser.add_argument(f"--{nome.replace('_', '-')}", dest=nome)
+    parser.add_argument("--desde", type=datetime.fromisoformat)
+    parser.add_argument("--ate", type=datetime.fromisoformat)
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.banco):
+        parser.error(f"banco {args.banco} não encontrado")
+
+    formato = args.formato or ("parquet" if args.destino.endswith(".parquet") else "csv")
+    filtros = {nome: getattr(args, nome) for nome in
+               ("status", "tipo_chamado", "tipo_cliente", "cliente", "agente", "desde", "ate")}
+    repositorio = RepositorioSQLite(args.banco)
+    inicio = time.perf_counter()
+    try:
+        registros = repositorio.iterar(**filtros)
+        if formato == "parquet":
+            total = exportar_parquet(registros, args.destino, args.compressao)
+        else:
+            total = exportar_csv(registros, args.destino)
+    finally:
+        repositorio.fechar()
+    decorrido = time.perf_counter() - inicio
+    print(f"{total} chamados exportados para {args.destino} em {decorrido:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
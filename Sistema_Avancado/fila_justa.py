@@ -0,0 +1,47 @@
+from typing import Dict, Hashable, Tuple
+
+
+class FilaJusta:
+    """
+    Fila justa entre clientes (virtual clock), uma por classe de prioridade.
+    Cada chamado recebe um término virtual: começa no maior entre a sua chegada
+    e o término do chamado anterior do mesmo cliente ainda na fila, e dura
+    custo / peso. Atender em ordem de término equivale a manter uma subfila por
+    cliente e servir a de menor término na cabeça (os términos de um cliente só
+    crescem): quem inunda a classe empurra os próprios chamados para o futuro e
+    os demais seguem pela chegada. Os términos ficam no tempo real, então
+    continuam comparáveis entre chamados que equipes diferentes atendem.
+
+    Guarda só o último término dos clientes com chamado na fila; marcar e
+    retirar são O(1).
+    """
+
+    def __init__(self):
+        self._ultimos: Dict[Tuple[Hashable, Hashable], float] = {}
+
+    def __len__(self) -> int:
+        """Clientes (por classe) com chamado na fila"""
+        return len(self._ultimos)
+
+    def marcar(self, classe: Hashable, cliente: Hashable, chegada: float, custo: float, peso: float) -> float:
+        """Término virtual de um chamado do cliente que entra na classe"""
+        chave = (classe, cliente)
+        termino = max(chegada, self._ultimos.get(chave, chegada)) + custo / peso
+        self._ultimos[chave] = termino
+        return termino
+
+    def retirar(self, classe: Hashable, cliente: Hashable, termino: float):
+        """O chamado deixou a classe (começou a ser atendido ou foi escalado)"""
+        chave = (classe, cliente)
+        if self._ultimos.get(chave) == termino:
+            del self._ultimos[chave]  # era o último do cliente: o próximo parte da própria chegada
+
+    def limpar(self):
+        self._ultimos.clear()
+
+    def estado(self) -> list:
+        """Estado serializável (para o snapshot)"""
+        return [(*chave, termino) for chave, termino in self._ultimos.items()]
+
+    def carregar(self, estado: list):
+        self._ultimos = {(classe, cliente): termino for classe, cliente, termino in estado}
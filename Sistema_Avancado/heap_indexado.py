@@ -0,0 +1,93 @@
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+class HeapIndexado:
+    """
+    Min-heap binário em que cada item aparece uma só vez. A posição de cada
+    item fica num dicionário, então inserir, mudar a chave e remover um item
+    qualquer são O(log n), e consultar o menor é O(1).
+    """
+
+    def __init__(self):
+        self._heap: List[list] = []  # [chave, item]
+        self._posicoes: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._posicoes
+
+    def __iter__(self) -> Iterator[Tuple[object, Hashable]]:
+        """(chave, item) em ordem arbitrária"""
+        return (tuple(entrada) for entrada in self._heap)
+
+    def chave(self, item: Hashable) -> Optional[object]:
+        posicao = self._posicoes.get(item)
+        return None if posicao is None else self._heap[posicao][0]
+
+    def topo(self) -> Optional[Tuple[object, Hashable]]:
+        """(chave, item) de menor chave, sem remover"""
+        return tuple(self._heap[0]) if self._heap else None
+
+    def definir(self, item: Hashable, chave: object):
+        """Insere o item ou muda a sua chave"""
+        posicao = self._posicoes.get(item)
+        if posicao is None:
+            self._heap.append([chave, item])
+            self._posicoes[item] = len(self._heap) - 1
+            self._subir(len(self._heap) - 1)
+            return
+        anterior = self._heap[posicao][0]
+        self._heap[posicao][0] = chave
+        if chave < anterior:
+            self._subir(posicao)
+        else:
+            self._descer(posicao)
+
+    def remover(self, item: Hashable) -> bool:
+        posicao = self._posicoes.pop(item, None)
+        if posicao is None:
+            return False
+        ultima = self._heap.pop()
+        if posicao < len(self._heap):
+            self._heap[posicao] = ultima
+            self._posicoes[ultima[1]] = posicao
+            self._subir(posicao)
+            self._descer(self._posicoes[ultima[1]])
+        return True
+
+    def limpar(self):
+        self._heap.clear()
+        self._posicoes.clear()
+
+    def _subir(self, posicao: int):
+        heap, posicoes = self._heap, self._posicoes
+        entrada = heap[posicao]
+        while posicao > 0:
+            pai = (posicao - 1) >> 1
+            if not entrada[0] < heap[pai][0]:
+                break
+            heap[posicao] = heap[pai]
+            posicoes[heap[posicao][1]] = posicao
+            posicao = pai
+        heap[posicao] = entrada
+        posicoes[entrada[1]] = posicao
+
+    def _descer(self, posicao: int):
+        heap, posicoes = self._heap, self._posicoes
+        tamanho = len(heap)
+        entrada = heap[posicao]
+        while True:
+            filho = 2 * posicao + 1
+            if filho >= tamanho:
+                break
+            if filho + 1 < tamanho and heap[filho + 1][0] < heap[filho][0]:
+                filho += 1
+            if not heap[filho][0] < entrada[0]:
+                break
+            heap[posicao] = heap[filho]
+            posicoes[heap[posicao][1]] = posicao
+            posicao = filho
+        heap[posicao] = entrada
+        posicoes[entrada[1]] = posicao
@@ -0,0 +1,205 @@
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from typing import Iterator, List, Optional
+
+from log_estruturado import LogEstruturado
+
+MAGICO = b"SCJ1"
+# Cada registro: tamanho do conteúdo, CRC32 do conteúdo, conteúdo (pickle)
+_CABECALHO = struct.Struct("<II")
+_TAMANHO_LEITURA = 4 * 1024 * 1024
+
+
+class Journal:
+    """
+    Journal binário append-only dos eventos do SistemaChamados.
+
+    Os registros são acumulados em memória e gravados por uma thread em
+    segundo plano com "group commit": um único write + fsync quando o lote
+    atinge `lote` registros ou quando o registro mais antigo pendente
+    completa `latencia` segundos. Com `sincrono=True`, `aguardar()` bloqueia
+    até o lote que contém os registros já feitos estar em disco.
+
+    Um erro de escrita (disco cheio, volume desmontado) para o journal: ele é
+    guardado em `falha`, registrado em `log`, e `verificar()` e `aguardar()`
+    passam a levantar OSError em vez de esperar um lote que nunca chega.
+    """
+
+    def __init__(self, caminho: str, lote: int = 512, latencia: float = 0.005,
+                 sincrono: bool = False, fsync: bool = True, log: Optional[LogEstruturado] = None):
+        self.caminho = caminho
+        self.lote = lote
+        self.latencia = latencia
+        self.sincrono = sincrono
+        self.fsync = fsync
+        self.log = log
+        self.falha: Optional[OSError] = None
+        self._arquivo = open(caminho, "ab")
+        if self._arquivo.tell() == 0:
+            self._arquivo.write(MAGICO)
+            self._arquivo.flush()
+        self._pendentes: List[bytes] = []
+        self._primeiro_pendente = 0.0
+        self._registrados = 0
+        self._duraveis = 0
+        self._fechado = False
+        self._condicao = threading.Condition()
+        # Protege o arquivo atual entre retirar um lote e gravá-lo (ver rotacionar)
+        self._lock_arquivo = threading.Lock()
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+
+    def registrar(self, evento: tuple) -> int:
+        """Acrescenta um evento (tupla de tipos primitivos); retorna seu número de sequência"""
+        conteudo = pickle.dumps(evento, protocol=pickle.HIGHEST_PROTOCOL)
+        registro = _CABECALHO.pack(len(conteudo), zlib.crc32(conteudo)) + conteudo
+        with self._condicao:
+            if not self._pendentes:
+                self._primeiro_pendente = time.monotonic()
+            self._pendentes.append(registro)
+            self._registrados += 1
+            if len(self._pendentes) == 1 or len(self._pendentes) >= self.lote:
+                self._condicao.notify_all()
+            return self._registrados
+
+    def aguardar(self, sequencia: Optional[int] = None):
+        """Bloqueia até o evento `sequencia` (ou todos os já registrados) estar em disco"""
+        with self._condicao:
+            alvo = self._registrados if sequencia is None else sequencia
+            self._condicao.wait_for(lambda: self._duraveis >= alvo or self._fechado or self.falha is not None)
+        self.verificar()
+
+    def verificar(self):
+        """Levanta OSError se uma escrita do journal já falhou"""
+        if self.falha is not None:
+            raise OSError(f"journal {self.caminho} parado: {self.falha}") from self.falha
+
+    @property
+    def registrados(self) -> int:
+        return self._registrados
+
+    def rotacionar(self, novo_caminho: str):
+        """
+        Grava o que estiver pendente no arquivo atual e passa a escrever em
+        `novo_caminho`. Todo evento registrado antes da chamada fica no arquivo
+        antigo; todo evento registrado depois, no novo.
+        """
+        with self._lock_arquivo:
+            with self._condicao:
+                lote = self._pendentes
+                self._pendentes = []
+                sequencia = self._registrados
+            try:
+                self._gravar(lote)
+            except OSError as e:
+                self._falhar(e)
+                raise
+            self._arquivo.close()
+            self.caminho = novo_caminho
+            self._arquivo = open(novo_caminho, "ab")
+            if self._arquivo.tell() == 0:
+                self._arquivo.write(MAGICO)
+                self._arquivo.flush()
+            with self._condicao:
+                self._duraveis = max(self._duraveis, sequencia)
+                self._condicao.notify_all()
+
+    def fechar(self):
+        with self._condicao:
+            self._fechado = True
+            self._condicao.notify_all()
+        self._thread.join()
+        self._arquivo.close()
+
+    def _gravar(self, lote: List[bytes]):
+        if not lote:
+            return
+        self._arquivo.write(b"".join(lote))
+        self._arquivo.flush()
+        if self.fsync:
+            os.fsync(self._arquivo.fileno())
+
+    def _executar(self):
+        while True:
+            with self._condicao:
+                while True:
+                    if self._pendentes and (self._fechado or len(self._pendentes) >= self.lote):
+                        break
+                    if not self._pendentes:
+                        if self._fechado:
+                            return
+                        self._condicao.wait()
+                        continue
+                    restante = self._primeiro_pendente + self.latencia - time.monotonic()
+                    if restante <= 0:
+                        break
+                    self._condicao.wait(restante)
+
+            with self._lock_arquivo:
+                with self._condicao:
+                    lote = self._pendentes
+                    self._pendentes = []
+                    sequencia = self._registrados
+                try:
+                    self._gravar(lote)
+                except OSError as e:
+                    self._falhar(e)
+                    return
+
+            with self._condicao:
+                self._duraveis = max(self._duraveis, sequencia)
+                self._condicao.notify_all()
+
+    def _falhar(self, erro: OSError):
+        """Guarda o erro e solta quem espera em aguardar()"""
+        if self.log is not None:
+            self.log.erro("erro_journal", "Falha ao gravar o journal %s: %s", self.caminho, erro)
+        with self._condicao:
+            self.falha = erro
+            self._condicao.notify_all()
+
+    @staticmethod
+    def ler(caminho: str, truncar_corrompido: bool = True) -> Iterator[tuple]:
+        """
+        Lê os eventos em ordem. Um registro final incompleto ou com CRC
+        inválido (queda no meio de uma escrita) encerra a leitura e, se
+        `truncar_corrompido`, é removido do arquivo.
+        """
+        if not os.path.exists(caminho):
+            return
+        valido_ate = len(MAGICO)
+        with open(caminho, "rb") as arquivo:
+            if arquivo.read(len(MAGICO)) != MAGICO:
+                raise ValueError(f"{caminho} não é um journal válido")
+            buffer = b""
+            posicao = 0
+            corrompido = False
+            while not corrompido:
+                bloco = arquivo.read(_TAMANHO_LEITURA)
+                if not bloco:
+                    break
+                buffer = buffer[posicao:] + bloco
+                posicao = 0
+                visao = memoryview(buffer)
+                tamanho_cabecalho = _CABECALHO.size
+                while len(buffer) - posicao >= tamanho_cabecalho:
+                    tamanho, crc = _CABECALHO.unpack_from(buffer, posicao)
+                    fim = posicao + tamanho_cabecalho + tamanho
+                    if fim > len(buffer):
+                        break
+                    conteudo = visao[posicao + tamanho_cabecalho:fim]
+                    if zlib.crc32(conteudo) != crc:
+                        corrompido = True
+                        break
+                    yield pickle.loads(conteudo)
+                    valido_ate += fim - posicao
+                    posicao = fim
+                visao.release()
+
+        if truncar_corrompido and valido_ate < os.path.getsize(caminho):
+            with open(caminho, "r+b") as arquivo:
+                arquivo.truncate(valido_ate)
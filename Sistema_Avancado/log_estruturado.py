@@ -0,0 +1,198 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
+# Chaves de toda linha; um campo do chamador com o mesmo nome é gravado como campo_<nome>
+_CHAVES_FIXAS = frozenset(("ts", "nivel", "evento", "mensagem"))
+
+
+class LogEstruturado:
+    """
+    Log de eventos em linhas JSON, gravado por uma thread em segundo plano.
+
+    Quem registra só coloca uma tupla (instante, nível, evento, mensagem, args,
+    campos) numa fila em memória; a formatação da mensagem, a serialização em
+    JSON, a escrita e a rotação por tamanho acontecem na thread de escrita.
+    Nível, evento e mensagem são só posicionais, então os campos extras podem
+    ter qualquer nome.
+
+    A fila tem no máximo `max_fila` registros: com ela cheia (disco lento ou
+    travado), o registro é descartado e contado em `descartados`, e a thread
+    de escrita grava um evento `registros_descartados` quando volta a andar.
+    A thread só é criada no primeiro registro, então criar o log não abre
+    arquivo nem thread.
+    """
+
+    def __init__(self, arquivo: str, max_bytes: int = 10 * 1024 * 1024,
+                 backups: int = 5, console: bool = True, nivel: int = logging.INFO,
+                 max_fila: int = 100_000):
+        self.arquivo = arquivo
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.console = console
+        self.nivel = nivel
+        self.descartados = 0
+        self._descartes_gravados = 0
+        self._fila = queue.Queue(max_fila)
+        self._arquivo = None
+        self._tamanho = 0
+        self._thread: Optional[threading.Thread] = None
+        self._lock_thread = threading.Lock()
+
+    def registrar(self, nivel: int, evento: str, mensagem: str = "", /, *args, **campos):
+        if nivel >= self.nivel:
+            self._enfileirar((time.time(), nivel, evento, mensagem, args, campos))
+
+    def info(self, evento: str, mensagem: str = "", /, *args, **campos):
+        if logging.INFO >= self.nivel:
+            self._enfileirar((time.time(), logging.INFO, evento, mensagem, args, campos))
+
+    def aviso(self, evento: str, mensagem: str = "", /, *args, **campos):
+        self.registrar(logging.WARNING, evento, mensagem, *args, **campos)
+
+    def erro(self, evento: str, mensagem: str = "", /, *args, **campos):
+        """Registra um erro; dentro de um `except`, inclui a exceção corrente"""
+        if sys.exc_info()[0] is not None:
+            campos.setdefault("excecao", repr(sys.exc_info()[1]))
+        self.registrar(logging.ERROR, evento, mensagem, *args, **campos)
+
+    def fechar(self, timeout: Optional[float] = 5.0):
+        """Esvazia a fila e fecha o arquivo"""
+        if self._thread is not None and self._thread.is_alive():
+            try:
+                self._fila.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            self._thread.join(timeout)
+
+    def _enfileirar(self, item: tuple):
+        if self._thread is None:
+            self._iniciar_thread()
+        try:
+            self._fila.put_nowait(item)
+        except queue.Full:
+            self.descartados += 1
+
+    def _iniciar_thread(self):
+        with self._lock_thread:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._executar, daemon=True)
+                self._thread.start()
+                atexit.register(self.fechar)
+
+    def _executar(self):
+        while True:
+            item = self._fila.get()
+            itens = []
+            fim = False
+            # Agrupa tudo o que já estiver na fila numa única escrita
+            while True:
+                if item is None:
+                    fim = True
+                    break
+                itens.append(item)
+                try:
+                    item = self._fila.get_nowait()
+                except queue.Empty:
+                    break
+            try:
+                self._gravar_lote(itens)
+            except Exception as e:
+                # Um lote perdido (disco cheio, campo que não serializa) não pode parar o log
+                print(f"Log: lote de {len(itens)} registros perdido: {e!r}", file=sys.stderr)
+                if self._arquivo:
+                    self._arquivo.close()
+                    self._arquivo = None
+            if fim:
+                if self._arquivo:
+                    self._arquivo.close()
+                    self._arquivo = None
+                return
+
+    def _gravar_lote(self, itens: list):
+        descartados = self.descartados
+        if descartados > self._descartes_gravados:
+            itens.append((time.time(), logging.WARNING, "registros_descartados",
+                          "Fila do log cheia: %s registros descartados", (descartados - self._descartes_gravados,),
+                          {"total": descartados}))
+            self._descartes_gravados = descartados
+        linhas, console = [], []
+        for item in itens:
+            dados, mensagem = self._formatar(item)
+            linhas.append(json.dumps(dados, ensure_ascii=False, default=str) + "\n")
+            if self.console:
+                console.append(f"{dados['ts']} - {dados['nivel']} - {mensagem or dados['evento']}\n")
+        if console:
+            sys.stderr.write("".join(console))
+        self._escrever(linhas)
+
+    def _formatar(self, item: tuple) -> Tuple[dict, str]:
+        instante, nivel, evento, mensagem, args, campos = item
+        if args:
+            try:
+                mensagem = mensagem % args
+            except (TypeError, ValueError):
+                mensagem = f"{mensagem} {args}"
+        dados = {
+            "ts": datetime.fromtimestamp(instante).isoformat(timespec="milliseconds"),
+            "nivel": logging.getLevelName(nivel),
+            "evento": evento
+        }
+        if mensagem:
+            dados["mensagem"] = mensagem
+        for chave, valor in campos.items():
+            if chave in _CHAVES_FIXAS:
+                chave = f"campo_{chave}"
+            dados[chave] = round(valor, 3) if isinstance(valor, float) else valor
+        return dados, mensagem
+
+    def _escrever(self, linhas: list):
+        if not linhas:
+            return
+        if self._arquivo is None:
+            self._arquivo = open(self.arquivo, "a", encoding="utf-8")
+            self._tamanho = self._arquivo.tell()
+        bloco = "".join(linhas)
+        self._arquivo.write(bloco)
+        self._arquivo.flush()
+        self._tamanho += len(bloco.encode("utf-8"))
+        if self.max_bytes and self._tamanho >= self.max_bytes:
+            self._rotacionar()
+
+    def _rotacionar(self):
+        """arquivo -> arquivo.1 -> arquivo.2 ... (descarta o mais antigo)"""
+        self._arquivo.close()
+        self._arquivo = None
+        for i in range(self.backups - 1, 0, -1):
+            origem = f"{self.arquivo}.{i}"
+            if os.path.exists(origem):
+                os.replace(origem, f"{self.arquivo}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.arquivo, f"{self.arquivo}.1")
+        else:
+            os.remove(self.arquivo)
+
+
+if __name__ == "__main__":
+    # Micro-benchmark: custo por registro na thread que registra
+    import tempfile
+
+    N = 200_000
+    destino = os.path.join(tempfile.mkdtemp(), "bench.log")
+    log = LogEstruturado(destino, max_bytes=5 * 1024 * 1024, console=False)
+    inicio = time.perf_counter()
+    for i in range(N):
+        log.info("chamado_adicionado", "Chamado %s adicionado à fila", i,
+                 id_chamado=i, duracao_ms=0.01)
+    decorrido = time.perf_counter() - inicio
+    log.fechar(timeout=None)
+    total = time.perf_counter() - inicio
+    print(f"{decorrido / N * 1e6:.2f} µs por registro na thread chamadora ({N} registros)")
+    print(f"{total / N * 1e6:.2f} µs por registro incluindo a gravação em disco")
@@ -0,0 +1,178 @@
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Limites (segundos) dos baldes de latência: de 100 µs a 10 s
+LIMITES_LATENCIA = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _rotulos(nomes: Sequence[str], valores: Sequence[str], extra: str = "") -> str:
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+class _Cronometro:
+    __slots__ = ("_histograma", "_rotulos", "_inicio")
+
+    def __init__(self, histograma: "Histograma", rotulos: tuple):
+        self._histograma = histograma
+        self._rotulos = rotulos
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        self._histograma.observar(time.perf_counter() - self._inicio, *self._rotulos)
+
+
+class Histograma:
+    """Histograma de latência com baldes fixos, uma série por combinação de rótulos"""
+
+    tipo = "histogram"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = (),
+                 limites: Sequence[float] = LIMITES_LATENCIA):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self.limites = tuple(limites)
+        # valores dos rótulos -> [contagem por balde..., acima do último, soma]
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float, *valores_rotulos):
+        i = bisect_left(self.limites, valor)
+        with self._lock:
+            serie = self._series.get(valores_rotulos)
+            if serie is None:
+                serie = self._series[valores_rotulos] = [0] * (len(self.limites) + 1) + [0.0]
+            serie[i] += 1
+            serie[-1] += valor
+
+    def medir(self, *valores_rotulos) -> _Cronometro:
+        """Context manager que observa o tempo decorrido no bloco"""
+        return _Cronometro(self, valores_rotulos)
+
+    def medir_funcao(self, *valores_rotulos):
+        """Decorador que observa a duração de cada chamada"""
+        def decorador(funcao):
+            @wraps(funcao)
+            def envolvida(*args, **kwargs):
+                inicio = time.perf_counter()
+                try:
+                    return funcao(*args, **kwargs)
+                finally:
+                    self.observar(time.perf_counter() - inicio, *valores_rotulos)
+            return envolvida
+        return decorador
+
+    def exposicao(self) -> List[str]:
+        with self._lock:
+            series = [(chave, list(serie)) for chave, serie in self._series.items()]
+        linhas = []
+        for valores, serie in sorted(series):
+            acumulado = 0
+            for limite, contagem in zip(self.limites, serie):
+                acumulado += contagem
+                le = f'le="{limite:g}"'
+                linhas.append(f"{self.nome}_bucket{_rotulos(self.rotulos, valores, le)} {acumulado}")
+            acumulado += serie[len(self.limites)]
+            le = 'le="+Inf"'
+            linhas.append(f"{self.nome}_bucket{_rotulos(self.rotulos, valores, le)} {acumulado}")
+            linhas.append(f"{self.nome}_sum{_rotulos(self.rotulos, valores)} {serie[-1]:.6f}")
+            linhas.append(f"{self.nome}_count{_rotulos(self.rotulos, valores)} {acumulado}")
+        return linhas
+
+
+class Medidor:
+    """Valor instantâneo: ajustado com incrementar/decrementar ou lido de `funcao` na coleta"""
+
+    tipo = "gauge"
+
+    def __init__(self, nome: str, ajuda: str, funcao: Optional[Callable[[], float]] = None):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.funcao = funcao
+        self.valor = 0
+        self._lock = threading.Lock()
+
+    def incrementar(self, quantidade: float = 1):
+        with self._lock:
+            self.valor += quantidade
+
+    def decrementar(self, quantidade: float = 1):
+        with self._lock:
+            self.valor -= quantidade
+
+    def exposicao(self) -> List[str]:
+        valor = self.funcao() if self.funcao else self.valor
+        return [f"{self.nome} {valor}"]
+
+
+class Contador:
+    """Total que só cresce, uma série por combinação de rótulos"""
+
+    tipo = "counter"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._series: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def incrementar(self, *valores_rotulos, quantidade: float = 1):
+        with self._lock:
+            self._series[valores_rotulos] = self._series.get(valores_rotulos, 0) + quantidade
+
+    def valor(self, *valores_rotulos) -> float:
+        return self._series.get(valores_rotulos, 0)
+
+    def exposicao(self) -> List[str]:
+        with self._lock:
+            series = sorted(self._series.items())
+        return [f"{self.nome}{_rotulos(self.rotulos, valores)} {total}" for valores, total in series]
+
+
+class RegistroMetricas:
+    """Conjunto de métricas exposto no formato texto do Prometheus"""
+
+    def __init__(self):
+        self._metricas: List[object] = []
+
+    def histograma(self, nome: str, ajuda: str, rotulos: Sequence[str] = (),
+                   limites: Sequence[float] = LIMITES_LATENCIA) -> Histograma:
+        metrica = Histograma(nome, ajuda, rotulos, limites)
+        self._metricas.append(metrica)
+        return metrica
+
+    def medidor(self, nome: str, ajuda: str,
+                funcao: Optional[Callable[[], float]] = None) -> Medidor:
+        metrica = Medidor(nome, ajuda, funcao)
+        self._metricas.append(metrica)
+        return metrica
+
+    def contador(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Contador:
+        metrica = Contador(nome, ajuda, rotulos)
+        self._metricas.append(metrica)
+        return metrica
+
+    def exposicao(self) -> str:
+        linhas = []
+        for metrica in self._metricas:
+            linhas.append(f"# HELP {metrica.nome} {metrica.ajuda}")
+            linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+            linhas.extend(metrica.exposicao())
+        return "\n".join(linhas) + "\n"
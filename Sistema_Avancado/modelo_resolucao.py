@@ -0,0 +1,105 @@
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from estatisticas import QuantilP2
+
+
+class _EstadoTempo:
+    __slots__ = ("amostras", "media", "quantil")
+
+    def __init__(self, quantil: QuantilP2):
+        self.amostras = 0
+        self.media = 0.0
+        self.quantil = quantil
+
+    def adicionar(self, segundos: float, alfa: float):
+        self.amostras += 1
+        # Média simples nas primeiras amostras, exponencial (peso `alfa`) depois
+        self.media += (segundos - self.media) * max(alfa, 1 / self.amostras)
+        self.quantil.adicionar(segundos)
+
+
+class ModeloResolucao:
+    """
+    Tempo de resolução aprendido em fluxo com as durações reais dos atendimentos:
+    média móvel exponencial e quantil (P²) por (tipo de chamado, tipo de cliente,
+    agente), com estado de tamanho fixo por chave e atualização O(1). Uma chave
+    com menos de `min_amostras` recorre à mais geral, (tipo, cliente) e depois
+    só o tipo; sem amostras, vale o tempo `inicial` do tipo. Para comparar
+    agentes há ainda a chave (tipo, agente), de qualquer cliente.
+    """
+
+    def __init__(self, inicial: Dict[Hashable, float], alfa: float = 0.1,
+                 quantil: float = 0.9, min_amostras: int = 5):
+        self.inicial = inicial
+        self.alfa = alfa
+        self.p = quantil
+        self.min_amostras = min_amostras
+        self._estados: Dict[tuple, _EstadoTempo] = {}
+
+    @staticmethod
+    def _chaves(tipo: Hashable, cliente: Hashable, agente: Optional[str]) -> Tuple[tuple, ...]:
+        gerais = ((tipo, cliente, None), (tipo, None, None))
+        return gerais if agente is None else ((tipo, cliente, agente),) + gerais
+
+    def registrar(self, tipo: Hashable, cliente: Hashable, agente: Optional[str], segundos: float):
+        chaves = self._chaves(tipo, cliente, agente)
+        if agente is not None:
+            chaves += ((tipo, None, agente),)
+        for chave in chaves:
+            estado = self._estados.get(chave)
+            if estado is None:
+                estado = self._estados[chave] = _EstadoTempo(QuantilP2(self.p))
+            estado.adicionar(segundos, self.alfa)
+
+    def _estado(self, tipo: Hashable, cliente: Hashable, agente: Optional[str]) -> Optional[_EstadoTempo]:
+        for chave in self._chaves(tipo, cliente, agente):
+            estado = self._estados.get(chave)
+            if estado is not None and estado.amostras >= self.min_amostras:
+                return estado
+        return None
+
+    def estimar(self, tipo: Hashable, cliente: Hashable, agente: Optional[str] = None) -> float:
+        """Tempo esperado de resolução, em segundos"""
+        estado = self._estado(tipo, cliente, agente)
+        return estado.media if estado else self.inicial[tipo]
+
+    def estimar_agente(self, tipo: Hashable, agente: str) -> float:
+        """
+        Tempo esperado do agente no tipo, de qualquer cliente. Sem amostras
+        suficientes vale o `inicial` do tipo, que não muda com as finalizações
+        dos outros agentes (a ordem entre agentes só muda com as do próprio)
+        """
+        estado = self._estados.get((tipo, None, agente))
+        return estado.media if estado and estado.amostras >= self.min_amostras else self.inicial[tipo]
+
+    def estimar_quantil(self, tipo: Hashable, cliente: Hashable, agente: Optional[str] = None) -> float:
+        estado = self._estado(tipo, cliente, agente)
+        valor = estado.quantil.valor() if estado else None
+        return valor if valor is not None else self.inicial[tipo]
+
+    def resumo(self) -> List[dict]:
+        return [
+            {
+                "tipo_chamado": tipo,
+                "tipo_cliente": cliente,
+                "agente": agente,
+                "amostras": estado.amostras,
+                "media_s": round(estado.media, 3),
+                f"p{self.p * 100:g}_s": estado.quantil.valor()
+            }
+            for (tipo, cliente, agente), estado in self._estados.items()
+        ]
+
+    def estado(self) -> list:
+        """Estado serializável (para o snapshot)"""
+        return [
+            (chave, estado.amostras, estado.media, estado.quantil.estado())
+            for chave, estado in self._estados.items()
+        ]
+
+    def carregar(self, estado: list):
+        self._estados = {}
+        for chave, amostras, media, quantil in estado:
+            tempo = _EstadoTempo(QuantilP2.de_estado(self.p, quantil))
+            tempo.amostras, tempo.media = amostras, media
+            self._estados[tuple(chave)] = tempo
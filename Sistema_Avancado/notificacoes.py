@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Optional, Set, Tuple
+
+
+@dataclass
+class _GrupoNotificacao:
+    titulo: str
+    assunto: str
+    resumo: str
+    vencimento: float
+    total: int = 0
+    enviados: int = 0
+    suprimidos: int = 0
+    clientes: Set[str] = field(default_factory=set)
+    vistos: Set[int] = field(default_factory=set)
+
+
+class AgregadorNotificacoes:
+    """
+    Agrupa notificações por (categoria, assunto) dentro de uma janela de tempo.
+    As primeiras notificações de cada grupo são enviadas na hora; as demais,
+    e as duplicadas, viram um único resumo quando a janela do grupo fecha.
+    Resumos contam no limite por minuto como qualquer envio: sem vaga, o grupo
+    continua aberto até a próxima vaga.
+    """
+
+    def __init__(self, enviar: Callable[[str, str], None], janela: float = 60.0,
+                 max_individuais: int = 3, max_por_minuto: int = 10,
+                 relogio: Callable[[], float] = time.monotonic):
+        self._enviar = enviar
+        self.janela = janela
+        self.max_individuais = max_individuais
+        self.max_por_minuto = max_por_minuto
+        self._relogio = relogio
+        self._grupos: Dict[Tuple[str, str], _GrupoNotificacao] = {}
+        self._proximo_vencimento: Optional[float] = None
+        self._envios_recentes: Deque[float] = deque()
+        self._pendentes: Deque[Tuple[str, str]] = deque()
+        self._lock = threading.Lock()
+        self._acordar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def registrar(self, categoria: str, assunto: str, cliente: str,
+                  titulo: str, mensagem: str, resumo: Optional[str] = None):
+        """Registra um evento de notificação (O(1), não bloqueia no envio)"""
+        agora = self._relogio()
+        with self._lock:
+            self._descarregar_vencidos(agora)
+            chave = (categoria, assunto)
+            grupo = self._grupos.get(chave)
+            if grupo is None:
+                grupo = _GrupoNotificacao(
+                    titulo=titulo,
+                    assunto=assunto,
+                    resumo=resumo or "{total} notificações '{titulo}' ({assunto}) de {clientes} clientes",
+                    vencimento=agora + self.janela
+                )
+                self._grupos[chave] = grupo
+                if self._proximo_vencimento is None or grupo.vencimento < self._proximo_vencimento:
+                    self._proximo_vencimento = grupo.vencimento
+
+            grupo.total += 1
+            grupo.clientes.add(cliente)
+            assinatura = hash((cliente, titulo, mensagem))
+            if assinatura in grupo.vistos:
+                grupo.suprimidos += 1
+            elif grupo.enviados < self.max_individuais and self._liberar_envio(agora):
+                grupo.vistos.add(assinatura)
+                grupo.enviados += 1
+                self._pendentes.append((titulo, mensagem))
+            else:
+                grupo.vistos.add(assinatura)
+                grupo.suprimidos += 1
+            self._garantir_thread()
+        self._acordar.set()
+
+    def descarregar(self, forcar: bool = False):
+        """Fecha os grupos com janela vencida (ou todos, se forcar, sem limite) e envia os resumos"""
+        with self._lock:
+            self._descarregar_vencidos(self._relogio(), forcar)
+            pendentes = list(self._pendentes)
+            self._pendentes.clear()
+        for titulo, mensagem in pendentes:
+            self._enviar(titulo, mensagem)
+
+    def _liberar_envio(self, agora: float) -> bool:
+        """Limite de envios em janela deslizante de 60 segundos"""
+        while self._envios_recentes and agora - self._envios_recentes[0] >= 60.0:
+            self._envios_recentes.popleft()
+        if len(self._envios_recentes) >= self.max_por_minuto:
+            return False
+        self._envios_recentes.append(agora)
+        return True
+
+    def _descarregar_vencidos(self, agora: float, forcar: bool = False):
+        if self._proximo_vencimento is None or (agora < self._proximo_vencimento and not forcar):
+            return
+        proximo = None
+        for chave, grupo in list(self._grupos.items()):
+            if grupo.vencimento > agora and not forcar:
+                proximo = grupo.vencimento if proximo is None else min(proximo, grupo.vencimento)
+                continue
+            if grupo.suprimidos and not forcar and not self._liberar_envio(agora):
+                # Sem vaga no minuto: o resumo espera o envio mais antigo sair da janela
+                grupo.vencimento = self._envios_recentes[0] + 60.0
+                proximo = grupo.vencimento if proximo is None else min(proximo, grupo.vencimento)
+                continue
+            del self._grupos[chave]
+            if grupo.suprimidos:
+                self._pendentes.append((
+                    f"Resumo: {grupo.titulo}",
+                    grupo.resumo.format(
+                        total=grupo.total,
+                        titulo=grupo.titulo,
+                        assunto=grupo.assunto,
+                        clientes=len(grupo.clientes)
+                    )
+                ))
+        self._proximo_vencimento = proximo
+
+    def _garantir_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._executar, daemon=True)
+            self._thread.start()
+
+    def _executar(self):
+        """Envia as notificações fora do caminho crítico e fecha janelas vencidas"""
+        while True:
+            with self._lock:
+                espera = None
+                if self._proximo_vencimento is not None:
+                    espera = max(0.0, self._proximo_vencimento - self._relogio())
+            self._acordar.wait(espera)
+            self._acordar.clear()
+            self.descarregar()
@@ -0,0 +1,156 @@
+import cProfile
+import io
+import itertools
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import List, Optional, Tuple
+
+
+def _rotulo_quadro(quadro) -> str:
+    codigo = quadro.f_code
+    return f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})"
+
+
+def amostrar_cpu(segundos: float, intervalo: float = 0.005) -> Counter:
+    """
+    Perfil de CPU por amostragem: a cada `intervalo` lê a pilha de todas as
+    threads (menos a que amostra) e conta cada pilha. Não instrumenta o
+    código, então o custo para o servidor é só o da leitura das pilhas.
+    """
+    propria = threading.get_ident()
+    nomes = {}
+    contagens: Counter = Counter()
+    fim = time.perf_counter() + segundos
+    while time.perf_counter() < fim:
+        for id_thread, quadro in sys._current_frames().items():
+            if id_thread == propria:
+                continue
+            pilha = []
+            while quadro is not None:
+                pilha.append(_rotulo_quadro(quadro))
+                quadro = quadro.f_back
+            if id_thread not in nomes:
+                nomes = {t.ident: t.name for t in threading.enumerate()}
+            pilha.append(nomes.get(id_thread, str(id_thread)))
+            contagens[";".join(reversed(pilha))] += 1
+        time.sleep(intervalo)
+    return contagens
+
+
+def pilhas_colapsadas(contagens: Counter) -> str:
+    """Formato "quadro;quadro;... contagem" (flamegraph.pl, speedscope)"""
+    return "".join(f"{pilha} {n}\n" for pilha, n in contagens.most_common())
+
+
+class PerfisRequisicao:
+    """Perfis cProfile das requisições que pediram captura, guardados em memória (os mais recentes)"""
+
+    def __init__(self, maximo: int = 20):
+        self.maximo = maximo
+        self._perfis: "OrderedDict[str, Tuple[str, float, dict]]" = OrderedDict()
+        self._sequencia = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def iniciar(self) -> Optional[cProfile.Profile]:
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()
+        except ValueError:
+            return None  # Outro perfilador já está ativo (Python 3.12+ só permite um)
+        return perfil
+
+    def concluir(self, perfil: cProfile.Profile, descricao: str) -> str:
+        perfil.disable()
+        perfil.create_stats()
+        identificador = str(next(self._sequencia))
+        with self._lock:
+            self._perfis[identificador] = (descricao, time.time(), perfil.stats)
+            while len(self._perfis) > self.maximo:
+                self._perfis.popitem(last=False)
+        return identificador
+
+    def listar(self) -> List[dict]:
+        with self._lock:
+            return [
+                {"id": identificador, "requisicao": descricao, "instante": instante}
+                for identificador, (descricao, instante, _) in self._perfis.items()
+            ]
+
+    def pstats(self, identificador: str) -> Optional[bytes]:
+        """Conteúdo de um arquivo .pstats (carregável com pstats.Stats ou snakeviz)"""
+        with self._lock:
+            perfil = self._perfis.get(identificador)
+        return marshal.dumps(perfil[2]) if perfil else None
+
+    def texto(self, identificador: str, limite: int = 40) -> Optional[str]:
+        with self._lock:
+            perfil = self._perfis.get(identificador)
+        if perfil is None:
+            return None
+        saida = io.StringIO()
+        estatisticas = pstats.Stats(_PerfilCarregado(perfil[2]), stream=saida)
+        estatisticas.sort_stats("cumulative").print_stats(limite)
+        return saida.getvalue()
+
+
+class _PerfilCarregado:
+    """Adaptador para pstats.Stats aceitar um dicionário de estatísticas já pronto"""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def _snapshot_memoria() -> tracemalloc.Snapshot:
+    """Snapshot sem as alocações do próprio tracemalloc e do importador"""
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ))
+
+
+class MonitorMemoria:
+    """Snapshots do tracemalloc; cada snapshot é comparado ao anterior"""
+
+    def __init__(self):
+        self._anterior: Optional[tracemalloc.Snapshot] = None
+        self._lock = threading.Lock()
+
+    @property
+    def ativo(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def iniciar(self, quadros: int = 10):
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(quadros)
+            self._anterior = _snapshot_memoria()
+
+    def parar(self):
+        with self._lock:
+            tracemalloc.stop()
+            self._anterior = None
+
+    def diferenca(self, limite: int = 30, agrupar: str = "lineno") -> str:
+        """Maiores variações de memória desde o snapshot anterior"""
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                raise RuntimeError("tracemalloc não está ativo")
+            atual = _snapshot_memoria()
+            anterior, self._anterior = self._anterior, atual
+        usado, pico = tracemalloc.get_traced_memory()
+        linhas = [f"Memória rastreada: {usado / 1024:.1f} KiB (pico {pico / 1024:.1f} KiB)"]
+        if anterior is None:
+            estatisticas = atual.statistics(agrupar)
+        else:
+            estatisticas = atual.compare_to(anterior, agrupar)
+        linhas.extend(str(e) for e in estatisticas[:limite])
+        return "\n".join(linhas) + "\n"
@@ -0,0 +1,181 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+
+class SomaOrdenada:
+    """
+    Multiconjunto ordenado de (chave, peso) dividido em blocos de até
+    `tamanho_bloco` chaves. Inserir, remover e somar os pesos anteriores a
+    uma chave custam O(log n + tamanho_bloco + n/tamanho_bloco), quase tudo
+    em operações de lista feitas em C.
+    """
+
+    def __init__(self, tamanho_bloco: int = 256):
+        self.tamanho_bloco = tamanho_bloco
+        self._chaves: List[list] = []
+        self._pesos: List[List[float]] = []
+        self._somas: List[float] = []
+        self._maximos: list = []
+        self._tamanho = 0
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def inserir(self, chave, peso: float):
+        if not self._chaves:
+            self._chaves.append([chave])
+            self._pesos.append([peso])
+            self._somas.append(peso)
+            self._maximos.append(chave)
+            self._tamanho = 1
+            return
+        i = min(bisect_left(self._maximos, chave), len(self._chaves) - 1)
+        chaves, pesos = self._chaves[i], self._pesos[i]
+        j = bisect_left(chaves, chave)
+        chaves.insert(j, chave)
+        pesos.insert(j, peso)
+        self._somas[i] += peso
+        self._maximos[i] = chaves[-1]
+        self._tamanho += 1
+        if len(chaves) > 2 * self.tamanho_bloco:
+            metade = len(chaves) // 2
+            self._chaves[i:i + 1] = [chaves[:metade], chaves[metade:]]
+            self._pesos[i:i + 1] = [pesos[:metade], pesos[metade:]]
+            self._somas[i:i + 1] = [sum(pesos[:metade]), sum(pesos[metade:])]
+            self._maximos[i:i + 1] = [chaves[metade - 1], chaves[-1]]
+
+    def remover(self, chave) -> float:
+        i = bisect_left(self._maximos, chave)
+        chaves = self._chaves[i]
+        j = bisect_left(chaves, chave)
+        if chaves[j] != chave:
+            raise KeyError(chave)
+        del chaves[j]
+        peso = self._pesos[i].pop(j)
+        self._tamanho -= 1
+        if chaves:
+            # Recalcula em vez de subtrair para não acumular erro de ponto flutuante
+            self._somas[i] = sum(self._pesos[i])
+            self._maximos[i] = chaves[-1]
+        else:
+            del self._chaves[i], self._pesos[i], self._somas[i], self._maximos[i]
+        return peso
+
+    def soma_antes(self, chave) -> float:
+        """Soma dos pesos das chaves menores que `chave`"""
+        i = bisect_left(self._maximos, chave)
+        total = sum(self._somas[:i])
+        if i < len(self._chaves):
+            total += sum(self._pesos[i][:bisect_left(self._chaves[i], chave)])
+        return total
+
+    def acumulados(self) -> Iterator[Tuple[object, float]]:
+        """(chave, soma dos pesos anteriores) de todas as chaves, em ordem, em O(n)"""
+        total = 0.0
+        for chaves, pesos in zip(self._chaves, self._pesos):
+            for chave, peso in zip(chaves, pesos):
+                yield chave, total
+                total += peso
+
+    def itens(self) -> Iterator[Tuple[object, float]]:
+        """(chave, peso) de todas as chaves, em ordem"""
+        for chaves, pesos in zip(self._chaves, self._pesos):
+            yield from zip(chaves, pesos)
+
+
+class Vagas:
+    """
+    Vagas dos agentes que atendem um tipo de chamado, pelo tempo (segundos a
+    partir de agora) até cada uma ficar livre: 0 para as livres, o que falta
+    pela estimativa para as ocupadas. `competidores` são os tipos cujos
+    pendentes disputam essas vagas (as especialidades dos mesmos agentes).
+    """
+
+    def __init__(self, liberacoes: Iterable[float], competidores: Iterable[Hashable]):
+        self.liberacoes = sorted(liberacoes)
+        self.competidores = frozenset(competidores)
+        # _limiares[k]: trabalho que as k primeiras vagas absorvem até a (k+1)-ésima ficar livre
+        self._limiares = []
+        self._prefixos = [0.0]
+        for k, liberacao in enumerate(self.liberacoes):
+            self._limiares.append(liberacao * k - self._prefixos[-1])
+            self._prefixos.append(self._prefixos[-1] + liberacao)
+
+    def __len__(self) -> int:
+        return len(self.liberacoes)
+
+    def espera(self, trabalho: float) -> Optional[float]:
+        """
+        Quando uma vaga fica livre para o chamado, se cada vaga, a partir do seu
+        instante de liberação, consome o `trabalho` à frente: O(log vagas)
+        """
+        if not self.liberacoes:
+            return None
+        k = bisect_right(self._limiares, trabalho)
+        return (trabalho + self._prefixos[k]) / k
+
+
+class TrabalhoAFrente:
+    """
+    Para cada chamado pendente, o trabalho estimado (segundos) dos chamados
+    à frente dele na fila, somado nos tipos que disputam os mesmos agentes.
+    Mantido a cada mudança, sem simular a fila: uma SomaOrdenada por tipo,
+    ordenada pela chave da fila, e a consulta soma os tipos pedidos.
+    """
+
+    def __init__(self):
+        self._por_tipo: Dict[Hashable, SomaOrdenada] = defaultdict(SomaOrdenada)
+        self._posicoes: Dict[str, Tuple[Hashable, tuple]] = {}
+
+    def __contains__(self, id_chamado: str) -> bool:
+        return id_chamado in self._posicoes
+
+    def enfileirar(self, id_chamado: str, tipo: Hashable, chave: tuple, peso: float):
+        """Insere ou reposiciona o chamado; a chave deve terminar no próprio id (unicidade)"""
+        self.retirar(id_chamado)
+        self._por_tipo[tipo].inserir(chave, peso)
+        self._posicoes[id_chamado] = (tipo, chave)
+
+    def retirar(self, id_chamado: str):
+        posicao = self._posicoes.pop(id_chamado, None)
+        if posicao is not None:
+            tipo, chave = posicao
+            self._por_tipo[tipo].remover(chave)
+
+    def limpar(self):
+        self._por_tipo.clear()
+        self._posicoes.clear()
+
+    def trabalho(self, id_chamado: str, tipos: Optional[Iterable[Hashable]] = None) -> Optional[float]:
+        """Trabalho à frente do chamado nos `tipos` (padrão: só o tipo dele)"""
+        posicao = self._posicoes.get(id_chamado)
+        if posicao is None:
+            return None
+        tipo, chave = posicao
+        if tipos is None:
+            tipos = (tipo,)
+        return sum(self._por_tipo[t].soma_antes(chave) for t in tipos if t in self._por_tipo)
+
+    def trabalhos(self, competidores: Optional[Dict[Hashable, Iterable[Hashable]]] = None
+                  ) -> Dict[str, Tuple[Hashable, float]]:
+        """
+        {id: (tipo, trabalho à frente)} de todos os pendentes, em O(n · tipos),
+        somando para cada tipo os `competidores[tipo]` (padrão: só ele mesmo)
+        """
+        if competidores is None:
+            competidores = {}
+        acumulados = dict.fromkeys(self._por_tipo, 0.0)
+        resultado = {}
+        # As chaves são únicas (terminam no id), então o merge nunca compara os tipos
+        for chave, tipo, peso in heapq.merge(*(self._itens(tipo, soma) for tipo, soma in self._por_tipo.items())):
+            tipos = competidores.get(tipo, (tipo,))
+            resultado[chave[-1]] = (tipo, sum(acumulados.get(t, 0.0) for t in tipos))
+            acumulados[tipo] += peso
+        return resultado
+
+    @staticmethod
+    def _itens(tipo: Hashable, soma: SomaOrdenada) -> Iterator[tuple]:
+        for chave, peso in soma.itens():
+            yield chave, tipo, peso
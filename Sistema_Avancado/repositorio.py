@@ -0,0 +1,225 @@
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from log_estruturado import LogEstruturado
+
+# Colunas na mesma ordem da tupla recebida em `salvar`
+COLUNAS = (
+    "id", "cliente", "tipo_cliente", "tipo_chamado", "descricao", "status",
+    "criado_em", "prioridade_manual", "agente", "inicio_atendimento", "resolvido_em",
+    "ocorrencias"
+)
+# Colunas com instantes: epoch no banco, ISO 8601 em UTC ("Z") na consulta e na exportação
+INSTANTES = ("criado_em", "inicio_atendimento", "resolvido_em")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS chamados (
+    id TEXT PRIMARY KEY,
+    cliente TEXT NOT NULL,
+    tipo_cliente TEXT NOT NULL,
+    tipo_chamado TEXT NOT NULL,
+    descricao TEXT,
+    status TEXT NOT NULL,
+    criado_em REAL NOT NULL,
+    prioridade_manual INTEGER,
+    agente TEXT,
+    inicio_atendimento REAL,
+    resolvido_em REAL,
+    ocorrencias INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chamados_criado ON chamados (criado_em);
+CREATE INDEX IF NOT EXISTS idx_chamados_status ON chamados (status, criado_em);
+CREATE INDEX IF NOT EXISTS idx_chamados_tipo ON chamados (tipo_chamado, criado_em);
+CREATE INDEX IF NOT EXISTS idx_chamados_cliente ON chamados (cliente, criado_em);
+CREATE INDEX IF NOT EXISTS idx_chamados_agente ON chamados (agente, criado_em);
+"""
+
+_UPSERT = (
+    f"INSERT INTO chamados ({', '.join(COLUNAS)}) VALUES ({', '.join('?' * len(COLUNAS))}) "
+    "ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in COLUNAS[1:])
+)
+
+# Filtro aceito em `consultar` -> condição SQL
+_FILTROS = {
+    "status": "status = ?",
+    "tipo_chamado": "tipo_chamado = ?",
+    "tipo_cliente": "tipo_cliente = ?",
+    "cliente": "cliente = ?",
+    "agente": "agente = ?",
+    "desde": "criado_em >= ?",
+    "ate": "criado_em < ?"
+}
+
+
+class FormatadorInstantes:
+    """
+    Epoch -> "AAAA-MM-DDTHH:MM:SSZ" (UTC), o formato dos instantes na API e no
+    CSV. Chamados próximos compartilham o minuto, então o prefixo de cada
+    minuto é calculado uma vez só.
+    """
+
+    def __init__(self, capacidade: int = 4096):
+        self.capacidade = capacidade
+        self._minutos = {}
+
+    def __call__(self, instante: Optional[float]) -> str:
+        if instante is None:
+            return ""
+        segundos = int(instante)
+        minuto, segundo = divmod(segundos, 60)
+        prefixo = self._minutos.get(minuto)
+        if prefixo is None:
+            if len(self._minutos) >= self.capacidade:
+                self._minutos.clear()
+            prefixo = datetime.fromtimestamp(minuto * 60, timezone.utc).strftime("%Y-%m-%dT%H:%M:")
+            self._minutos[minuto] = prefixo
+        return f"{prefixo}{segundo:02d}Z"
+
+
+def _conectar(caminho: str) -> sqlite3.Connection:
+    conexao = sqlite3.connect(caminho, check_same_thread=False)
+    conexao.execute("PRAGMA journal_mode = WAL")
+    conexao.execute("PRAGMA synchronous = NORMAL")
+    return conexao
+
+
+class RepositorioSQLite:
+    """
+    Histórico persistente de chamados em SQLite, fora do caminho crítico.
+
+    `salvar` só enfileira a imagem do chamado; uma thread agrupa as imagens
+    (a última de cada chamado vence) e grava cada lote numa única transação
+    com o mesmo comando preparado. As consultas usam uma conexão própria de
+    leitura, que o modo WAL permite rodar em paralelo com a escrita.
+    Um lote que o SQLite recusa é registrado em `log` e descartado sem
+    derrubar a thread, e quem espera em `aguardar` é liberado do mesmo jeito.
+    """
+
+    def __init__(self, caminho: str, lote: int = 2000, latencia: float = 0.05,
+                 log: Optional[LogEstruturado] = None):
+        self.caminho = caminho
+        self.lote = lote
+        self.latencia = latencia
+        self.log = log
+        conexao = _conectar(caminho)
+        conexao.executescript(_ESQUEMA)
+        conexao.close()
+        self._leitura = _conectar(caminho)
+        self._lock_leitura = threading.Lock()
+        self._fila = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+
+    def salvar(self, registro: tuple):
+        """Enfileira a imagem atual de um chamado (tupla na ordem de COLUNAS)"""
+        self._fila.put(registro)
+
+    def aguardar(self):
+        """Bloqueia até tudo o que foi enfileirado estar gravado"""
+        evento = threading.Event()
+        self._fila.put(evento)
+        evento.wait()
+
+    def fechar(self):
+        self._fila.put(None)
+        self._thread.join()
+        self._leitura.close()
+
+    def consultar(self, limite: int = 100, **filtros) -> List[dict]:
+        """
+        Consulta por status, tipo_chamado, tipo_cliente, cliente, agente e
+        intervalo de criação (desde/ate, datetime), do mais recente para o
+        mais antigo. Cada combinação usa um dos índices (coluna, criado_em).
+        """
+        sql, parametros = self._montar_consulta(filtros)
+        sql += " ORDER BY criado_em DESC LIMIT ?"
+        parametros.append(limite)
+        with self._lock_leitura:
+            linhas = self._leitura.execute(sql, parametros).fetchall()
+        iso = FormatadorInstantes()
+        return [self._linha_para_dict(linha, iso) for linha in linhas]
+
+    def iterar(self, tamanho_bloco: int = 5000, **filtros) -> Iterator[tuple]:
+        """Percorre os chamados em ordem de criação, em blocos, sem carregar tudo em memória"""
+        sql, parametros = self._montar_consulta(filtros)
+        sql += " ORDER BY criado_em"
+        conexao = _conectar(self.caminho)
+        try:
+            cursor = conexao.execute(sql, parametros)
+            while True:
+                linhas = cursor.fetchmany(tamanho_bloco)
+                if not linhas:
+                    break
+                yield from linhas
+        finally:
+            conexao.close()
+
+    @staticmethod
+    def _montar_consulta(filtros: Dict[str, object]):
+        condicoes = []
+        parametros = []
+        for nome, valor in filtros.items():
+            if valor is None:
+                continue
+            if nome not in _FILTROS:
+                raise ValueError(f"Filtro desconhecido: {nome}")
+            if isinstance(valor, datetime):
+                valor = valor.timestamp()
+            condicoes.append(_FILTROS[nome])
+            parametros.append(valor)
+        sql = f"SELECT {', '.join(COLUNAS)} FROM chamados"
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        return sql, parametros
+
+    @staticmethod
+    def _linha_para_dict(linha: tuple, iso: FormatadorInstantes) -> dict:
+        dados = dict(zip(COLUNAS, linha))
+        for coluna in INSTANTES:
+            if dados[coluna] is not None:
+                dados[coluna] = iso(dados[coluna])
+        return dados
+
+    def _executar(self):
+        conexao = _conectar(self.caminho)
+        while True:
+            item = self._fila.get()
+            lote: Dict[str, tuple] = {}
+            eventos = []
+            fim = False
+            limite = time.monotonic() + self.latencia
+            while True:
+                if item is None:
+                    fim = True
+                elif isinstance(item, threading.Event):
+                    eventos.append(item)
+                else:
+                    lote[item[0]] = item
+                if fim or len(lote) >= self.lote:
+                    break
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    item = self._fila.get(timeout=restante)
+                except queue.Empty:
+                    break
+
+            try:
+                if lote:
+                    with conexao:
+                        conexao.executemany(_UPSERT, lote.values())
+            except sqlite3.Error:
+                if self.log is not None:
+                    self.log.erro("erro_historico", "Falha ao gravar %s chamados no histórico", len(lote))
+            finally:
+                for evento in eventos:
+                    evento.set()
+            if fim:
+                conexao.close()
+                return
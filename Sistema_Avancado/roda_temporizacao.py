@@ -0,0 +1,100 @@
+from typing import Dict, Hashable, List, Optional, Tuple
+
+BITS_POR_NIVEL = 6
+ENCAIXES = 1 << BITS_POR_NIVEL  # 64 encaixes por nível
+MASCARA = ENCAIXES - 1
+NIVEIS = 4  # 64^4 ticks (com tick de 1 s, ~194 dias) antes de precisar recascatear
+
+
+class _Temporizador:
+    __slots__ = ("chave", "vencimento", "dados", "encaixe")
+
+    def __init__(self, chave: Hashable, vencimento: int, dados: object):
+        self.chave = chave
+        self.vencimento = vencimento
+        self.dados = dados
+        self.encaixe: Optional[dict] = None
+
+
+class RodaTemporizacao:
+    """
+    Roda de temporização hierárquica (Varghese & Lauck): quatro níveis de 64
+    encaixes; o nível k guarda temporizadores que vencem entre 64^k e 64^(k+1)
+    ticks à frente. Agendar e cancelar são O(1); avançar um tick só olha um
+    encaixe, e a cada 64 ticks redistribui um encaixe do nível de cima.
+    """
+
+    def __init__(self, inicio: float, resolucao: float = 1.0):
+        self.resolucao = resolucao
+        self._tick = int(inicio / resolucao)
+        self._niveis = [[{} for _ in range(ENCAIXES)] for _ in range(NIVEIS)]
+        self._temporizadores: Dict[Hashable, _Temporizador] = {}
+
+    def __len__(self) -> int:
+        return len(self._temporizadores)
+
+    def __contains__(self, chave: Hashable) -> bool:
+        return chave in self._temporizadores
+
+    def agendar(self, chave: Hashable, instante: float, dados: object = None):
+        """Arma (ou rearma) o temporizador `chave` para vencer em `instante`"""
+        self.cancelar(chave)
+        temporizador = _Temporizador(chave, int(instante / self.resolucao), dados)
+        self._temporizadores[chave] = temporizador
+        self._inserir(temporizador)
+
+    def vencido(self, instante: float) -> bool:
+        """Se um temporizador para `instante` já teria disparado no último avanço"""
+        return int(instante / self.resolucao) <= self._tick
+
+    def cancelar(self, chave: Hashable) -> bool:
+        temporizador = self._temporizadores.pop(chave, None)
+        if temporizador is None:
+            return False
+        del temporizador.encaixe[chave]
+        return True
+
+    def avancar(self, agora: float) -> List[Tuple[Hashable, object]]:
+        """Avança o relógio até `agora` e retorna (chave, dados) dos temporizadores vencidos"""
+        alvo = int(agora / self.resolucao)
+        vencidos = []
+        while self._tick < alvo:
+            if not self._temporizadores:
+                self._tick = alvo  # nada armado: pula direto
+                break
+            self._tick += 1
+            tick = self._tick
+            # Ao completar uma volta de um nível, desce um encaixe do nível de cima
+            nivel = 1
+            while nivel < NIVEIS and (tick >> (BITS_POR_NIVEL * (nivel - 1))) & MASCARA == 0:
+                self._cascatear(nivel, (tick >> (BITS_POR_NIVEL * nivel)) & MASCARA)
+                nivel += 1
+            encaixe = self._niveis[0][tick & MASCARA]
+            if encaixe:
+                self._niveis[0][tick & MASCARA] = {}
+                for chave, temporizador in encaixe.items():
+                    del self._temporizadores[chave]
+                    vencidos.append((chave, temporizador.dados))
+        return vencidos
+
+    def _cascatear(self, nivel: int, indice: int):
+        encaixe = self._niveis[nivel][indice]
+        if encaixe:
+            self._niveis[nivel][indice] = {}
+            for temporizador in encaixe.values():
+                # O encaixe do nível 0 deste tick ainda vai ser processado
+                self._inserir(temporizador, self._tick)
+
+    def _inserir(self, temporizador: _Temporizador, minimo: Optional[int] = None):
+        # Já vencido: dispara no próximo tick processado
+        vencimento = max(temporizador.vencimento, self._tick + 1 if minimo is None else minimo)
+        distancia = vencimento - self._tick
+        nivel = 0
+        while nivel < NIVEIS - 1 and distancia >= 1 << (BITS_POR_NIVEL * (nivel + 1)):
+            nivel += 1
+        if nivel == NIVEIS - 1:
+            # Além do alcance da roda: fica no último encaixe alcançável e é recascateado
+            vencimento = min(vencimento, self._tick + (1 << (BITS_POR_NIVEL * NIVEIS)) - 1)
+        encaixe = self._niveis[nivel][(vencimento >> (BITS_POR_NIVEL * nivel)) & MASCARA]
+        encaixe[temporizador.chave] = temporizador
+        temporizador.encaixe = encaixe
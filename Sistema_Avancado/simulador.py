@@ -0,0 +1,356 @@
+"""
+Simulação de eventos discretos do SistemaChamados com relógio virtual.
+
+Chegadas de Poisson com tipo de chamado e de cliente sorteados, duração de cada
+atendimento lognormal com média no TEMPO_RESOLUCAO do tipo. O sistema roda o
+código de verdade (fila, atribuição, SLA, escalonamento), mas lê o instante de
+um relógio que só anda de evento em evento, e sem log, notificações nem
+Socket.IO: dias de tráfego levam segundos. Informa a espera por tipo de chamado
+e de cliente (até o primeiro início do atendimento), o SLA cumprido, os
+atendimentos interrompidos pela preempção e a utilização de cada agente. Um
+atendimento interrompido recomeça do zero quando volta a um agente. Com
+--inundacao, um cliente de demonstração abre dúvidas em rajada; a espera dele
+sai das tabelas e é informada à parte.
+
+    python simulador.py --dias 7 --chegadas-por-hora 6 --agentes 4
+    python simulador.py --dias 30 --agentes 6 --variacao 1.0 --json
+    python simulador.py --dias 30 --equipe mista --sem-proficiencia   # roteamento sem as notas
+    python simulador.py --dias 30 --equipe mista --sem-preempcao      # críticos esperam na fila
+    python simulador.py --dias 7 --inundacao 20 --fila-justa          # cliente ruidoso, fila justa
+"""
+import argparse
+import heapq
+import itertools
+import json
+import math
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import Sistema_Chamadas as sc
+
+INICIO = datetime(2025, 1, 6).timestamp()  # instante virtual do início (fixo: resultados reproduzíveis)
+MIX_TIPOS = {
+    sc.TipoChamado.SERVER_DOWN: 0.05,
+    sc.TipoChamado.IMPACTA_PRODUCAO: 0.15,
+    sc.TipoChamado.SEM_IMPACTO: 0.4,
+    sc.TipoChamado.DUVIDA: 0.4,
+}
+MIX_CLIENTES = {
+    sc.TipoCliente.PRIORITARIO: 0.2,
+    sc.TipoCliente.SEM_PRIORIDADE: 0.6,
+    sc.TipoCliente.DEMONSTRACAO: 0.2,
+}
+VARIACAO_ATENDIMENTO = 0.5  # coeficiente de variação da duração do atendimento
+# Equipe "mista": todos atendem tudo, alternando os perfis. A duração média é TEMPO_RESOLUCAO / proficiência
+PERFIS = (
+    {sc.TipoChamado.SERVER_DOWN: 1.0, sc.TipoChamado.IMPACTA_PRODUCAO: 1.0,
+     sc.TipoChamado.SEM_IMPACTO: 0.8, sc.TipoChamado.DUVIDA: 0.7},   # sênior
+    {sc.TipoChamado.SERVER_DOWN: 0.5, sc.TipoChamado.IMPACTA_PRODUCAO: 0.6,
+     sc.TipoChamado.SEM_IMPACTO: 0.9, sc.TipoChamado.DUVIDA: 1.0},   # júnior
+)
+LIMIAR_ESPECIALISTA = 0.9  # proficiência a partir da qual o agente conta como especialista no tipo
+CLIENTE_RUIDOSO = "Cliente ruidoso"  # abre dúvidas como demonstração à taxa de --inundacao
+QUANTIS = (0.5, 0.9, 0.99)
+
+
+class RelogioVirtual:
+    """Relógio injetado no SistemaChamados; só muda quando a simulação avança"""
+
+    def __init__(self, inicio: float):
+        self.agora = inicio
+
+    def __call__(self) -> float:
+        return self.agora
+
+
+def _percentil(ordenados: List[float], q: float) -> float:
+    return ordenados[min(len(ordenados) - 1, int(q * len(ordenados)))]
+
+
+def _resumo(esperas: List[float]) -> dict:
+    """Espera em minutos: quantidade, média, quantis e máximo"""
+    if not esperas:
+        return {"n": 0}
+    ordenados = sorted(e / 60 for e in esperas)
+    resumo = {"n": len(ordenados), "media": sum(ordenados) / len(ordenados)}
+    for q in QUANTIS:
+        resumo[f"p{round(q * 100)}"] = _percentil(ordenados, q)
+    resumo["max"] = ordenados[-1]
+    return resumo
+
+
+class Simulacao:
+    def __init__(self, agentes: int = 4, chegadas_por_hora: float = 6.0,
+                 variacao: float = VARIACAO_ATENDIMENTO, clientes: int = 200, semente: int = 42,
+                 capacidade: int = 1, equipe: str = "especialistas", por_proficiencia: bool = True,
+                 inundacao: float = 0.0):
+        self.relogio = RelogioVirtual(INICIO)
+        self.sistema = sc.SistemaChamados(relogio=self.relogio, silencioso=True)
+        self.sorteio = random.Random(semente)
+        self.taxa = chegadas_por_hora / 3600
+        self.taxa_inundacao = inundacao / 3600
+        self.ruidosos = set()  # chamados do CLIENTE_RUIDOSO
+        self.clientes = clientes
+        # Lognormal com a média do tipo: sigma² = ln(1 + cv²), mu = ln(média) - sigma²/2
+        self._sigma = math.sqrt(math.log(1 + variacao ** 2))
+        self._tipos = list(MIX_TIPOS)
+        self._pesos_tipos = list(itertools.accumulate(MIX_TIPOS.values()))
+        self._tipos_cliente = list(MIX_CLIENTES)
+        self._pesos_clientes = list(itertools.accumulate(MIX_CLIENTES.values()))
+
+        especialidades = (
+            [sc.TipoChamado.SERVER_DOWN, sc.TipoChamado.IMPACTA_PRODUCAO],
+            [sc.TipoChamado.SEM_IMPACTO, sc.TipoChamado.DUVIDA],
+        )
+        # Proficiências reais de cada agente, que definem a duração mesmo quando o sistema não as recebe
+        self.proficiencias: Dict[str, Dict[sc.TipoChamado, float]] = {}
+        for i in range(agentes):
+            if equipe == "mista":
+                perfil = PERFIS[i % len(PERFIS)]
+            else:
+                perfil = dict.fromkeys(especialidades[i % 2], 1.0)
+            self.proficiencias[f"sim{i}"] = perfil
+            self.sistema.adicionar_agente(sc.AgenteSuporte(
+                id=f"sim{i}", nome=f"Agente {i}", especialidades=list(perfil),
+                capacidade=capacidade, proficiencias=dict(perfil) if por_proficiencia else {}))
+
+        self._eventos = []  # (instante, sequência, tipo, id do chamado, início do atendimento)
+        self._sequencia = itertools.count()
+        # Por chamado: [tipo de chamado, tipo de cliente, chegada, primeiro início, fim, agente, início atual]
+        self.chamados: Dict[str, list] = {}
+        self._atendendo: Dict[str, set] = {id_agente: set() for id_agente in self.sistema.agentes}
+        self.ocupado: Dict[str, float] = dict.fromkeys(self.sistema.agentes, 0.0)
+        self.agrupados = 0
+        self.processados = 0
+
+    def _agendar(self, instante: float, tipo: str, id_chamado: Optional[str] = None,
+                 inicio: Optional[float] = None):
+        heapq.heappush(self._eventos, (instante, next(self._sequencia), tipo, id_chamado, inicio))
+
+    def _agendar_sla(self, inicio_fase: float, tipo: sc.TipoChamado):
+        # Verifica o SLA só quando um prazo pode vencer, e não a cada segundo virtual
+        prazo = sc.PRAZO_SLA[tipo].total_seconds()
+        self._agendar(inicio_fase + prazo + sc.SLA_INTERVALO_VERIFICACAO, "sla")
+
+    def _duracao(self, tipo: sc.TipoChamado, id_agente: str) -> float:
+        media = sc.TEMPO_RESOLUCAO[tipo] * 60 / self.proficiencias[id_agente][tipo]
+        return self.sorteio.lognormvariate(math.log(media) - self._sigma ** 2 / 2, self._sigma)
+
+    def _chegada(self, agora: float, ruidoso: bool = False):
+        if ruidoso:
+            tipo, tipo_cliente, cliente = sc.TipoChamado.DUVIDA, sc.TipoCliente.DEMONSTRACAO, CLIENTE_RUIDOSO
+        else:
+            tipo = self.sorteio.choices(self._tipos, cum_weights=self._pesos_tipos)[0]
+            tipo_cliente = self.sorteio.choices(self._tipos_cliente, cum_weights=self._pesos_clientes)[0]
+            cliente = f"Cliente {self.sorteio.randrange(self.clientes)}"
+        chamado = self.sistema.adicionar_chamado({
+            "cliente_nome": cliente,
+            "tipo_cliente": tipo_cliente.value,
+            "tipo_chamado": tipo.value,
+            "descricao": f"Chamado simulado {tipo.value}",
+        })
+        if chamado.id_chamado in self.chamados:
+            self.agrupados += 1  # duplicado: somado ao chamado aberto do cliente
+            return
+        self.chamados[chamado.id_chamado] = [tipo, tipo_cliente, agora, None, None, None, None]
+        if ruidoso:
+            self.ruidosos.add(chamado.id_chamado)
+        self._agendar_sla(agora, tipo)
+        if self.sistema.agentes_livres[tipo]:
+            self.sistema.despachar()
+
+    def _registrar_inicios(self, agora: float):
+        """
+        Encerra os atendimentos que a preempção interrompeu (o fim já agendado
+        deles fica obsoleto) e agenda o fim dos que o sistema acabou de iniciar
+        """
+        mudaram = [
+            agente for agente in self.sistema.agentes.values()
+            # Só diferem quando um atendimento começou ou foi interrompido (o fim tira o chamado dos dois)
+            if len(agente.chamados) != len(self._atendendo[agente.id])
+            or not self._atendendo[agente.id].issuperset(agente.chamados)
+        ]
+        # Interrupções antes dos inícios: o interrompido pode já ter recomeçado noutro agente
+        for agente in mudaram:
+            atendendo = self._atendendo[agente.id]
+            for id_chamado in atendendo.difference(agente.chamados):
+                registro = self.chamados[id_chamado]
+                self.ocupado[agente.id] += agora - registro[6]
+                registro[6] = None
+            atendendo.intersection_update(agente.chamados)
+        for agente in mudaram:
+            atendendo = self._atendendo[agente.id]
+            for id_chamado in agente.chamados:
+                if id_chamado in atendendo:
+                    continue
+                atendendo.add(id_chamado)
+                registro = self.chamados[id_chamado]
+                if registro[3] is None:
+                    registro[3] = agora
+                registro[5] = agente.id
+                registro[6] = agora
+                self._agendar(agora + self._duracao(registro[0], agente.id), "fim", id_chamado, agora)
+                self._agendar_sla(agora, registro[0])
+
+    def executar(self, segundos: float) -> dict:
+        fim = INICIO + segundos
+        self._agendar(INICIO + self.sorteio.expovariate(self.taxa), "chegada")
+        if self.taxa_inundacao:
+            self._agendar(INICIO + self.sorteio.expovariate(self.taxa_inundacao), "inundacao")
+        inicio_real = time.perf_counter()
+        while self._eventos and self._eventos[0][0] <= fim:
+            agora, _, tipo, id_chamado, inicio = heapq.heappop(self._eventos)
+            self.relogio.agora = agora
+            self.processados += 1
+            if tipo == "chegada":
+                self._chegada(agora)
+                self._agendar(agora + self.sorteio.expovariate(self.taxa), "chegada")
+            elif tipo == "inundacao":
+                self._chegada(agora, ruidoso=True)
+                self._agendar(agora + self.sorteio.expovariate(self.taxa_inundacao), "inundacao")
+            elif tipo == "fim":
+                registro = self.chamados[id_chamado]
+                if registro[6] != inicio:
+                    continue  # atendimento interrompido: o fim valia para o início anterior
+                registro[4] = agora
+                agente = self.sistema.chamados_ativos[id_chamado].agente_atribuido
+                self.ocupado[agente] += agora - registro[6]
+                self._atendendo[agente].discard(id_chamado)
+                self.sistema.finalizar_chamado(id_chamado)
+            else:
+                self.sistema.verificar_sla(agora)
+            self._registrar_inicios(agora)
+        duracao_real = time.perf_counter() - inicio_real
+
+        self.relogio.agora = fim
+        for id_agente, atendendo in self._atendendo.items():
+            for id_chamado in atendendo:
+                self.ocupado[id_agente] += fim - self.chamados[id_chamado][6]
+        return self.relatorio(segundos, duracao_real)
+
+    def relatorio(self, segundos: float, duracao_real: float) -> dict:
+        fim = INICIO + segundos
+        por_tipo = defaultdict(list)
+        por_cliente = defaultdict(list)
+        cumpridos = avaliados = 0
+        criticos = []
+        ruidoso = []
+        com_especialista = 0
+        for id_chamado, (tipo, tipo_cliente, chegada, inicio, termino, agente, _) in self.chamados.items():
+            prazo = sc.PRAZO_SLA[tipo].total_seconds()
+            if id_chamado in self.ruidosos:
+                if inicio is not None:
+                    ruidoso.append(inicio - chegada)
+            elif inicio is not None:
+                por_tipo[tipo.value].append(inicio - chegada)
+                por_cliente[tipo_cliente.value].append(inicio - chegada)
+                if sc.PRIORIDADE_CHAMADO[tipo] == 1:
+                    criticos.append(inicio - chegada)
+                    com_especialista += self.proficiencias[agente][tipo] >= LIMIAR_ESPECIALISTA
+            # SLA: espera e atendimento dentro do prazo. Os abertos no fim só contam se já estouraram
+            espera = (inicio if inicio is not None else fim) - chegada
+            atendimento = (termino if termino is not None else fim) - inicio if inicio is not None else 0.0
+            if espera > prazo or atendimento > prazo:
+                avaliados += 1
+            elif termino is not None:
+                avaliados += 1
+                cumpridos += 1
+
+        return {
+            "dias": segundos / 86400,
+            "chegadas": len(self.chamados) + self.agrupados,
+            "duplicados_agrupados": self.agrupados,
+            "resolvidos": sum(1 for r in self.chamados.values() if r[4] is not None),
+            "pendentes_no_fim": self.sistema.tamanho_fila,
+            "espera_min_por_tipo_chamado": {t.value: _resumo(por_tipo[t.value]) for t in sc.TipoChamado},
+            "espera_min_por_tipo_cliente": {t.value: _resumo(por_cliente[t.value]) for t in sc.TipoCliente},
+            "espera_min_ruidoso": _resumo(ruidoso),
+            # Chamados de prioridade 1 que começaram: espera e fração atendida por um especialista no tipo
+            "prioridade_1": dict(_resumo(criticos),
+                                 com_especialista=com_especialista / len(criticos) if criticos else None),
+            "sla_cumprido": cumpridos / avaliados if avaliados else None,
+            "violacoes_sla": self.sistema.estatisticas.violacoes_sla,
+            "interrompidos": self.sistema.estatisticas.interrompidos,
+            # Fração das vagas de cada agente ocupada ao longo da simulação
+            "utilizacao": {
+                id_agente: ocupado / (segundos * self.sistema.agentes[id_agente].capacidade)
+                for id_agente, ocupado in self.ocupado.items()
+            },
+            "eventos": self.processados,
+            "segundos_reais": duracao_real,
+        }
+
+
+def _imprimir(resultado: dict):
+    print(f"{resultado['dias']:g} dias simulados em {resultado['segundos_reais']:.1f} s "
+          f"({resultado['eventos']} eventos)")
+    print(f"chegadas {resultado['chegadas']} (agrupadas {resultado['duplicados_agrupados']}), "
+          f"resolvidos {resultado['resolvidos']}, pendentes no fim {resultado['pendentes_no_fim']}")
+    colunas = ["n", "media"] + [f"p{round(q * 100)}" for q in QUANTIS] + ["max"]
+    for titulo, chave in (("Tipo de chamado", "espera_min_por_tipo_chamado"),
+                          ("Tipo de cliente", "espera_min_por_tipo_cliente")):
+        print(f"\n{'Espera (min) / ' + titulo:<34}" + "".join(f"{c:>9}" for c in colunas))
+        for nome, resumo in resultado[chave].items():
+            valores = [f"{resumo.get(c, 0):>9.1f}" if c != "n" else f"{resumo['n']:>9}" for c in colunas]
+            print(f"{nome:<34}" + "".join(valores))
+    ruidoso = resultado["espera_min_ruidoso"]
+    if ruidoso["n"]:
+        print(f"\nCliente ruidoso: {ruidoso['n']} chamados, espera média {ruidoso['media']:.1f} min "
+              f"(p99 {ruidoso['p99']:.1f})")
+    criticos = resultado["prioridade_1"]
+    if criticos["n"]:
+        print(f"\nPrioridade 1: {criticos['n']} chamados, espera média {criticos['media']:.1f} min "
+              f"(p90 {criticos['p90']:.1f}), {criticos['com_especialista']:.0%} com especialista")
+    sla = resultado["sla_cumprido"]
+    print(f"\nSLA cumprido: {'-' if sla is None else f'{sla:.1%}'} "
+          f"({resultado['violacoes_sla']} violações de prazo)")
+    print(f"Atendimentos interrompidos por preempção: {resultado['interrompidos']}")
+    print("Utilização: " + ", ".join(f"{a} {u:.0%}" for a, u in resultado["utilizacao"].items()))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dias", type=float, default=1.0)
+    parser.add_argument("--chegadas-por-hora", type=float, default=6.0)
+    parser.add_argument("--agentes", type=int, default=4,
+                        help="alternando as especialidades (Server down/Impacta e Sem impacto/Dúvida)")
+    parser.add_argument("--equipe", choices=("especialistas", "mista"), default="especialistas",
+                        help="especialistas: metade só Server down/Impacta, metade só Sem impacto/Dúvida; "
+                             "mista: todos atendem tudo, alternando sênior e júnior (PERFIS)")
+    parser.add_argument("--sem-proficiencia", action="store_true",
+                        help="o sistema não recebe as proficiências (escolhe só pela carga)")
+    parser.add_argument("--sem-preempcao", action="store_true",
+                        help="críticos esperam na fila em vez de interromper atendimentos (PREEMPCAO_PRIORIDADE)")
+    parser.add_argument("--fila-justa", action="store_true",
+                        help="clientes se revezam dentro de cada prioridade (FILA_JUSTA)")
+    parser.add_argument("--inundacao", type=float, default=0.0, metavar="POR_HORA",
+                        help="dúvidas por hora de um único cliente de demonstração")
+    parser.add_argument("--capacidade", type=int, default=1, help="chamados simultâneos por agente")
+    parser.add_argument("--variacao", type=float, default=VARIACAO_ATENDIMENTO,
+                        help="coeficiente de variação da duração do atendimento")
+    parser.add_argument("--clientes", type=int, default=200, help="clientes distintos que abrem chamados")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = parser.parse_args(argv)
+    if args.sem_preempcao:
+        sc.PREEMPCAO_PRIORIDADE = None
+    if args.fila_justa:
+        sc.FILA_JUSTA = True
+
+    simulacao = Simulacao(args.agentes, args.chegadas_por_hora, args.variacao, args.clientes, args.semente,
+                          args.capacidade, args.equipe, not args.sem_proficiencia, args.inundacao)
+    resultado = simulacao.executar(args.dias * 86400)
+    if args.json:
+        json.dump(resultado, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        _imprimir(resultado)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+import os
+import pickle
+import re
+from typing import List, Optional, Tuple
+
+# Arquivos no diretório de dados:
+#   journal.<n>.bin   segmento n do journal (eventos posteriores ao snapshot n)
+#   snapshot.<n>.bin  estado completo no instante em que o segmento n foi aberto
+_PADRAO = re.compile(r"^(journal|snapshot)\.(\d{8})\.bin$")
+
+
+def caminho_segmento(diretorio: str, numero: int) -> str:
+    return os.path.join(diretorio, f"journal.{numero:08d}.bin")
+
+
+def caminho_snapshot(diretorio: str, numero: int) -> str:
+    return os.path.join(diretorio, f"snapshot.{numero:08d}.bin")
+
+
+def listar(diretorio: str, tipo: str) -> List[Tuple[int, str]]:
+    """Lista (número, caminho) dos arquivos `tipo` ('journal' ou 'snapshot'), em ordem"""
+    if not os.path.isdir(diretorio):
+        return []
+    encontrados = []
+    for nome in os.listdir(diretorio):
+        casamento = _PADRAO.match(nome)
+        if casamento and casamento.group(1) == tipo:
+            encontrados.append((int(casamento.group(2)), os.path.join(diretorio, nome)))
+    return sorted(encontrados)
+
+
+def gravar_snapshot(caminho: str, estado: dict):
+    """Grava de forma atômica: arquivo temporário + fsync + rename"""
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        pickle.dump(estado, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+
+def ler_snapshot_mais_recente(diretorio: str) -> Tuple[Optional[int], Optional[dict]]:
+    """Retorna (número, estado) do snapshot válido mais recente, ou (None, None)"""
+    for numero, caminho in reversed(listar(diretorio, "snapshot")):
+        try:
+            with open(caminho, "rb") as arquivo:
+                return numero, pickle.load(arquivo)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            continue
+    return None, None
+
+
+def compactar(diretorio: str, numero: int):
+    """Remove segmentos e snapshots anteriores ao snapshot `numero`"""
+    for tipo in ("journal", "snapshot"):
+        for n, caminho in listar(diretorio, tipo):
+            if n < numero:
+                os.remove(caminho)
@@ -53,8 +53,8 @@ function initDashboard() {
             const div = document.createElement('div');
             div.className = 'agente';
             div.innerHTML = `
-                <h3>${agente.nome}</h3>
-                <p>Chamado atual: ${agente.chamado_atual || 'Nenhum'}</p>
+                <h3>${agente.nome} (${agente.status})</h3>
+                <p>Chamados (${agente.chamados.length}/${agente.capacidade}): ${agente.chamados.join(', ') || 'Nenhum'}</p>
             `;
             agentesDiv.appendChild(div);
         });
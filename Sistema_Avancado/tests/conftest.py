@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# Os módulos do sistema se importam pelo nome (from journal import Journal), como ao executar em Sistema_Avancado
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class Relogio:
+    """Relógio do SistemaChamados controlado pelo teste (epoch em segundos)"""
+
+    def __init__(self, inicio: float = 1_700_000_000.0):
+        self.agora = inicio
+
+    def __call__(self) -> float:
+        return self.agora
+
+
+@pytest.fixture
+def relogio() -> Relogio:
+    return Relogio()
@@ -0,0 +1,54 @@
+import pytest
+
+import Sistema_Chamadas as sc
+from admissao import LimitadorPorCliente
+
+
+def test_rajada_e_depois_a_taxa():
+    limitador = LimitadorPorCliente(taxa=1 / 60, rajada=3, max_clientes=10)
+    assert [limitador.consumir("acme", 0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limitador.consumir("acme", 0.0) == pytest.approx(60.0)
+    assert limitador.consumir("acme", 30.0) == pytest.approx(30.0)
+    assert limitador.consumir("acme", 60.0) == 0.0
+    # Outro cliente tem o próprio balde
+    assert limitador.consumir("outro", 60.0) == 0.0
+
+
+def test_balde_nao_passa_da_rajada():
+    limitador = LimitadorPorCliente(taxa=1.0, rajada=2, max_clientes=10)
+    limitador.consumir("acme", 0.0)
+    assert [limitador.consumir("acme", 1000.0) for _ in range(3)] == [0.0, 0.0, pytest.approx(1.0)]
+
+
+def test_memoria_limitada_descarta_o_menos_recente():
+    limitador = LimitadorPorCliente(taxa=1 / 60, rajada=1, max_clientes=2)
+    limitador.consumir("a", 0.0)
+    limitador.consumir("b", 1.0)
+    limitador.consumir("a", 2.0)  # "a" passa a ser o mais recente
+    limitador.consumir("c", 3.0)
+    assert len(limitador) == 2
+    # "b" saiu e volta com o balde cheio; "c" continua sem fichas
+    assert limitador.consumir("b", 4.0) == 0.0
+    assert limitador.consumir("c", 4.0) > 0
+
+
+def pedido(tipo_chamado, tipo_cliente, cliente="acme"):
+    return {"cliente_nome": cliente, "tipo_cliente": tipo_cliente.value,
+            "tipo_chamado": tipo_chamado.value, "descricao": "x"}
+
+
+def test_garantia_depende_tambem_do_tipo_de_cliente(monkeypatch):
+    monkeypatch.setattr(sc, "ADMISSAO_FILA_MAXIMA", 0)  # tudo o que não é garantido é recusado
+    server_down = sc.TipoChamado.SERVER_DOWN
+    assert sc._recusa_admissao(pedido(server_down, sc.TipoCliente.PRIORITARIO)) is None
+    assert sc._recusa_admissao(pedido(server_down, sc.TipoCliente.SEM_PRIORIDADE)) is None
+    assert sc._recusa_admissao(pedido(server_down, sc.TipoCliente.DEMONSTRACAO))[0] == "fila_cheia"
+    assert sc._recusa_admissao(pedido(sc.TipoChamado.DUVIDA, sc.TipoCliente.PRIORITARIO))[0] == "fila_cheia"
+
+
+@pytest.mark.parametrize("cliente", [["acme"], {"nome": "acme"}, 42, None])
+def test_cliente_que_nao_e_texto_da_400(cliente):
+    dados = pedido(sc.TipoChamado.DUVIDA, sc.TipoCliente.DEMONSTRACAO, cliente)
+    assert sc._recusa_admissao(dados) is None
+    resposta = sc.app.test_client().post("/api/chamados", json=dados)
+    assert resposta.status_code == 400
@@ -0,0 +1,20 @@
+import pytest
+
+from benchmark import ajustar
+
+TAMANHOS = (1_000, 10_000, 100_000, 1_000_000)
+
+
+def modelo(*microssegundos):
+    return ajustar([(n, t * 1e-6) for n, t in zip(TAMANHOS, microssegundos)])["modelo"]
+
+
+@pytest.mark.parametrize("tempos", [(40, 41, 40, 64), (50, 45, 48, 70), (73, 40, 41, 64), (50, 50, 50, 50)])
+def test_operacao_plana_com_ruido_fica_em_o1(tempos):
+    assert modelo(*tempos) == "O(1)"
+
+
+def test_crescimentos_reais():
+    assert modelo(18.8, 26.2, 43.6, 53.1) == "O(log n)"
+    assert modelo(1_800, 38_000, 200_000, 2_100_000) == "O(n)"
+    assert modelo(1, 100, 10_000, 1_000_000) == "O(n²)"
@@ -0,0 +1,39 @@
+import random
+
+from busca import IndiceInvertido, normalizar
+
+PALAVRAS = ["vpn", "vpn2", "vp", "login", "logica", "lentidão", "servidor", "serviço", "portal", "impressora"]
+
+
+def test_prefixo_no_ultimo_termo_sem_acentos():
+    indice = IndiceInvertido()
+    indice.adicionar("c1", "Lentidão no servidor", "acme")
+    indice.adicionar("c2", "VPN caiu", "acme")
+    assert indice.buscar("LENTIDAO serv") == {"c1"}
+    assert indice.buscar("acme vp") == {"c2"}
+    assert indice.buscar("acme") == {"c1", "c2"}
+    assert indice.buscar("vpn lent") == set()
+
+
+def test_equivale_a_busca_exaustiva_e_poda_o_vocabulario():
+    r = random.Random(39)
+    indice = IndiceInvertido()
+    indice._vocabulario.tamanho_bloco = 2  # força divisões e blocos esvaziados
+    documentos = {}
+    for passo in range(1500):
+        if documentos and r.random() < 0.45:
+            id_documento = r.choice(sorted(documentos))
+            indice.remover(id_documento, documentos.pop(id_documento))
+        else:
+            id_documento = f"c{passo}"
+            documentos[id_documento] = " ".join(r.sample(PALAVRAS, r.randint(1, 3))) + f" x{r.randrange(400)}"
+            indice.adicionar(id_documento, documentos[id_documento])
+        consulta = " ".join(r.sample(PALAVRAS, r.randint(0, 1)) + [r.choice(PALAVRAS + ["x1", "x"])[:r.randint(1, 4)]])
+        *exatos, prefixo = normalizar(consulta).split()
+        esperado = {
+            i for i, texto in documentos.items()
+            if set(exatos) <= set(normalizar(texto).split())
+            and any(t.startswith(prefixo) for t in normalizar(texto).split())
+        }
+        assert indice.buscar(consulta) == esperado
+        assert list(indice._vocabulario.a_partir("")) == sorted(indice._postagens)
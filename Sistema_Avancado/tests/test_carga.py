@@ -0,0 +1,42 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from carga import GeradorCarga
+
+
+class _Indisponivel(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor_indisponivel():
+    servidor = HTTPServer(("127.0.0.1", 0), _Indisponivel)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{servidor.server_port}"
+    servidor.shutdown()
+
+
+def porta_fechada() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+def test_erros_contados_por_causa(servidor_indisponivel):
+    gerador = GeradorCarga(servidor_indisponivel, {"novo_http": 1}, taxa=1, duracao=0, paineis=0, trabalhadores=1)
+    for _ in range(2):
+        gerador._executar("novo_http", time.perf_counter())
+    gerador.url = porta_fechada()
+    gerador._executar("novo_http", time.perf_counter())
+    assert gerador.contagens["novo_http"]["erro"] == 3
+    assert dict(gerador.erros["novo_http"]) == {"HTTP 503": 2, "ConnectionError": 1}
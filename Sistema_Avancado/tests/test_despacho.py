@@ -0,0 +1,63 @@
+from Sistema_Chamadas import MODELO_MIN_AMOSTRAS, AgenteSuporte, SistemaChamados, TipoChamado
+
+
+def abrir(sistema, descricao):
+    return sistema.adicionar_chamado({"cliente_nome": "acme", "tipo_cliente": "Sem prioridade",
+                                      "tipo_chamado": TipoChamado.DUVIDA.value, "descricao": descricao})
+
+
+def test_entre_notas_iguais_vai_para_o_agente_mais_rapido(relogio):
+    sistema = SistemaChamados(relogio=relogio, silencioso=True)
+    sistema.adicionar_agente(AgenteSuporte("a", "Lento", [TipoChamado.DUVIDA]))
+    sistema.adicionar_agente(AgenteSuporte("b", "Rápido", [TipoChamado.DUVIDA]))
+    for rodada in range(MODELO_MIN_AMOSTRAS):
+        lento, rapido = abrir(sistema, f"lento {rodada}"), abrir(sistema, f"rapido {rodada}")
+        sistema.despachar()
+        assert (lento.agente_atribuido, rapido.agente_atribuido) == ("a", "b")
+        relogio.agora += 5 * 60
+        sistema.finalizar_chamado(rapido.id_chamado)
+        relogio.agora += 25 * 60
+        sistema.finalizar_chamado(lento.id_chamado)
+
+    assert sistema.modelo.estimar_agente(TipoChamado.DUVIDA.value, "b") == 5 * 60
+    proximo = abrir(sistema, "próximo")
+    sistema.despachar()
+    assert proximo.agente_atribuido == "b"
+
+
+def test_a_ocupacao_pesa_junto_com_o_tempo(relogio):
+    sistema = SistemaChamados(relogio=relogio, silencioso=True)
+    sistema.adicionar_agente(AgenteSuporte("a", "Ana", [TipoChamado.DUVIDA], capacidade=2))
+    sistema.adicionar_agente(AgenteSuporte("b", "Bia", [TipoChamado.DUVIDA], capacidade=2))
+    primeiro, segundo = abrir(sistema, "um"), abrir(sistema, "dois")
+    sistema.despachar()
+    assert {primeiro.agente_atribuido, segundo.agente_atribuido} == {"a", "b"}
+
+
+def test_sair_de_novo_nao_muda_nada(tmp_path, relogio):
+    sistema = SistemaChamados(relogio=relogio, silencioso=True)
+    sistema.ativar_persistencia(str(tmp_path), fsync=False)
+    sistema.adicionar_agente(AgenteSuporte("a", "Ana", [TipoChamado.DUVIDA]))
+    assert sistema.sair_agente("a")
+    eventos = sistema.journal.registrados
+    assert not sistema.sair_agente("a")
+    assert not sistema.sair_agente("inexistente")
+    assert sistema.journal.registrados == eventos
+    sistema.journal.fechar()
+
+
+def test_espera_conta_so_o_primeiro_inicio(relogio):
+    sistema = SistemaChamados(relogio=relogio, silencioso=True)
+    sistema.adicionar_agente(AgenteSuporte("a", "Ana", [TipoChamado.DUVIDA, TipoChamado.SERVER_DOWN]))
+    duvida = abrir(sistema, "dúvida")
+    relogio.agora += 60
+    sistema.despachar()
+    relogio.agora += 10 * 60
+    urgente = sistema.adicionar_chamado({"cliente_nome": "acme", "tipo_cliente": "Sem prioridade",
+                                         "tipo_chamado": TipoChamado.SERVER_DOWN.value, "descricao": "caiu"})
+    assert urgente.agente_atribuido == "a" and duvida.agente_atribuido is None  # preempção
+    relogio.agora += 5 * 60
+    sistema.finalizar_chamado(urgente.id_chamado)
+    assert duvida.agente_atribuido == "a"
+    espera = sistema.estatisticas.espera
+    assert (espera.total, espera.soma) == (2, 60.0)
@@ -0,0 +1,51 @@
+import pytest
+
+from Sistema_Chamadas import SistemaChamados, TipoChamado
+
+
+def abrir(sistema, cliente, tipo_chamado, descricao="fora do ar"):
+    return sistema.adicionar_chamado({"cliente_nome": cliente, "tipo_cliente": "Sem prioridade",
+                                      "tipo_chamado": tipo_chamado.value, "descricao": descricao})
+
+
+def pendentes(sistema):
+    return sorted(c.id_chamado for c in sistema.chamados_na_fila())
+
+
+def novo_sistema(diretorio):
+    sistema = SistemaChamados()
+    sistema.ativar_persistencia(str(diretorio), fsync=False)
+    return sistema
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_equivalente_vira_ocorrencia_do_aberto_inclusive_apos_reiniciar(tmp_path, snapshot):
+    sistema = novo_sistema(tmp_path)
+    aberto = abrir(sistema, "acme", TipoChamado.SERVER_DOWN)
+    assert abrir(sistema, "acme", TipoChamado.SERVER_DOWN, "caiu de novo") is aberto
+    assert aberto.ocorrencias == 2
+    # Outro cliente, ou um tipo que não agrupa, abre chamado próprio
+    outro = abrir(sistema, "globex", TipoChamado.SERVER_DOWN)
+    duvida = abrir(sistema, "acme", TipoChamado.DUVIDA)
+    assert pendentes(sistema) == sorted([aberto.id_chamado, outro.id_chamado, duvida.id_chamado])
+    if snapshot:
+        sistema.salvar_snapshot()
+    sistema.journal.fechar()
+
+    recuperado = novo_sistema(tmp_path)
+    assert recuperado.chamados_ativos[aberto.id_chamado].ocorrencias == 2
+    assert pendentes(recuperado) == pendentes(sistema)
+    # O índice de abertos por cliente também volta: o próximo relato ainda agrupa
+    assert abrir(recuperado, "acme", TipoChamado.SERVER_DOWN).id_chamado == aberto.id_chamado
+    assert recuperado.chamados_ativos[aberto.id_chamado].ocorrencias == 3
+    assert len(pendentes(recuperado)) == 3
+    recuperado.journal.fechar()
+
+
+def test_resolvido_nao_absorve():
+    sistema = SistemaChamados()
+    aberto = abrir(sistema, "acme", TipoChamado.SERVER_DOWN)
+    sistema.processar_proximo_chamado()
+    sistema.finalizar_chamado(aberto.id_chamado)
+    novo = abrir(sistema, "acme", TipoChamado.SERVER_DOWN)
+    assert novo.id_chamado != aberto.id_chamado and novo.ocorrencias == 1
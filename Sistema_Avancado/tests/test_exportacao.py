@@ -0,0 +1,48 @@
+import csv
+import gzip
+import io
+from datetime import datetime, timezone
+
+import pytest
+
+from exportacao import blocos_csv, blocos_gzip, exportar_parquet
+from repositorio import COLUNAS
+
+CRIADO = datetime(2024, 5, 1, 11, 0, 5, tzinfo=timezone.utc).timestamp()
+
+
+def registro(**valores):
+    return tuple(valores.get(coluna) for coluna in COLUNAS)
+
+
+REGISTROS = [
+    registro(id="c1", cliente="acme", tipo_cliente="Sem prioridade", tipo_chamado="Dúvida", descricao="x",
+             status="Resolvido", criado_em=CRIADO, agente="ag1", inicio_atendimento=CRIADO + 60,
+             resolvido_em=CRIADO + 125),
+    registro(id="c2", cliente="acme", tipo_cliente="Sem prioridade", tipo_chamado="Dúvida", descricao="x",
+             status="Pendente", criado_em=CRIADO + 1, prioridade_manual=2),
+]
+
+
+def test_csv_em_utc():
+    linhas = list(csv.DictReader(io.StringIO("".join(blocos_csv(REGISTROS, tamanho_bloco=1)))))
+    assert [linha["id"] for linha in linhas] == ["c1", "c2"]
+    assert linhas[0]["criado_em"] == "2024-05-01T11:00:05Z"
+    assert linhas[0]["resolvido_em"] == "2024-05-01T11:02:10Z"
+    assert linhas[1]["inicio_atendimento"] == ""
+
+
+def test_gzip_descompacta_no_csv():
+    texto = "".join(blocos_csv(REGISTROS))
+    assert gzip.decompress(b"".join(blocos_gzip(iter([texto])))).decode("utf-8") == texto
+
+
+def test_parquet_e_csv_dao_o_mesmo_instante(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    destino = str(tmp_path / "historico.parquet")
+    assert exportar_parquet(REGISTROS, destino) == 2
+    tabela = pq.read_table(destino)
+    assert tabela.column_names == list(COLUNAS)
+    assert str(tabela.schema.field("criado_em").type) == "timestamp[ms, tz=UTC]"
+    assert tabela.column("criado_em")[0].as_py() == datetime(2024, 5, 1, 11, 0, 5, tzinfo=timezone.utc)
+    assert tabela.column("inicio_atendimento")[1].as_py() is None
@@ -0,0 +1,48 @@
+from Sistema_Chamadas import AgenteSuporte, SistemaChamados, TipoChamado
+
+
+def abrir(sistema, cliente, tipo_chamado=TipoChamado.DUVIDA):
+    return sistema.adicionar_chamado({"cliente_nome": cliente, "tipo_cliente": "Sem prioridade",
+                                      "tipo_chamado": tipo_chamado.value, "descricao": f"{cliente} {tipo_chamado.value}"})
+
+
+def entradas(sistema):
+    return sum(map(len, sistema.filas.values()))
+
+
+def em_ordem(sistema):
+    return [c.id_chamado for c in sistema._fila_em_ordem()]
+
+
+def test_escalar_reposiciona_sem_reconstruir(relogio):
+    sistema = SistemaChamados(relogio=relogio, silencioso=True)
+    primeiro, segundo, terceiro = (abrir(sistema, cliente) for cliente in ("acme", "globex", "initech"))
+    assert sistema.escalar_chamado(terceiro.id_chamado, 1)
+    assert em_ordem(sistema) == [terceiro.id_chamado, primeiro.id_chamado, segundo.id_chamado]
+    # A entrada antiga continua no heap, obsoleta, até chegar ao topo ou a fila ser compactada
+    assert sistema.tamanho_fila == 3 and entradas(sistema) == 4
+    assert sistema.processar_proximo_chamado() is terceiro
+    assert em_ordem(sistema) == [primeiro.id_chamado, segundo.id_chamado]
+
+
+def test_obsoletas_sao_compactadas(relogio):
+    sistema = SistemaChamados(relogio=relogio, silencioso=True)
+    chamados = [abrir(sistema, f"cliente{i}") for i in range(100)]
+    for rodada in range(10):
+        for i, chamado in enumerate(chamados):
+            sistema.escalar_chamado(chamado.id_chamado, 1 + (i + rodada) % 2)
+            assert entradas(sistema) <= 2 * sistema.tamanho_fila + 65
+    assert em_ordem(sistema) == [c.id_chamado for c in sorted(chamados, key=sistema._chave_fila)]
+
+
+def test_vaga_liberada_recebe_o_primeiro_compativel(relogio):
+    sistema = SistemaChamados(relogio=relogio, silencioso=True)
+    sistema.adicionar_agente(AgenteSuporte("a", "Ana", [TipoChamado.DUVIDA]))
+    atual = abrir(sistema, "acme")
+    sistema.despachar()
+    outro_tipo = abrir(sistema, "globex", TipoChamado.SEM_IMPACTO)
+    duvida = abrir(sistema, "initech")
+    assert sistema.finalizar_chamado(atual.id_chamado)
+    assert duvida.agente_atribuido == "a"
+    assert em_ordem(sistema) == [outro_tipo.id_chamado]
+    assert [c.id_chamado for c in sistema.chamados_na_fila()] == [outro_tipo.id_chamado]
@@ -0,0 +1,39 @@
+from fila_justa import FilaJusta
+
+
+def test_terminos_de_um_cliente_se_acumulam():
+    fila = FilaJusta()
+    assert fila.marcar(4, "ruidoso", 100.0, 60, 0.5) == 220.0
+    assert fila.marcar(4, "ruidoso", 100.0, 60, 0.5) == 340.0
+    # Outro cliente parte da própria chegada
+    assert fila.marcar(4, "outro", 110.0, 60, 0.5) == 230.0
+    # Cada classe de prioridade tem os seus términos
+    assert fila.marcar(1, "ruidoso", 100.0, 60, 1.0) == 160.0
+
+
+def test_chegada_depois_do_ultimo_termino_recomeca_dela():
+    fila = FilaJusta()
+    fila.marcar(4, "c", 0.0, 10, 1.0)
+    assert fila.marcar(4, "c", 50.0, 10, 1.0) == 60.0
+
+
+def test_retirar_so_esquece_o_ultimo_termino():
+    fila = FilaJusta()
+    primeiro = fila.marcar(4, "c", 0.0, 100, 1.0)
+    ultimo = fila.marcar(4, "c", 0.0, 100, 1.0)
+    fila.retirar(4, "c", primeiro)
+    assert len(fila) == 1
+    fila.retirar(4, "c", ultimo)
+    assert len(fila) == 0
+    assert fila.marcar(4, "c", 10.0, 100, 1.0) == 110.0
+
+
+def test_estado_e_carregar():
+    fila = FilaJusta()
+    fila.marcar(4, "a", 0.0, 30, 0.25)
+    fila.marcar(2, "b", 5.0, 60, 1.0)
+    copia = FilaJusta()
+    copia.carregar(fila.estado())
+    assert copia.marcar(4, "a", 0.0, 30, 0.25) == fila.marcar(4, "a", 0.0, 30, 0.25)
+    fila.limpar()
+    assert len(fila) == 0
@@ -0,0 +1,47 @@
+import random
+
+from heap_indexado import HeapIndexado
+
+
+def test_topo_e_a_menor_chave():
+    heap = HeapIndexado()
+    assert heap.topo() is None
+    heap.definir("a", 5)
+    heap.definir("b", 3)
+    heap.definir("c", 8)
+    assert heap.topo() == (3, "b")
+    heap.definir("c", 1)
+    assert heap.topo() == (1, "c")
+    assert heap.chave("a") == 5 and heap.chave("x") is None
+    assert "a" in heap and len(heap) == 3
+
+
+def test_remover_item_qualquer():
+    heap = HeapIndexado()
+    for item, chave in (("a", 1), ("b", 2), ("c", 3)):
+        heap.definir(item, chave)
+    assert heap.remover("a")
+    assert not heap.remover("a")
+    assert heap.topo() == (2, "b")
+    heap.limpar()
+    assert len(heap) == 0 and heap.topo() is None
+
+
+def test_equivale_a_um_dicionario():
+    r = random.Random(46)
+    heap = HeapIndexado()
+    referencia = {}
+    for _ in range(20_000):
+        item = r.randrange(300)
+        if r.random() < 0.6:
+            chave = (r.randrange(5), r.random())
+            heap.definir(item, chave)
+            referencia[item] = chave
+        else:
+            assert heap.remover(item) == (item in referencia)
+            referencia.pop(item, None)
+        assert len(heap) == len(referencia)
+        if referencia:
+            menor = min(referencia.items(), key=lambda par: par[1])
+            assert heap.topo() == (menor[1], menor[0])
+    assert sorted(heap) == sorted((chave, item) for item, chave in referencia.items())
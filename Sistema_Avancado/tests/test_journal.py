@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from journal import MAGICO, Journal
+
+
+def test_grava_e_le_em_ordem(tmp_path):
+    caminho = str(tmp_path / "journal.bin")
+    journal = Journal(caminho, lote=3, fsync=False)
+    eventos = [("chamado", float(i), ({"id": i},)) for i in range(10)]
+    for evento in eventos:
+        journal.registrar(evento)
+    journal.fechar()
+    assert list(Journal.ler(caminho)) == eventos
+
+
+def test_aguardar_espera_o_lote_chegar_ao_disco(tmp_path):
+    caminho = str(tmp_path / "journal.bin")
+    journal = Journal(caminho, lote=1000, latencia=0.01, sincrono=True, fsync=False)
+    journal.registrar(("processar", 1.0, ()))
+    # O lote não enche: é gravado quando o registro completa `latencia` segundos
+    journal.aguardar()
+    assert list(Journal.ler(caminho, truncar_corrompido=False)) == [("processar", 1.0, ())]
+    journal.fechar()
+
+
+def test_registro_final_incompleto_e_truncado(tmp_path):
+    caminho = str(tmp_path / "journal.bin")
+    journal = Journal(caminho, fsync=False)
+    journal.registrar(("a", 1.0, ()))
+    journal.registrar(("b", 2.0, ()))
+    journal.fechar()
+    tamanho = os.path.getsize(caminho)
+    with open(caminho, "ab") as arquivo:
+        arquivo.write(b"\x10\x00\x00\x00lixo")  # queda no meio de uma escrita
+
+    assert list(Journal.ler(caminho)) == [("a", 1.0, ()), ("b", 2.0, ())]
+    assert os.path.getsize(caminho) == tamanho
+
+
+def test_crc_invalido_encerra_a_leitura(tmp_path):
+    caminho = str(tmp_path / "journal.bin")
+    journal = Journal(caminho, fsync=False)
+    journal.registrar(("a", 1.0, ()))
+    journal.registrar(("b", 2.0, ()))
+    journal.fechar()
+    with open(caminho, "r+b") as arquivo:
+        arquivo.seek(-1, os.SEEK_END)
+        arquivo.write(b"\xff")
+
+    assert list(Journal.ler(caminho)) == [("a", 1.0, ())]
+
+
+def test_rotacionar_separa_os_eventos(tmp_path):
+    antigo, novo = str(tmp_path / "journal.1.bin"), str(tmp_path / "journal.2.bin")
+    journal = Journal(antigo, fsync=False)
+    journal.registrar(("antes", 1.0, ()))
+    journal.rotacionar(novo)
+    journal.registrar(("depois", 2.0, ()))
+    journal.fechar()
+
+    assert list(Journal.ler(antigo)) == [("antes", 1.0, ())]
+    assert list(Journal.ler(novo)) == [("depois", 2.0, ())]
+    with open(novo, "rb") as arquivo:
+        assert arquivo.read(len(MAGICO)) == MAGICO
+
+
+def test_erro_de_escrita_solta_quem_aguarda(tmp_path, monkeypatch):
+    journal = Journal(str(tmp_path / "journal.bin"), lote=1, sincrono=True, fsync=False)
+
+    def gravar_falhando(lote):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(journal, "_gravar", gravar_falhando)
+    journal.registrar(("processar", 1.0, ()))
+    with pytest.raises(OSError, match="parado"):
+        journal.aguardar()
+    with pytest.raises(OSError):
+        journal.verificar()
+    journal.fechar()
@@ -0,0 +1,53 @@
+import json
+import time
+
+from log_estruturado import LogEstruturado
+
+
+def linhas(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return [json.loads(linha) for linha in arquivo]
+
+
+def test_criar_nao_abre_thread_nem_arquivo(tmp_path):
+    log = LogEstruturado(str(tmp_path / "app.log"), console=False)
+    assert log._thread is None and not (tmp_path / "app.log").exists()
+    log.info("primeiro")
+    log.fechar()
+    assert [dados["evento"] for dados in linhas(tmp_path / "app.log")] == ["primeiro"]
+
+
+def test_fila_cheia_descarta_e_conta(tmp_path, monkeypatch):
+    log = LogEstruturado(str(tmp_path / "app.log"), console=False, max_fila=2)
+    # Segura a thread de escrita para a fila encher
+    monkeypatch.setattr(log, "_iniciar_thread", lambda: None)
+    for i in range(5):
+        log.info("evento", id=i)
+    assert log.descartados == 3
+    monkeypatch.undo()
+    log._iniciar_thread()
+    log.fechar()
+    gravadas = linhas(tmp_path / "app.log")
+    assert [dados.get("id") for dados in gravadas[:2]] == [0, 1]
+    assert gravadas[2]["evento"] == "registros_descartados" and gravadas[2]["total"] == 3
+
+
+def test_lote_com_erro_nao_para_a_escrita(tmp_path, monkeypatch, capsys):
+    log = LogEstruturado(str(tmp_path / "app.log"), console=False)
+    escrever = log._escrever
+    falhas = []
+
+    def escrever_falhando_uma_vez(linhas_lote):
+        if not falhas:
+            falhas.append(linhas_lote)
+            raise OSError("disco cheio")
+        escrever(linhas_lote)
+
+    monkeypatch.setattr(log, "_escrever", escrever_falhando_uma_vez)
+    log.info("perdido")
+    while not falhas:
+        time.sleep(0.001)
+    log.info("gravado")
+    log.fechar()
+    assert [dados["evento"] for dados in linhas(tmp_path / "app.log")] == ["gravado"]
+    assert "disco cheio" in capsys.readouterr().err
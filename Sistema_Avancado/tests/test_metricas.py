@@ -0,0 +1,57 @@
+import math
+import re
+
+import Sistema_Chamadas as sc
+from metricas import LIMITES_LATENCIA
+
+_AMOSTRA = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+_ROTULO = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def ler_exposicao(texto):
+    """Formato texto do Prometheus -> ({nome: tipo}, [(nome, rótulos, valor)])"""
+    tipos, amostras = {}, []
+    for linha in texto.splitlines():
+        if linha.startswith("# TYPE "):
+            _, _, nome, tipo = linha.split(" ")
+            tipos[nome] = tipo
+        elif linha and not linha.startswith("#"):
+            nome, rotulos, valor = _AMOSTRA.match(linha).groups()
+            amostras.append((nome, dict(_ROTULO.findall(rotulos or "")), float(valor)))
+    return tipos, amostras
+
+
+def serie(amostras, nome, **rotulos):
+    return [(r, valor) for n, r, valor in amostras if n == nome and rotulos.items() <= r.items()]
+
+
+def test_metrics_no_formato_do_prometheus():
+    cliente = sc.app.test_client()
+    resposta = cliente.post("/api/chamados", json={"cliente_nome": "metricas", "tipo_cliente": "Sem prioridade",
+                                                   "tipo_chamado": "Dúvida", "descricao": "coleta"})
+    assert resposta.status_code == 201
+    resposta = cliente.get("/metrics")
+    assert resposta.status_code == 200
+    assert resposta.mimetype == "text/plain"
+    tipos, amostras = ler_exposicao(resposta.get_data(as_text=True))
+
+    assert tipos["http_requisicao_segundos"] == "histogram"
+    assert tipos["fila_chamados"] == "gauge"
+    # Toda amostra pertence a uma métrica declarada
+    for nome, _, _ in amostras:
+        assert re.sub(r"_(bucket|sum|count)$", "", nome) in tipos
+
+    rotulos = {"rota": "/api/chamados", "metodo": "POST", "status": "201"}
+    baldes = serie(amostras, "http_requisicao_segundos_bucket", **rotulos)
+    limites = [float(r["le"]) for r, _ in baldes]
+    acumulados = [valor for _, valor in baldes]
+    assert limites == sorted(limites) and limites[-1] == math.inf
+    assert limites[:-1] == list(LIMITES_LATENCIA)
+    assert acumulados == sorted(acumulados) and acumulados[-1] >= 1
+    [(_, contagem)] = serie(amostras, "http_requisicao_segundos_count", **rotulos)
+    [(_, soma)] = serie(amostras, "http_requisicao_segundos_sum", **rotulos)
+    assert contagem == acumulados[-1] and soma > 0
+
+    assert serie(amostras, "sistema_operacao_segundos_count", operacao="adicionar_chamado")
+    [(_, fila)] = serie(amostras, "fila_chamados")
+    assert fila >= 1
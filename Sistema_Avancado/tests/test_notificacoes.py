@@ -0,0 +1,75 @@
+import time
+
+from notificacoes import AgregadorNotificacoes
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self) -> float:
+        return self.agora
+
+
+def novo_agregador(**opcoes):
+    relogio, enviados = Relogio(), []
+    agregador = AgregadorNotificacoes(lambda titulo, mensagem: enviados.append((titulo, mensagem)),
+                                      relogio=relogio, **opcoes)
+    return agregador, relogio, enviados
+
+
+def enviados_apos_descarregar(agregador, enviados, esperados):
+    """A thread do agregador também envia: espera os `esperados` chegarem"""
+    agregador.descarregar()
+    limite = time.monotonic() + 2
+    while len(enviados) < esperados and time.monotonic() < limite:
+        time.sleep(0.005)
+    return [titulo for titulo, _ in enviados]
+
+
+def test_duplicada_vira_resumo():
+    agregador, relogio, enviados = novo_agregador(janela=60)
+    for _ in range(2):
+        agregador.registrar("novo", "VPN", "acme", "Novo chamado", "acme: VPN caiu")
+    assert enviados_apos_descarregar(agregador, enviados, 1) == ["Novo chamado"]
+    relogio.agora = 60
+    assert enviados_apos_descarregar(agregador, enviados, 2) == ["Novo chamado", "Resumo: Novo chamado"]
+    assert "2 notificações" in enviados[-1][1]
+
+
+def test_agrupa_por_categoria_e_assunto():
+    agregador, relogio, enviados = novo_agregador(janela=60, max_individuais=2)
+    for cliente in ("a", "b", "c", "d"):
+        agregador.registrar("novo", "VPN", cliente, "Novo chamado", f"{cliente}: VPN caiu")
+    agregador.registrar("novo", "Login", "a", "Novo chamado", "a: login")
+    assert len(enviados_apos_descarregar(agregador, enviados, 3)) == 3
+    relogio.agora = 59
+    assert len(enviados_apos_descarregar(agregador, enviados, 3)) == 3
+    relogio.agora = 60
+    # Só o grupo com suprimidos gera resumo
+    assert enviados_apos_descarregar(agregador, enviados, 4)[3:] == ["Resumo: Novo chamado"]
+    assert "4 notificações" in enviados[3][1] and "de 4 clientes" in enviados[3][1]
+
+
+def test_limite_por_minuto_entre_grupos():
+    agregador, relogio, enviados = novo_agregador(janela=600, max_por_minuto=2)
+    for assunto in ("VPN", "Login", "Portal"):
+        agregador.registrar("novo", assunto, "acme", "Novo chamado", assunto)
+    assert len(enviados_apos_descarregar(agregador, enviados, 2)) == 2
+    relogio.agora = 60
+    agregador.registrar("novo", "Impressora", "acme", "Novo chamado", "Impressora")
+    assert len(enviados_apos_descarregar(agregador, enviados, 3)) == 3
+
+
+def test_resumo_conta_no_limite_por_minuto():
+    agregador, relogio, enviados = novo_agregador(janela=30, max_individuais=1, max_por_minuto=2)
+    agregador.registrar("novo", "VPN", "a", "Novo chamado", "a: VPN caiu")
+    agregador.registrar("novo", "VPN", "b", "Novo chamado", "b: VPN caiu")
+    agregador.registrar("novo", "Login", "a", "Novo chamado", "a: login")
+    assert len(enviados_apos_descarregar(agregador, enviados, 2)) == 2
+    # A janela de VPN fecha, mas o minuto já tem dois envios: o resumo espera
+    relogio.agora = 30
+    assert len(enviados_apos_descarregar(agregador, enviados, 2)) == 2
+    relogio.agora = 60
+    assert enviados_apos_descarregar(agregador, enviados, 3)[2:] == ["Resumo: Novo chamado"]
+    assert "2 notificações" in enviados[2][1]
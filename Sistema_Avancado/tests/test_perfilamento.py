@@ -0,0 +1,42 @@
+import pytest
+
+import Sistema_Chamadas as sc
+
+ROTAS_ADMIN = ["/admin/perfil/requisicoes", "/admin/perfil/memoria", "/admin/perfil/cpu?segundos=0.01"]
+
+
+@pytest.fixture
+def cliente(monkeypatch):
+    monkeypatch.setattr(sc, "TOKEN_ADMIN", "segredo")
+    return sc.app.test_client()
+
+
+@pytest.mark.parametrize("rota", ROTAS_ADMIN)
+@pytest.mark.parametrize("cabecalhos", [{}, {"X-Token-Admin": "errado"}, {"X-Token-Admin": ""}])
+def test_sem_o_token_certo_da_403(cliente, rota, cabecalhos):
+    assert cliente.get(rota, headers=cabecalhos).status_code == 403
+
+
+def test_com_o_token_libera(cliente):
+    admin = {"X-Token-Admin": "segredo"}
+    assert cliente.get("/admin/perfil/requisicoes", headers=admin).status_code == 200
+    assert cliente.get("/admin/perfil/cpu?segundos=0.01", headers=admin).status_code == 200
+
+
+def test_perfil_de_requisicao_so_para_admin(cliente):
+    assert "X-Perfil-Id" not in cliente.get("/api/chamados", headers={"X-Perfilar": "1"}).headers
+    admin = {"X-Token-Admin": "segredo"}
+    resposta = cliente.get("/api/chamados", headers={"X-Perfilar": "1", **admin})
+    id_perfil = resposta.headers["X-Perfil-Id"]
+    assert cliente.get(f"/admin/perfil/requisicoes/{id_perfil}").status_code == 403
+    baixado = cliente.get(f"/admin/perfil/requisicoes/{id_perfil}?formato=texto", headers=admin)
+    assert baixado.status_code == 200 and baixado.mimetype == "text/plain"
+
+
+@pytest.mark.parametrize("token", [None, ""])
+def test_sem_a_variavel_de_ambiente_fica_desativado(monkeypatch, token):
+    monkeypatch.setattr(sc, "TOKEN_ADMIN", token)
+    cliente = sc.app.test_client()
+    for cabecalhos in ({}, {"X-Token-Admin": ""}, {"X-Token-Admin": "segredo"}):
+        assert cliente.get("/admin/perfil/requisicoes", headers=cabecalhos).status_code == 403
+        assert "X-Perfil-Id" not in cliente.get("/api/chamados", headers={"X-Perfilar": "1", **cabecalhos}).headers
@@ -0,0 +1,139 @@
+import random
+
+import pytest
+
+import Sistema_Chamadas as sc
+from Sistema_Chamadas import AgenteSuporte, SistemaChamados, TipoChamado, TipoCliente
+from snapshot import listar
+
+CLIENTES = [f"cliente{i}" for i in range(15)]
+DESCRICOES = ["vpn caiu", "erro no login do portal", "impressora sem papel", "lentidão no servidor de arquivos"]
+
+
+def novo_sistema(relogio, diretorio) -> SistemaChamados:
+    sistema = SistemaChamados(relogio=relogio, silencioso=True)
+    sistema.ativar_persistencia(str(diretorio), fsync=False)
+    return sistema
+
+
+def cadastrar_agentes(sistema: SistemaChamados):
+    sistema.adicionar_agente(AgenteSuporte(
+        "ag1", "Ana", [TipoChamado.SERVER_DOWN, TipoChamado.IMPACTA_PRODUCAO]))
+    sistema.adicionar_agente(AgenteSuporte(
+        "ag2", "Bia", list(TipoChamado), capacidade=2,
+        proficiencias={TipoChamado.SERVER_DOWN: 0.6, TipoChamado.IMPACTA_PRODUCAO: 0.8}))
+    sistema.adicionar_agente(AgenteSuporte(
+        "ag3", "Caio", [TipoChamado.SEM_IMPACTO, TipoChamado.DUVIDA], capacidade=3))
+
+
+def operar(sistema: SistemaChamados, relogio, semente: int, operacoes: int):
+    """Carga aleatória com todas as operações do journal, preempção, devoluções à fila e SLA"""
+    r = random.Random(semente)
+    tipos_chamado = [t.value for t in TipoChamado]
+    tipos_cliente = [t.value for t in TipoCliente]
+    for _ in range(operacoes):
+        relogio.agora += r.expovariate(1 / 45)
+        sorteio = r.random()
+        ativos = sorted(sistema.chamados_ativos)
+        if sorteio < 0.45:
+            sistema.adicionar_chamado({
+                "cliente_nome": r.choice(CLIENTES),
+                "tipo_cliente": r.choice(tipos_cliente),
+                "tipo_chamado": r.choices(tipos_chamado, (1, 2, 4, 4))[0],
+                "descricao": r.choice(DESCRICOES)
+            })
+        elif sorteio < 0.65:
+            em_atendimento = sorted(sistema.chamados_em_atendimento)
+            if em_atendimento:
+                sistema.finalizar_chamado(r.choice(em_atendimento))
+        elif sorteio < 0.72:
+            sistema.processar_proximo_chamado()
+        elif sorteio < 0.77 and ativos:
+            sistema.escalar_chamado(r.choice(ativos), r.randint(1, 4))
+        elif sorteio < 0.81 and ativos:
+            sistema.atribuir_agente(r.choice(ativos), r.choice(sorted(sistema.agentes)))
+        elif sorteio < 0.87:
+            agente = r.choice(sorted(sistema.agentes))
+            r.choice((sistema.pausar_agente, sistema.entrar_agente, sistema.sair_agente))(agente)
+        elif sorteio < 0.9:
+            sistema.despachar()
+        sistema.verificar_sla(relogio.agora)
+
+
+def estado(sistema: SistemaChamados) -> dict:
+    """Tudo o que decide as próximas operações, em forma comparável"""
+    return {
+        "fila": [(c.id_chamado, sistema._chave_fila(c)) for c in sistema._fila_em_ordem()],
+        "chamados": {
+            id_chamado: (c.status, c.agente_atribuido, c.prioridade_manual, c.ocorrencias, c.timestamp,
+                         c.inicio_atendimento, c.tempo_estimado, c.ordem, c.termino_virtual, c.atendido)
+            for id_chamado, c in sistema.chamados_ativos.items()
+        },
+        "em_atendimento": sorted(sistema.chamados_em_atendimento),
+        "agentes": {a.id: (list(a.chamados), a.status, a.capacidade) for a in sistema.agentes.values()},
+        "livres": {tipo: sorted(heap) for tipo, heap in sistema.agentes_livres.items()},
+        "interrompiveis": {tipo: sorted(heap) for tipo, heap in sistema.interrompiveis.items()},
+        "ultimo_id": sistema.ultimo_id,
+        "contador": sistema.contador,
+        "fila_justa": sorted(sistema.fila_justa.estado()),
+        "a_frente": sistema.a_frente.trabalhos(),
+        "modelo": sistema.modelo.estado(),
+        "pendentes": (sistema.estatisticas.fila_por_tipo_chamado, sistema.estatisticas.fila_por_tipo_cliente,
+                      sistema.estatisticas.em_atendimento)
+    }
+
+
+@pytest.fixture(params=[False, True], ids=["fila_prioridade", "fila_justa"])
+def fila_justa(request, monkeypatch):
+    monkeypatch.setattr(sc, "FILA_JUSTA", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("semente", [1, 2, 3])
+def test_journal_completo_reproduz_o_estado(tmp_path, relogio, fila_justa, semente):
+    vivo = novo_sistema(relogio, tmp_path)
+    cadastrar_agentes(vivo)
+    operar(vivo, relogio, semente, 1500)
+    vivo.journal.fechar()
+
+    recuperado = novo_sistema(relogio, tmp_path)
+    assert estado(recuperado) == estado(vivo)
+    recuperado.journal.fechar()
+
+
+@pytest.mark.parametrize("semente", [1, 2, 3])
+def test_snapshot_e_cauda_do_journal_reproduzem_o_estado(tmp_path, relogio, fila_justa, semente):
+    vivo = novo_sistema(relogio, tmp_path)
+    cadastrar_agentes(vivo)
+    operar(vivo, relogio, semente, 1500)
+    assert vivo.salvar_snapshot() is not None
+    operar(vivo, relogio, semente + 100, 1500)
+    vivo.journal.fechar()
+
+    recuperado = novo_sistema(relogio, tmp_path)
+    assert estado(recuperado) == estado(vivo)
+    # E continua igual com as mesmas operações sobre os dois
+    inicio = relogio.agora
+    vivo.journal = None
+    operar(vivo, relogio, semente + 200, 500)
+    relogio.agora = inicio
+    operar(recuperado, relogio, semente + 200, 500)
+    assert estado(recuperado) == estado(vivo)
+    recuperado.journal.fechar()
+
+
+def test_snapshot_compacta_o_journal(tmp_path, relogio):
+    vivo = novo_sistema(relogio, tmp_path)
+    cadastrar_agentes(vivo)
+    operar(vivo, relogio, 7, 300)
+    numero = vivo.salvar_snapshot()
+    operar(vivo, relogio, 8, 50)
+    vivo.journal.fechar()
+
+    assert [n for n, _ in listar(str(tmp_path), "snapshot")] == [numero]
+    assert min(n for n, _ in listar(str(tmp_path), "journal")) == numero
+    recuperado = SistemaChamados(relogio=relogio, silencioso=True)
+    # Só a cauda posterior ao snapshot é reaplicada
+    assert recuperado.ativar_persistencia(str(tmp_path), fsync=False) < 300
+    assert estado(recuperado) == estado(vivo)
+    recuperado.journal.fechar()
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from previsao import SomaOrdenada, TrabalhoAFrente, Vagas
+from Sistema_Chamadas import AgenteSuporte, SistemaChamados, TipoChamado
+
+
+def test_soma_ordenada_equivale_a_lista_ordenada():
+    r = random.Random(37)
+    soma = SomaOrdenada(tamanho_bloco=2)  # força divisões e blocos esvaziados
+    referencia = {}
+    for passo in range(3000):
+        if referencia and r.random() < 0.4:
+            chave = r.choice(sorted(referencia))
+            assert soma.remover(chave) == referencia.pop(chave)
+        else:
+            chave = (r.randrange(5), passo)
+            referencia[chave] = float(r.randrange(1, 100))
+            soma.inserir(chave, referencia[chave])
+        consulta = (r.randrange(6), r.randrange(passo + 1))
+        assert soma.soma_antes(consulta) == sum(p for c, p in referencia.items() if c < consulta)
+        assert len(soma) == len(referencia)
+    esperado, total = [], 0.0
+    for chave in sorted(referencia):
+        esperado.append((chave, total))
+        total += referencia[chave]
+    assert list(soma.acumulados()) == esperado
+
+
+def test_trabalho_a_frente_por_tipo():
+    a_frente = TrabalhoAFrente()
+    a_frente.enfileirar("c1", "duvida", (4, 10.0, "c1"), 900.0)
+    a_frente.enfileirar("c2", "duvida", (4, 20.0, "c2"), 900.0)
+    a_frente.enfileirar("c3", "server", (1, 30.0, "c3"), 7200.0)
+    a_frente.enfileirar("c4", "duvida", (4, 30.0, "c4"), 900.0)
+    assert [a_frente.trabalho(c) for c in ("c1", "c2", "c3", "c4")] == [0.0, 900.0, 0.0, 1800.0]
+    # Escalado: passa à frente dos do mesmo tipo
+    a_frente.enfileirar("c4", "duvida", (1, 30.0, "c4"), 900.0)
+    assert (a_frente.trabalho("c4"), a_frente.trabalho("c1")) == (0.0, 900.0)
+    a_frente.retirar("c4")
+    assert "c4" not in a_frente and a_frente.trabalho("c4") is None
+    assert a_frente.trabalhos() == {"c1": ("duvida", 0.0), "c2": ("duvida", 900.0), "c3": ("server", 0.0)}
+
+
+def test_vagas_livres_antes_das_ocupadas():
+    assert Vagas([5.0, 0.0], ()).espera(0) == 0
+    assert Vagas([0.0, 5.0], ()).espera(10) == 7.5
+    assert Vagas([5.0, 5.0], ()).espera(0) == 5
+    assert Vagas([], ()).espera(1) is None
+
+
+def test_vagas_equivale_a_busca_binaria():
+    r = random.Random(37)
+    for _ in range(200):
+        liberacoes = [r.choice((0.0, r.uniform(0, 600))) for _ in range(r.randint(1, 8))]
+        trabalho = r.uniform(0, 3000)
+        baixo, alto = 0.0, 10_000.0
+        for _ in range(100):
+            meio = (baixo + alto) / 2
+            if sum(max(0.0, meio - liberacao) for liberacao in liberacoes) < trabalho:
+                baixo = meio
+            else:
+                alto = meio
+        esperado = max(alto, min(liberacoes))
+        assert Vagas(liberacoes, ()).espera(trabalho) == pytest.approx(esperado)
+
+
+def abrir(sistema, id_chamado, tipo_chamado):
+    return sistema.adicionar_chamado({"id_chamado": id_chamado, "cliente_nome": "acme",
+                                      "tipo_cliente": "Sem prioridade",
+                                      "tipo_chamado": tipo_chamado.value, "descricao": f"chamado {id_chamado}"})
+
+
+def test_espera_conta_os_tipos_que_disputam_o_agente(relogio):
+    sistema = SistemaChamados(relogio=relogio, silencioso=True)
+    sistema.adicionar_agente(AgenteSuporte("ag1", "Ana", [TipoChamado.IMPACTA_PRODUCAO, TipoChamado.DUVIDA]))
+    sistema.adicionar_agente(AgenteSuporte("ag2", "Bia", [TipoChamado.SEM_IMPACTO]))
+    em_curso = abrir(sistema, "em-curso", TipoChamado.DUVIDA)
+    abrir(sistema, "outro-agente", TipoChamado.SEM_IMPACTO)
+    sistema.despachar()
+    sem_impacto = abrir(sistema, "s", TipoChamado.SEM_IMPACTO)
+    # Mesmo instante: o desempate é a ordem de chegada, não o id
+    z = abrir(sistema, "z", TipoChamado.DUVIDA)
+    a = abrir(sistema, "a", TipoChamado.DUVIDA)
+    producao = abrir(sistema, "ip", TipoChamado.IMPACTA_PRODUCAO)
+    assert em_curso.agente_atribuido == "ag1"
+
+    def estimado(chamado):
+        return chamado.tempo_estimado.total_seconds()
+
+    esperado = {
+        "s": estimado(sistema.chamados_ativos["outro-agente"]),
+        "ip": estimado(em_curso),
+        "z": estimado(em_curso) + estimado(producao),
+        "a": estimado(em_curso) + estimado(producao) + estimado(z),
+    }
+    assert sistema.previsoes_espera() == pytest.approx(esperado)
+    assert sistema.previsoes_espera(["a", "ip"]) == pytest.approx({"a": esperado["a"], "ip": esperado["ip"]})
+    previsao = sistema.previsao_chamado("a")
+    assert previsao["vagas_compativeis"] == 1
+    assert previsao["trabalho_a_frente_min"] == round((estimado(producao) + estimado(z)) / 60, 1)
+    assert sistema._serializar_chamado(a)["espera_prevista_min"] == round(esperado["a"] / 60, 1)
+    assert sem_impacto.agente_atribuido is None
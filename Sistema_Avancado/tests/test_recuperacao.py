@@ -0,0 +1,54 @@
+import pytest
+
+from journal import Journal
+from Sistema_Chamadas import AgenteSuporte, SistemaChamados, TipoChamado
+
+
+def abrir(sistema, cliente, tipo_chamado):
+    return sistema.adicionar_chamado({"cliente_nome": cliente, "tipo_cliente": "Sem prioridade",
+                                      "tipo_chamado": tipo_chamado.value, "descricao": f"{cliente} {tipo_chamado.value}"})
+
+
+def resumo(sistema):
+    return (
+        [c.id_chamado for c in sistema._fila_em_ordem()],
+        {i: (c.status, c.agente_atribuido, c.prioridade_manual, c.timestamp) for i, c in sistema.chamados_ativos.items()},
+        sorted(sistema.chamados_em_atendimento),
+    )
+
+
+def test_journal_reproduz_fila_atendimentos_e_agentes(tmp_path):
+    caminho = str(tmp_path / "journal.bin")
+    vivo = SistemaChamados()
+    vivo.journal = Journal(caminho, fsync=False)
+    vivo.adicionar_agente(AgenteSuporte("ag1", "Ana", [TipoChamado.SERVER_DOWN, TipoChamado.DUVIDA]))
+    primeiro = abrir(vivo, "acme", TipoChamado.DUVIDA)
+    abrir(vivo, "globex", TipoChamado.SEM_IMPACTO)
+    duvida = abrir(vivo, "initech", TipoChamado.DUVIDA)
+    vivo.processar_proximo_chamado()
+    vivo.escalar_chamado(duvida.id_chamado, 2)
+    vivo.finalizar_chamado(primeiro.id_chamado)
+    abrir(vivo, "umbrella", TipoChamado.DUVIDA)
+    vivo.journal.fechar()
+
+    recuperado = SistemaChamados()
+    assert recuperado.recuperar(caminho) > 0
+    assert resumo(recuperado) == resumo(vivo)
+    assert len(resumo(vivo)[1]) == 4
+
+
+def test_journal_parado_recusa_alteracoes(tmp_path, monkeypatch):
+    sistema = SistemaChamados(silencioso=True)
+    sistema.journal = Journal(str(tmp_path / "journal.bin"), lote=1, sincrono=True, fsync=False)
+
+    def gravar_falhando(lote):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(sistema.journal, "_gravar", gravar_falhando)
+    # A operação já aplicada em memória não chega ao disco: quem chamou recebe o erro
+    with pytest.raises(OSError):
+        abrir(sistema, "acme", TipoChamado.DUVIDA)
+    with pytest.raises(OSError):
+        abrir(sistema, "globex", TipoChamado.DUVIDA)
+    assert len(sistema.chamados_ativos) == 1
+    sistema.journal.fechar()
@@ -0,0 +1,45 @@
+import json
+
+from log_estruturado import LogEstruturado
+from repositorio import COLUNAS, RepositorioSQLite
+
+
+def registro(id_chamado, cliente="acme", criado_em=1_700_000_000.0):
+    valores = {"id": id_chamado, "cliente": cliente, "tipo_cliente": "Sem prioridade", "tipo_chamado": "Dúvida",
+               "descricao": "x", "status": "Pendente", "criado_em": criado_em, "ocorrencias": 1}
+    return tuple(valores.get(coluna) for coluna in COLUNAS)
+
+
+def test_lote_recusado_nao_trava_quem_aguarda(tmp_path):
+    log = LogEstruturado(str(tmp_path / "app.log"), console=False)
+    repositorio = RepositorioSQLite(str(tmp_path / "historico.db"), latencia=0, log=log)
+    repositorio.salvar(registro("c1", cliente=None))  # viola NOT NULL
+    repositorio.aguardar()
+    repositorio.salvar(registro("c2"))
+    repositorio.aguardar()
+    assert [linha["id"] for linha in repositorio.consultar()] == ["c2"]
+    repositorio.fechar()
+    log.fechar()
+    with open(tmp_path / "app.log", encoding="utf-8") as arquivo:
+        erros = [json.loads(linha) for linha in arquivo]
+    assert [(e["evento"], e["nivel"]) for e in erros] == [("erro_historico", "ERROR")]
+    assert "NOT NULL" in erros[0]["excecao"]
+
+
+def test_consulta_do_mais_recente_com_limite(tmp_path):
+    repositorio = RepositorioSQLite(str(tmp_path / "historico.db"))
+    for i in range(5):
+        repositorio.salvar(registro(f"c{i}", criado_em=1_700_000_000.0 + i))
+    repositorio.aguardar()
+    assert [linha["id"] for linha in repositorio.consultar(limite=2)] == ["c4", "c3"]
+    assert len(repositorio.consultar(status="Pendente", cliente="acme")) == 5
+    repositorio.fechar()
+
+
+def test_consulta_em_utc_como_a_exportacao(tmp_path):
+    repositorio = RepositorioSQLite(str(tmp_path / "historico.db"))
+    repositorio.salvar(registro("c1", criado_em=1_714_561_205.0))
+    repositorio.aguardar()
+    [linha] = repositorio.consultar()
+    assert linha["criado_em"] == "2024-05-01T11:00:05Z" and linha["resolvido_em"] is None
+    repositorio.fechar()
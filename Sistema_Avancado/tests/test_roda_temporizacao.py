@@ -0,0 +1,54 @@
+import random
+
+from roda_temporizacao import RodaTemporizacao
+
+
+def test_dispara_no_tick_do_vencimento():
+    roda = RodaTemporizacao(1000)
+    roda.agendar("a", 1005, "dados")
+    assert roda.avancar(1004) == []
+    assert roda.avancar(1005) == [("a", "dados")]
+    assert len(roda) == 0
+
+
+def test_vencido_dispara_no_proximo_tick():
+    roda = RodaTemporizacao(1000)
+    roda.agendar("atrasado", 10)
+    assert roda.vencido(10) and roda.vencido(1000) and not roda.vencido(1001)
+    assert roda.avancar(1001) == [("atrasado", None)]
+
+
+def test_reagendar_e_cancelar():
+    roda = RodaTemporizacao(0)
+    roda.agendar("a", 100)
+    roda.agendar("a", 50, "novo")
+    roda.agendar("b", 70)
+    assert roda.cancelar("b")
+    assert not roda.cancelar("b")
+    assert roda.avancar(100) == [("a", "novo")]
+
+
+def test_equivale_a_busca_exaustiva():
+    r = random.Random(36)
+    roda = RodaTemporizacao(0)
+    armados = {}
+    agora = 0
+    for passo in range(5000):
+        sorteio = r.random()
+        if sorteio < 0.5:
+            chave = r.randrange(500)
+            # Distâncias de todos os níveis, e algumas já vencidas
+            vencimento = agora + r.choice((r.randint(-5, 64), r.randint(0, 5000), r.randint(0, 300_000)))
+            roda.agendar(chave, vencimento, passo)
+            armados[chave] = (max(vencimento, agora + 1), passo)
+        elif sorteio < 0.6 and armados:
+            chave = r.choice(sorted(armados))
+            assert roda.cancelar(chave)
+            del armados[chave]
+        else:
+            agora += r.choice((1, 1, 7, 200, 5000))
+            esperados = {chave: dados for chave, (vencimento, dados) in armados.items() if vencimento <= agora}
+            assert dict(roda.avancar(agora)) == esperados
+            for chave in esperados:
+                del armados[chave]
+        assert len(roda) == len(armados)
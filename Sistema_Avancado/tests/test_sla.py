@@ -0,0 +1,47 @@
+import pytest
+
+from Sistema_Chamadas import SistemaChamados
+
+
+def novo_sistema(relogio, diretorio) -> SistemaChamados:
+    sistema = SistemaChamados(relogio=relogio, silencioso=True)
+    sistema.ativar_persistencia(str(diretorio), fsync=False)
+    return sistema
+
+
+def abrir(sistema, tipo_chamado):
+    return sistema.adicionar_chamado({"cliente_nome": "acme", "tipo_cliente": "Sem prioridade",
+                                      "tipo_chamado": tipo_chamado, "descricao": "x"})
+
+
+def test_pendente_escalado_ao_estourar_a_espera(relogio):
+    sistema = SistemaChamados(relogio=relogio, silencioso=True)
+    chamado = abrir(sistema, "Dúvida")
+    relogio.agora += 14 * 60
+    assert sistema.verificar_sla(relogio.agora) == 0
+    relogio.agora += 60
+    assert sistema.verificar_sla(relogio.agora) == 1
+    assert chamado.prioridade_combinada()[0] == 1
+    assert sistema.verificar_sla(relogio.agora + 3600) == 0
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_prazo_vencido_antes_da_parada_nao_dispara_de_novo(tmp_path, relogio, snapshot):
+    sistema = novo_sistema(relogio, tmp_path)
+    duvida = abrir(sistema, "Dúvida")
+    relogio.agora += 16 * 60
+    assert sistema.verificar_sla(relogio.agora) == 1
+    sistema.escalar_chamado(duvida.id_chamado, 4)  # de volta à prioridade original, já sem prazo
+    if snapshot:
+        sistema.salvar_snapshot()
+    server_down = abrir(sistema, "Server down")
+    sistema.journal.fechar()
+
+    relogio.agora += 10 * 60
+    recuperado = novo_sistema(relogio, tmp_path)
+    assert recuperado.verificar_sla(relogio.agora) == 0
+    assert recuperado.chamados_ativos[duvida.id_chamado].prioridade_manual == 4
+    # O prazo que vence depois da parada continua armado
+    relogio.agora = server_down.timestamp.timestamp() + 120 * 60
+    assert recuperado.verificar_sla(relogio.agora) == 1
+    recuperado.journal.fechar()